@@ -0,0 +1,176 @@
+"""
+End-to-end crawl benchmark against the local mock store.
+
+Runs each store's real pipeline (open_page, popups, scrolling, pagination and
+extraction) in a headless browser against benchmarks.mock_store and reports
+pages per minute and items per minute. Needs Chrome or Chromium (or Playwright's
+Chromium with --backend playwright), but no network.
+
+Usage:
+    python -m benchmarks.bench_crawl
+    python -m benchmarks.bench_crawl --stores macys,quince --items 400 --latency-ms 300
+    python -m benchmarks.bench_crawl --backend playwright
+    python -m benchmarks.bench_crawl --stores lululemon,quince --modes interleaved,expand_then_extract
+"""
+import argparse
+import copy
+import importlib
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from benchmarks.bench_extraction import RESULTS_DIR, git_commit
+from benchmarks.listing_fixtures import STORES
+from benchmarks.mock_store import MockStore
+from utils.logger import logger
+
+
+def mock_config(mock: MockStore, store: str, prune_dom: bool = False, backend: str = "selenium",
+                mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return a copy of a store's SCRAPER_CONFIG pointed at the mock store, in a local headless browser.
+    mode overrides the store's pagination mode ("interleaved" or "expand_then_extract").
+    """
+    module = importlib.import_module(f"crawlers.stores.{store}.scripts.pipeline")
+    config = copy.deepcopy(module.SCRAPER_CONFIG)
+    config["base_url"] = mock.store_url(store)
+    config["use_scraping_browser"] = False
+    config["browser_config"] = {**config.get("browser_config", {}), "headless": True}
+    config["dom_pruning"] = {"enabled": prune_dom}
+    config["browser_backend"] = backend
+    if mode:
+        config["pagination"] = {**(config.get("pagination") or {"type": "infinite_scroll"}), "mode": mode}
+    return config
+
+
+def effective_mode(config: Dict[str, Any]) -> str:
+    """Pagination mode the crawl runs in; next button listings fall back to interleaved."""
+    pagination = config.get("pagination") or {}
+    if pagination.get("type") == "next_button":
+        return "interleaved"
+    return pagination.get("mode", "interleaved")
+
+
+def crawl_store(mock: MockStore, store: str, items_limit: Optional[int] = None,
+                prune_dom: bool = False, backend: str = "selenium", mode: Optional[str] = None) -> Dict[str, Any]:
+    """Crawl one store's mock listing with its pipeline and return throughput figures."""
+    module = importlib.import_module(f"crawlers.stores.{store}.scripts.pipeline")
+    config = mock_config(mock, store, prune_dom, backend, mode)
+    # Served pages are counted per crawl, so the same store can be crawled in several modes
+    mock.reset_stats()
+
+    scraper = module.get_scraper(config)
+    started = time.perf_counter()
+    try:
+        scraper.open_page(mock.listing_url(store))
+        opened = time.perf_counter()
+        items = scraper.extract_items(items_limit=items_limit)
+    finally:
+        scraper.cleanup()
+    elapsed = time.perf_counter() - started
+
+    phases = scraper.metrics.to_dict()["phases"]
+    served = mock.stats.get(store, {})
+    # A page is a listing page load or a batch of tiles fetched by load more / infinite scroll
+    pages = served.get("pages", 0) + served.get("tiles", 0)
+    return {
+        "store": store,
+        "pagination": (config.get("pagination") or {}).get("type", "infinite_scroll"),
+        "mode": effective_mode(config),
+        "items": len(items),
+        "pages": pages,
+        "images": served.get("images", 0),
+        "backend": backend,
+        "driver_startup_seconds": phases["driver_startup"]["seconds"],
+        "open_seconds": round(opened - started, 3),
+        "total_seconds": round(elapsed, 3),
+        "pages_per_minute": round(pages / elapsed * 60, 1),
+        "items_per_minute": round(len(items) / elapsed * 60, 1),
+        # Grow with the DOM on long listings unless tiles are pruned
+        "page_source_seconds": phases["page_source"]["seconds"],
+        "parse_seconds": phases["parse"]["seconds"],
+        "extract_seconds": phases["extract"]["seconds"],
+        "snapshots": phases["page_source"]["calls"],
+        "pruned_tiles": scraper.metrics.counters.get("pruned", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark full crawls against the local mock store')
+    parser.add_argument('--stores', type=str, default=",".join(STORES), help='Comma-separated stores')
+    parser.add_argument('--items', type=int, default=200, help='Products per mock listing')
+    parser.add_argument('--page-size', type=int, default=40, help='Products per page or batch')
+    parser.add_argument('--items-limit', type=int, help='Stop each crawl after this many items')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Server delay for pages and tiles')
+    parser.add_argument('--image-latency-ms', type=float, default=0, help='Server delay for images')
+    parser.add_argument('--no-popup', action='store_true', help='Do not inject popups')
+    parser.add_argument('--popup-delay-ms', type=float, default=1500, help='Popup delay after page load')
+    parser.add_argument('--eager-images', action='store_true', help='Load all images immediately')
+    parser.add_argument('--prune-dom', action='store_true', help='Prune extracted tiles from the page')
+    parser.add_argument('--modes', type=str,
+                        help='Comma-separated pagination modes to compare, e.g. interleaved,expand_then_extract '
+                             "(default: each store's configured mode)")
+    parser.add_argument('--backend', choices=['selenium', 'playwright'], default='selenium', help='Browser backend')
+    parser.add_argument('--output', type=str, help='Result file (default: benchmarks/results/<time>_<commit>.json)')
+    parser.add_argument('--with-logging', action='store_true', help="Keep the crawler's log sinks enabled")
+    args = parser.parse_args()
+
+    if not args.with_logging:
+        logger.remove()
+
+    server_settings = {
+        "total_items": args.items,
+        "page_size": args.page_size,
+        "latency_ms": args.latency_ms,
+        "image_latency_ms": args.image_latency_ms,
+        "popup": not args.no_popup,
+        "popup_delay_ms": args.popup_delay_ms,
+        "lazy_images": not args.eager_images,
+    }
+
+    modes = [m.strip() for m in args.modes.split(',')] if args.modes else [None]
+    results: List[Dict[str, Any]] = []
+    with MockStore(**server_settings) as mock:
+        for store in [s.strip() for s in args.stores.split(',')]:
+            crawled_modes = set()
+            for mode in modes:
+                # Next button stores run expand_then_extract as interleaved; crawl them once
+                run_mode = effective_mode(mock_config(mock, store, mode=mode))
+                if run_mode in crawled_modes:
+                    print(f"{store:<10} skipped: {mode} runs as {run_mode}, which was already crawled")
+                    continue
+                crawled_modes.add(run_mode)
+                try:
+                    result = crawl_store(mock, store, args.items_limit, args.prune_dom, args.backend, mode)
+                except Exception as e:
+                    print(f"{store:<10} failed: {e}")
+                    continue
+                results.append(result)
+                print(f"{store:<10} {result['mode']:<20} {result['items']:>5} items {result['pages']:>4} pages "
+                      f"in {result['total_seconds']:.1f}s  {result['pages_per_minute']:>6.1f} pages/min  "
+                      f"{result['items_per_minute']:>7.1f} items/min  {result['snapshots']:>3} snapshots")
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "benchmark": "crawl",
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": server_settings,
+        "items_limit": args.items_limit,
+        "prune_dom": args.prune_dom,
+        "backend": args.backend,
+        "results": results,
+    }, indent=2))
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Detail enrichment benchmark.
+
+Extracts a synthesized listing for a store, then enriches the items from the
+local mock store's product pages (crawlers.enrichment) at several per-host
+concurrency levels, with a cold and then a warm detail cache. Reports products
+per second and cache hits. Needs no browser or network.
+
+Usage:
+    python -m benchmarks.bench_enrichment
+    python -m benchmarks.bench_enrichment --store nordstrom --items 500 --latency-ms 200 --concurrency 1,8
+"""
+import argparse
+import copy
+import importlib
+import json
+import platform
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List
+
+from benchmarks.bench_extraction import RESULTS_DIR, git_commit
+from benchmarks.listing_fixtures import STORES, synthesize_listing
+from benchmarks.mock_store import DETAIL_SELECTORS, MockStore
+from crawlers.enrichment import enrich_items
+from crawlers.extraction import extract_listing
+from utils.logger import logger
+
+
+def bench_concurrency(mock: MockStore, store: str, items: int, per_host: int) -> Dict[str, Any]:
+    """Enrich a fresh item list twice (cold, then warm cache) and return both summaries."""
+    config = copy.deepcopy(importlib.import_module(f"crawlers.stores.{store}.scripts.config").SCRAPER_CONFIG)
+    config["base_url"] = mock.base_url
+    config["detail_page"] = {"selectors": DETAIL_SELECTORS, "ttl_hours": 1}
+    listing = extract_listing(synthesize_listing(store, items), config)
+
+    result: Dict[str, Any] = {"store": store, "per_host": per_host, "items": len(listing)}
+    with tempfile.TemporaryDirectory() as state_dir:
+        cache_path = str(Path(state_dir) / "details.db")
+        for run in ("cold", "warm"):
+            mock.reset_stats()
+            run_items = copy.deepcopy(listing)
+            summary = enrich_items(run_items, config, cache_path, per_host=per_host)
+            enriched = sum(1 for item in run_items if (item.get("product_details") or {}).get("sizes"))
+            rate = round(summary["products"] / summary["seconds"], 1) if summary["seconds"] else None
+            result[run] = {
+                **summary,
+                "pages_served": mock.stats.get("detail", {}).get("details", 0),
+                "items_enriched": enriched,
+                "products_per_second": rate,
+            }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark detail page enrichment against the mock store')
+    parser.add_argument('--store', type=str, default='macys', choices=STORES, help='Store whose listing to enrich')
+    parser.add_argument('--items', type=int, default=300, help='Products in the listing')
+    parser.add_argument('--latency-ms', type=float, default=100, help='Server delay for detail pages')
+    parser.add_argument('--concurrency', type=str, default='1,4,16', help='Comma-separated per-host limits')
+    parser.add_argument('--output', type=str, help='Result file (default: benchmarks/results/<time>_<commit>.json)')
+    parser.add_argument('--with-logging', action='store_true', help="Keep the crawler's log sinks enabled")
+    args = parser.parse_args()
+
+    if not args.with_logging:
+        logger.remove()
+
+    results: List[Dict[str, Any]] = []
+    with MockStore(latency_ms=args.latency_ms) as mock:
+        for per_host in [int(c) for c in args.concurrency.split(',')]:
+            result = bench_concurrency(mock, args.store, args.items, per_host)
+            results.append(result)
+            cold, warm = result["cold"], result["warm"]
+            print(f"per host {per_host:>3}  cold: {cold['fetched']:>5} fetched in {cold['seconds']:.2f}s "
+                  f"({cold['products_per_second']:.1f} products/s)  warm: {warm['cached']} cached, "
+                  f"{warm['fetched']} fetched in {warm['seconds']:.2f}s")
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"enrichment_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "benchmark": "enrichment",
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency_ms": args.latency_ms,
+        "results": results,
+    }, indent=2))
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Offline extraction benchmark.
+
+Measures parse, tile select, field selector and transform time, items per second and
+peak memory of the extraction path for synthesized listings of each store, and writes the
+results as JSON so runs can be compared across commits.
+
+Usage:
+    python -m benchmarks.bench_extraction
+    python -m benchmarks.bench_extraction --stores nordstrom --sizes 1000 --repeat 5
+    python -m benchmarks.bench_extraction --stores nordstrom --fields price_current,price_original
+    python -m benchmarks.bench_extraction --compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+import argparse
+import gc
+import importlib
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from bs4 import BeautifulSoup
+
+from benchmarks.listing_fixtures import STORES, synthesize_listing
+from crawlers.extraction import Extractor, project_config
+from crawlers.dedup import normalize_product_id
+from utils.logger import logger
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_SIZES = (100, 1000, 10000)
+
+
+def load_config(store: str) -> Dict[str, Any]:
+    return importlib.import_module(f"crawlers.stores.{store}.scripts.config").SCRAPER_CONFIG
+
+
+# Extraction steps timed inside extract_product_info, by result key
+TIMED_STEPS = {"_select_value": "selector_seconds", "_apply_transform": "transform_seconds"}
+
+
+def run_extraction(html: str, config: Dict[str, Any], extractor: Extractor) -> Dict[str, Any]:
+    """
+    Run the extraction path once and return per-phase timings: parsing, selecting the
+    product tiles and extracting each tile's fields, which is split further into the
+    field selector lookups and the value transforms (e.g. price cleaning).
+    """
+    field_selectors = {field: sel for field, sel in config["selectors"].items() if field != "product_item"}
+
+    spent = dict.fromkeys(TIMED_STEPS.values(), 0.0)
+    for name, key in TIMED_STEPS.items():
+        def timed(*args, _step=getattr(extractor, name), _key=key):
+            step_start = time.perf_counter()
+            try:
+                return _step(*args)
+            finally:
+                spent[_key] += time.perf_counter() - step_start
+        setattr(extractor, name, timed)
+
+    try:
+        start = time.perf_counter()
+        soup = BeautifulSoup(html, 'html.parser')
+        parsed = time.perf_counter()
+        tiles = soup.select(config["selectors"]["product_item"])
+        selected = time.perf_counter()
+
+        items = []
+        for tile in tiles:
+            product_info = extractor.extract_product_info(tile, field_selectors, config)
+            product_info["store_product_id"] = normalize_product_id(
+                product_info.get("store_product_id"), config.get("id_normalizer")
+            )
+            items.append(product_info)
+        extracted = time.perf_counter()
+    finally:
+        for name in TIMED_STEPS:
+            delattr(extractor, name)
+
+    return {
+        "parse_seconds": parsed - start,
+        "tile_select_seconds": selected - parsed,
+        **spent,
+        "field_extract_seconds": extracted - selected,
+        "total_seconds": extracted - start,
+        "items": len(items),
+    }
+
+
+def measure_peak_memory(html: str, config: Dict[str, Any], extractor: Extractor) -> int:
+    """Return the peak traced memory in bytes of one extraction run."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_extraction(html, config, extractor)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_store(store: str, size: int, repeat: int, trace_memory: bool = True,
+                fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Benchmark one store at one listing size; timings are medians over repeat runs.
+    fields projects the extraction like run_scraper --fields.
+    """
+    config = load_config(store)
+    if fields:
+        config = project_config(config, fields)
+    extractor = Extractor()
+    html = synthesize_listing(store, size)
+
+    runs = [run_extraction(html, config, extractor) for _ in range(repeat)]
+    if runs[0]["items"] != size:
+        logger.warning(f"{store}: expected {size} items, extracted {runs[0]['items']}")
+
+    result = {"store": store, "tiles": size, "html_bytes": len(html), "items": runs[0]["items"]}
+    for key in ("parse_seconds", "tile_select_seconds", "selector_seconds", "transform_seconds",
+                "field_extract_seconds", "total_seconds"):
+        result[key] = round(statistics.median(run[key] for run in runs), 6)
+    result["items_per_second"] = round(result["items"] / result["total_seconds"], 1)
+    result["field_extract_items_per_second"] = round(result["items"] / result["field_extract_seconds"], 1)
+    # Measured separately, since tracing allocations slows the timed runs down
+    result["peak_memory_bytes"] = measure_peak_memory(html, config, extractor) if trace_memory else None
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print per-store, per-size changes in throughput and memory between two result files."""
+    old = {(r["store"], r["tiles"]): r for r in json.loads(Path(old_path).read_text())["results"]}
+    new = json.loads(Path(new_path).read_text())
+
+    print(f"{'store':<10} {'tiles':>6} {'items/s old':>12} {'items/s new':>12} {'change':>8} {'peak MB':>8}")
+    for r in new["results"]:
+        base = old.get((r["store"], r["tiles"]))
+        if not base:
+            continue
+        change = (r["items_per_second"] / base["items_per_second"] - 1) * 100
+        peak = f"{r['peak_memory_bytes'] / 1e6:.1f}" if r['peak_memory_bytes'] else "n/a"
+        print(f"{r['store']:<10} {r['tiles']:>6} {base['items_per_second']:>12.0f} {r['items_per_second']:>12.0f} "
+              f"{change:>+7.1f}% {peak:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark offline product extraction')
+    parser.add_argument('--stores', type=str, default=",".join(STORES), help='Comma-separated stores')
+    parser.add_argument('--sizes', type=str, default=",".join(map(str, DEFAULT_SIZES)),
+                        help='Comma-separated tile counts')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per store and size')
+    parser.add_argument('--output', type=str, help='Result file (default: benchmarks/results/<time>_<commit>.json)')
+    parser.add_argument('--with-logging', action='store_true',
+                        help="Keep the crawler's log sinks enabled (debug logging is part of the measured cost)")
+    parser.add_argument('--fields', type=str,
+                        help='Extract only these comma-separated fields, like run_scraper --fields')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the (slow) peak memory measurement')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Compare two result files and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if not args.with_logging:
+        logger.remove()
+
+    stores = [s.strip() for s in args.stores.split(',')]
+    sizes = [int(s) for s in args.sizes.split(',')]
+    fields = [f.strip() for f in args.fields.split(',')] if args.fields else None
+
+    results: List[Dict[str, Any]] = []
+    for store in stores:
+        for size in sizes:
+            result = bench_store(store, size, args.repeat, trace_memory=not args.no_memory, fields=fields)
+            results.append(result)
+            peak = f"{result['peak_memory_bytes'] / 1e6:.1f} MB" if result['peak_memory_bytes'] else "n/a"
+            print(f"{store:<10} {size:>6} tiles  parse {result['parse_seconds']:.3f}s  "
+                  f"tiles {result['tile_select_seconds']:.3f}s  selectors {result['selector_seconds']:.3f}s  "
+                  f"transforms {result['transform_seconds']:.3f}s  fields {result['field_extract_seconds']:.3f}s  "
+                  f"{result['items_per_second']:>8.0f} items/s  peak {peak}")
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"extraction_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "benchmark": "extraction",
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "logging": args.with_logging,
+        "fields": fields,
+        "results": results,
+    }, indent=2))
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Image download benchmark.
+
+Downloads a synthetic item list's images from the local mock store with the
+image download stage (crawlers.images) at several per-host concurrency levels,
+and reports images per second, requests served and how many URLs and contents
+were deduplicated. Needs no browser or network.
+
+Usage:
+    python -m benchmarks.bench_images
+    python -m benchmarks.bench_images --images 1000 --image-latency-ms 100 --concurrency 1,8,32
+"""
+import argparse
+import json
+import platform
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List
+
+from benchmarks.bench_extraction import RESULTS_DIR, git_commit
+from benchmarks.mock_store import MockStore
+from crawlers.images import download_images
+from utils.logger import logger
+
+
+def synthesize_items(base_url: str, images: int, repeated: float, aliased: float) -> List[Dict[str, Any]]:
+    """
+    Build items pointing at mock store images.
+    Args:
+        base_url: Mock store base URL
+        images: Number of distinct images
+        repeated: Fraction of extra items reusing another item's image URL
+        aliased: Fraction of extra items with a different URL for the same image
+    """
+    items = [{"store_product_id": str(n), "image_url": f"{base_url}/img/bench/{n}.svg"} for n in range(images)]
+    for n in range(int(images * repeated)):
+        items.append({"store_product_id": f"r{n}", "image_url": f"{base_url}/img/bench/{n}.svg"})
+    for n in range(int(images * aliased)):
+        items.append({"store_product_id": f"a{n}", "image_url": f"{base_url}/img/bench/{n}.svg?w=480"})
+    return items
+
+
+def bench_concurrency(mock: MockStore, items: List[Dict[str, Any]], per_host: int) -> Dict[str, Any]:
+    """Download all images into a fresh directory and return the stage summary."""
+    mock.reset_stats()
+    with tempfile.TemporaryDirectory() as images_dir:
+        summary = download_images(items, images_dir, per_host=per_host, max_concurrency=max(per_host, 16))
+        stored = sum(1 for path in Path(images_dir).rglob("*.svg"))
+    missing = sum(1 for item in items if not item.get("image_path"))
+    return {
+        "per_host": per_host,
+        **summary,
+        "requests_served": mock.stats.get("bench", {}).get("images", 0),
+        "files_stored": stored,
+        "items_without_image": missing,
+        "images_per_second": round(summary["downloaded"] / summary["seconds"], 1) if summary["seconds"] else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the image download stage against the mock store')
+    parser.add_argument('--images', type=int, default=400, help='Distinct images')
+    parser.add_argument('--repeated', type=float, default=0.25, help='Extra items reusing an image URL (fraction)')
+    parser.add_argument('--aliased', type=float, default=0.1, help='Extra items with another URL for an image')
+    parser.add_argument('--image-latency-ms', type=float, default=50, help='Server delay for images')
+    parser.add_argument('--concurrency', type=str, default='1,4,16', help='Comma-separated per-host limits')
+    parser.add_argument('--output', type=str, help='Result file (default: benchmarks/results/<time>_<commit>.json)')
+    parser.add_argument('--with-logging', action='store_true', help="Keep the crawler's log sinks enabled")
+    args = parser.parse_args()
+
+    if not args.with_logging:
+        logger.remove()
+
+    results: List[Dict[str, Any]] = []
+    with MockStore(image_latency_ms=args.image_latency_ms) as mock:
+        for per_host in [int(c) for c in args.concurrency.split(',')]:
+            items = synthesize_items(mock.base_url, args.images, args.repeated, args.aliased)
+            result = bench_concurrency(mock, items, per_host)
+            results.append(result)
+            print(f"per host {per_host:>3}  {result['downloaded']:>5} downloads in {result['seconds']:.2f}s  "
+                  f"{result['images_per_second']:>7.1f} images/s  {result['duplicate_urls']} duplicate URLs  "
+                  f"{result['duplicate_content']} duplicate contents  {result['files_stored']} files")
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"images_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "benchmark": "images",
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "images": args.images,
+        "repeated": args.repeated,
+        "aliased": args.aliased,
+        "image_latency_ms": args.image_latency_ms,
+        "results": results,
+    }, indent=2))
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main()
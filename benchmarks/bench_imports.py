@@ -0,0 +1,118 @@
+"""
+Import-time benchmark.
+
+Imports each entry point in a fresh interpreter and reports the median wall time,
+the packages that took longest to import (from `python -X importtime`), and
+whether the browser stack (Selenium, webdriver_manager), BeautifulSoup or dotenv
+was loaded.
+
+Usage:
+    python -m benchmarks.bench_imports
+    python -m benchmarks.bench_imports --modules crawlers.extraction --repeat 20
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List
+
+from benchmarks.bench_extraction import RESULTS_DIR, git_commit
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = (
+    "crawlers.run_scraper",   # crawl CLI
+    "crawlers.run_batch",     # batch CLI
+    "crawlers.extraction",    # extraction-only entry point
+    "crawlers.base",          # what every store pipeline imports
+)
+HEAVY_PACKAGES = ("selenium", "webdriver_manager", "bs4", "dotenv")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Return the import time in microseconds spent in each top-level package (sum of self times)."""
+    packages: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(own)
+    return packages
+
+
+def bench_module(module: str, repeat: int, top: int = 5) -> Dict[str, Any]:
+    """Import a module in repeat fresh interpreters and summarize the runs."""
+    wall: List[float] = []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_PACKAGES)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        elapsed, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        wall.append(elapsed)
+
+    # A separate run, since -X importtime adds its own overhead
+    trace = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    packages = parse_importtime(trace.stderr)
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(wall) * 1000, 1),
+        "min_ms": round(min(wall) * 1000, 1),
+        "heavy_packages_loaded": loaded,
+        "slowest_packages_ms": {name: round(us / 1000, 1) for name, us in slowest},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark import time of the crawler entry points')
+    parser.add_argument('--modules', type=str, default=",".join(DEFAULT_MODULES), help='Comma-separated modules')
+    parser.add_argument('--repeat', type=int, default=10, help='Fresh interpreters per module')
+    parser.add_argument('--output', type=str, help='Result file (default: benchmarks/results/<time>_<commit>.json)')
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for module in [m.strip() for m in args.modules.split(',')]:
+        result = bench_module(module, args.repeat)
+        results.append(result)
+        heavy = ", ".join(result["heavy_packages_loaded"]) or "none"
+        slowest = ", ".join(f"{name} {ms:.0f}ms" for name, ms in result["slowest_packages_ms"].items())
+        print(f"{module:<24} {result['median_ms']:>7.1f} ms  heavy: {heavy:<40} slowest: {slowest}")
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"imports_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "benchmark": "imports",
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }, indent=2))
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Tab multiplexing benchmark.
+
+Crawls N category URLs of a mock store listing concurrently, either as N tabs of
+one shared browser (run_scraper --tabs) or with one browser per URL, and reports
+wall time, items per minute, and the peak memory of the browser processes per
+concurrent crawl. Needs Chrome or Chromium (or Playwright's Chromium with
+--backend playwright) and Linux for the memory figures, but no network.
+
+Usage:
+    python -m benchmarks.bench_multiplex
+    python -m benchmarks.bench_multiplex --store quince --sessions 1,4,8 --latency-ms 200
+"""
+import argparse
+import importlib
+import json
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List
+
+from benchmarks.bench_crawl import mock_config
+from benchmarks.bench_extraction import RESULTS_DIR, git_commit
+from benchmarks.mock_store import MockStore
+from crawlers.multiplex import MemorySampler, SharedBrowser
+from utils.logger import logger
+
+MODES = ("tabs", "separate")
+
+
+def crawl_concurrently(mock: MockStore, store: str, sessions: int, mode: str,
+                       backend: str = "selenium") -> Dict[str, Any]:
+    """Crawl `sessions` category URLs at once, in tabs of one browser or in a browser each."""
+    module = importlib.import_module(f"crawlers.stores.{store}.scripts.pipeline")
+    config = mock_config(mock, store, backend=backend)
+    urls = [f"{mock.listing_url(store)}?category={n}" for n in range(sessions)]
+
+    shared = SharedBrowser(sessions) if mode == "tabs" else None
+    sampler = shared.memory if shared else MemorySampler()
+
+    def crawl(url: str) -> int:
+        scraper = module.get_scraper(config)
+        if shared:
+            scraper.driver_factory = shared.open_tab
+        try:
+            scraper.open_page(url)
+            return len(scraper.extract_items())
+        finally:
+            scraper.cleanup()
+
+    started = time.perf_counter()
+    try:
+        if shared:
+            shared.start(module.get_scraper(SharedBrowser.launch_config(config)), sessions)
+        else:
+            sampler.sample()
+            sampler.start()
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            items = sum(pool.map(crawl, urls))
+    finally:
+        if shared:
+            shared.close()
+        else:
+            sampler.stop()
+    elapsed = time.perf_counter() - started
+
+    peak_mb = sampler.peak / (1024 * 1024) if sampler.peak is not None else None
+    return {
+        "mode": mode,
+        "backend": backend,
+        "sessions": sessions,
+        "items": items,
+        "total_seconds": round(elapsed, 3),
+        "items_per_minute": round(items / elapsed * 60, 1),
+        "peak_memory_mb": round(peak_mb, 1) if peak_mb is not None else None,
+        "memory_per_crawl_mb": round(peak_mb / sessions, 1) if peak_mb is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare tabs of one browser with a browser per URL')
+    parser.add_argument('--store', type=str, default='macys', help='Store whose mock listing is crawled')
+    parser.add_argument('--sessions', type=str, default='1,2,4,8', help='Comma-separated concurrent crawls')
+    parser.add_argument('--modes', type=str, default=",".join(MODES), help='Comma-separated modes: tabs, separate')
+    parser.add_argument('--backend', choices=['selenium', 'playwright'], default='selenium', help='Browser backend')
+    parser.add_argument('--items', type=int, default=200, help='Products per mock listing')
+    parser.add_argument('--page-size', type=int, default=40, help='Products per page or batch')
+    parser.add_argument('--latency-ms', type=float, default=100, help='Server delay for pages and tiles')
+    parser.add_argument('--output', type=str, help='Result file (default: benchmarks/results/<time>_<commit>.json)')
+    parser.add_argument('--with-logging', action='store_true', help="Keep the crawler's log sinks enabled")
+    args = parser.parse_args()
+
+    if not args.with_logging:
+        logger.remove()
+
+    server_settings = {
+        "total_items": args.items,
+        "page_size": args.page_size,
+        "latency_ms": args.latency_ms,
+        "popup": False,
+    }
+
+    results: List[Dict[str, Any]] = []
+    with MockStore(**server_settings) as mock:
+        for sessions in [int(n) for n in args.sessions.split(',')]:
+            for mode in [m.strip() for m in args.modes.split(',')]:
+                try:
+                    result = crawl_concurrently(mock, args.store, sessions, mode, args.backend)
+                except Exception as e:
+                    print(f"{mode:<9} x{sessions:<3} failed: {e}")
+                    continue
+                results.append(result)
+                memory = (f"{result['peak_memory_mb']:>7.0f} MB peak  {result['memory_per_crawl_mb']:>6.0f} MB/crawl"
+                          if result["peak_memory_mb"] is not None else "memory n/a")
+                print(f"{mode:<9} x{sessions:<3} {result['items']:>5} items in {result['total_seconds']:>6.1f}s  "
+                      f"{result['items_per_minute']:>7.1f} items/min  {memory}")
+
+    commit = git_commit()
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"multiplex_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "benchmark": "multiplex",
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": server_settings,
+        "store": args.store,
+        "results": results,
+    }, indent=2))
+    print(f"\nResults saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+STORES = ("lululemon", "macys", "nordstrom", "quince")
+
+TILES_START = "<!-- TILES -->"
+TILES_END = "<!-- /TILES -->"
+
+
+@lru_cache(maxsize=None)
+def load_fixture(store: str) -> Tuple[str, str, str]:
+    """
+    Load a store's listing fixture.
+
+    Fixtures are listing pages modeled on each store's markup, with the product
+    tiles between <!-- TILES --> markers. "__N__" in a tile is replaced with a
+    unique number when tiles are synthesized.
+
+    Returns:
+        Tuple of (page head, tile template, page tail)
+    """
+    html = (FIXTURES_DIR / f"{store}_listing.html").read_text(encoding="utf-8")
+    head, rest = html.split(TILES_START, 1)
+    tile, tail = rest.split(TILES_END, 1)
+    return head, tile.strip(), tail
+
+
+def render_tiles(store: str, start: int, count: int) -> str:
+    """Render count product tiles numbered from start."""
+    _, tile, _ = load_fixture(store)
+    return "\n".join(tile.replace("__N__", str(n)) for n in range(start, start + count))
+
+
+def synthesize_listing(store: str, num_tiles: int) -> str:
+    """Return a full listing page with num_tiles unique product tiles."""
+    head, _, tail = load_fixture(store)
+    return head + render_tiles(store, 0, num_tiles) + tail
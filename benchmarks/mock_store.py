@@ -0,0 +1,360 @@
+"""
+Local mock store server for end-to-end crawl benchmarks.
+
+Serves listings for every supported store from the fixtures in
+benchmarks/fixtures/, using the store's own pagination model:
+
+    next_button       /<store>/listing?page=N, with a next link until the last page
+    load_more_button  a button that fetches the next tiles and updates the
+                      "Viewing X of Y" indicator (Lululemon)
+    infinite_scroll   tiles are appended when the page is scrolled near the bottom (Quince)
+
+/<store>/ serves the first listing page, so homepage warm-ups work too, and
+any other path (the stores' product URLs) serves a product detail page with
+sizes, material and colors (see DETAIL_SELECTORS). The
+store's popup can be injected after a delay, images can be lazy-loaded, and
+every response can be delayed to simulate network latency. Image URLs are
+rewritten to the server (/img/<store>/<n>.svg, distinct content per n), so crawls
+never leave the machine and the image download stage can be run against it.
+
+Usage:
+    python -m benchmarks.mock_store --port 8000 --items 500 --latency-ms 200
+"""
+import argparse
+import html
+import importlib
+import itertools
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit, parse_qs
+
+from benchmarks.listing_fixtures import STORES, load_fixture, render_tiles
+
+# Markup matching each store's popup_handlers close selector
+POPUPS = {
+    "lululemon": '<button class="closeButton-1vSmX" data-mock-close>&times;</button>',
+    "macys": '<button id="bx-close-inside-1" data-mock-close>&times;</button>',
+    "nordstrom": '<div id="dialog-description"><p>Sign up for emails</p><a href="#" data-mock-close>Close</a></div>',
+    "quince": '<div id="closeIconContainer" data-mock-close>&times;</div>',
+}
+
+NEXT_LINK = re.compile(r'(<li[^>]*>)<a href="[^"]*">Next</a></li>')
+INDICATOR = re.compile(r'Viewing \d+ of \d+')
+IMAGE_ATTR = re.compile(r'\b(src|srcset|data-src)="[^"]*"')
+PLACEHOLDER = "data:image/gif;base64,R0lGODlhAQABAAAAACH5BAEKAAEALAAAAAABAAEAAAICTAEAOw=="
+# Each image number renders differently, so images have distinct content (query strings are ignored)
+IMAGE_SVG = ('<svg xmlns="http://www.w3.org/2000/svg" width="240" height="300">'
+             '<rect width="240" height="300" fill="#ddd"/><text x="20" y="40">%s</text></svg>')
+
+DETAIL_PAGE = """<!DOCTYPE html>
+<html><head><title>%(name)s</title></head>
+<body>
+<h1 class="product-title">%(name)s</h1>
+<div class="product-material">%(material)s</div>
+<ul class="product-sizes">%(sizes)s</ul>
+<ul class="product-colors">%(colors)s</ul>
+</body></html>
+"""
+SIZES = ["XS", "S", "M", "L", "XL", "XXL"]
+MATERIALS = ["100% Cotton", "Merino Wool", "Recycled Polyester", "Linen Blend", "Cashmere"]
+COLORS = ["Black", "Navy", "Heather Grey", "Camel", "Olive", "White", "Burgundy"]
+
+# detail_page selectors (SelectorMixin format) for the mock product pages
+DETAIL_SELECTORS = {
+    "title": {"method": "select_one", "pattern": "h1.product-title", "text": True},
+    "material": {"method": "select_one", "pattern": "div.product-material", "text": True},
+    "sizes": {"method": "select", "pattern": "ul.product-sizes li", "text": True},
+    "colors": {"method": "select", "pattern": "ul.product-colors li", "text": True},
+}
+
+PAGE_SCRIPT = """
+<script>
+(function () {
+  var cfg = %(config)s;
+  var shown = cfg.shown, loading = false;
+
+  function appendTiles(done) {
+    if (loading || shown >= cfg.total) { return; }
+    loading = true;
+    fetch(cfg.tilesUrl + '?start=' + shown + '&count=' + cfg.pageSize)
+      .then(function (r) { return r.text(); })
+      .then(function (markup) {
+        var tiles = document.querySelectorAll(cfg.tileSelector);
+        tiles[tiles.length - 1].insertAdjacentHTML('afterend', markup);
+        shown = Math.min(cfg.total, shown + cfg.pageSize);
+        loading = false;
+        if (done) { done(); }
+        loadVisibleImages();
+      });
+  }
+
+  function loadVisibleImages() {
+    document.querySelectorAll('img[data-mock-src]').forEach(function (img) {
+      if (img.getBoundingClientRect().top < window.innerHeight * 2) {
+        img.src = img.getAttribute('data-mock-src');
+        img.removeAttribute('data-mock-src');
+      }
+    });
+  }
+
+  document.addEventListener('click', function (e) {
+    var close = e.target.closest('[data-mock-close]');
+    if (close) {
+      e.preventDefault();
+      var popup = close.closest('.mock-popup');
+      if (popup) { popup.remove(); }
+      return;
+    }
+    // Next buttons are list items; follow their link wherever the item is clicked
+    var item = e.target.closest('li');
+    var next = item && item.querySelector('a[data-mock-next]');
+    if (next) { e.preventDefault(); window.location.href = next.href; return; }
+    if (cfg.mode === 'load_more_button' && e.target.closest('[data-mock-load-more]')) {
+      appendTiles(function () {
+        document.querySelectorAll('[data-mock-indicator]').forEach(function (el) {
+          el.textContent = 'Viewing ' + shown + ' of ' + cfg.total;
+        });
+        if (shown >= cfg.total) {
+          document.querySelectorAll('[data-mock-load-more]').forEach(function (el) { el.remove(); });
+        }
+      });
+    }
+  });
+
+  window.addEventListener('scroll', function () {
+    loadVisibleImages();
+    if (cfg.mode === 'infinite_scroll' &&
+        window.innerHeight + window.scrollY >= document.body.scrollHeight - 800) {
+      appendTiles();
+    }
+  });
+
+  if (cfg.popup !== null) {
+    setTimeout(function () {
+      document.body.insertAdjacentHTML('beforeend', '<div class="mock-popup">' + cfg.popup + '</div>');
+    }, cfg.popupDelayMs);
+  }
+  loadVisibleImages();
+})();
+</script>
+"""
+
+
+class MockStore:
+    """
+    Threaded HTTP server that serves mock listings for all stores.
+
+    Requests are counted per store and kind (page, tiles, image), so a benchmark
+    can report pages served per minute.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, total_items: int = 200, page_size: int = 40,
+                 latency_ms: float = 0, image_latency_ms: float = 0, popup: bool = True,
+                 popup_delay_ms: float = 1500, lazy_images: bool = True):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind; 0 picks a free port
+            total_items: Products per listing
+            page_size: Products per page, load more click or scroll batch
+            latency_ms: Delay before every page and tiles response
+            image_latency_ms: Delay before every image response
+            popup: Inject the store's popup into listing pages
+            popup_delay_ms: Delay after page load before the popup appears
+            lazy_images: Load tile images only when they are scrolled near the viewport
+        """
+        self.total_items = total_items
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.image_latency_ms = image_latency_ms
+        self.popup = popup
+        self.popup_delay_ms = popup_delay_ms
+        self.lazy_images = lazy_images
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def store_url(self, store: str) -> str:
+        return f"{self.base_url}/{store}/"
+
+    def listing_url(self, store: str) -> str:
+        return f"{self.base_url}/{store}/listing"
+
+    def start(self) -> "MockStore":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-store", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {}
+
+    def _count(self, store: str, kind: str) -> None:
+        with self._lock:
+            counts = self.stats.setdefault(store, {"pages": 0, "tiles": 0, "images": 0, "details": 0})
+            counts[kind] += 1
+
+    @staticmethod
+    def _config(store: str) -> Dict[str, Any]:
+        return importlib.import_module(f"crawlers.stores.{store}.scripts.config").SCRAPER_CONFIG
+
+    def _tiles(self, store: str, start: int, count: int) -> str:
+        """Render tiles, pointing images at the server."""
+        count = max(0, min(count, self.total_items - start))
+        markup = render_tiles(store, start, count)
+        counter = itertools.count(start * 10)
+
+        def local_image(match):
+            url = f"/img/{store}/{next(counter)}.svg"
+            if self.lazy_images and match.group(1) == "src":
+                return f'src="{PLACEHOLDER}" data-mock-src="{url}"'
+            return f'{match.group(1)}="{url}"'
+        return IMAGE_ATTR.sub(local_image, markup)
+
+    def render_listing(self, store: str, page: int = 1) -> str:
+        """Render a full listing page in the store's pagination model."""
+        config = self._config(store)
+        mode = (config.get("pagination") or {}).get("type", "infinite_scroll")
+        head, _, tail = load_fixture(store)
+
+        if mode == "next_button":
+            start = (page - 1) * self.page_size
+            last_page = start + self.page_size >= self.total_items
+            # Keep the store's own <li> (the next button selectors point at it)
+            next_link = "" if last_page else rf'\1<a href="?page={page + 1}" data-mock-next>Next</a></li>'
+            tail = NEXT_LINK.sub(next_link, tail)
+        else:
+            start = 0
+            tail = INDICATOR.sub(f"Viewing {min(self.page_size, self.total_items)} of {self.total_items}", tail)
+            tail = re.sub(r'(<p class="pagination_indicator[^"]*")', r'\1 data-mock-indicator', tail)
+            tail = re.sub(r'(<button class="pagination_button[^"]*")', r'\1 data-mock-load-more', tail)
+
+        script = PAGE_SCRIPT % {"config": json.dumps({
+            "mode": mode,
+            "shown": min(start + self.page_size, self.total_items),
+            "total": self.total_items,
+            "pageSize": self.page_size,
+            "tilesUrl": f"/{store}/tiles",
+            "tileSelector": config["selectors"]["product_item"],
+            "popup": POPUPS.get(store) if self.popup else None,
+            "popupDelayMs": self.popup_delay_ms,
+        })}
+        tail = tail.replace("</body>", script + "</body>", 1)
+        return head + self._tiles(store, start, self.page_size) + tail
+
+    @staticmethod
+    def render_detail(path: str) -> str:
+        """Render a product detail page; its content is derived from the path."""
+        seed = zlib.crc32(path.encode("utf-8"))
+        name = path.rstrip("/").rsplit("/", 1)[-1].replace("-", " ").title() or "Product"
+        sizes = SIZES[seed % 3:seed % 3 + 3 + seed % 2]
+        colors = [COLORS[(seed + i) % len(COLORS)] for i in range(1 + seed % 4)]
+        return DETAIL_PAGE % {
+            "name": html.escape(name),
+            "material": MATERIALS[seed % len(MATERIALS)],
+            "sizes": "".join(f"<li>{size}</li>" for size in sizes),
+            "colors": "".join(f"<li>{color}</li>" for color in colors),
+        }
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like a real store's CDN (every response has a Content-Length)
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, Nagle's algorithm and
+            # delayed ACKs add ~40 ms to every keep-alive response
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, body: bytes, content_type: str, status: int = 200) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                parts = [part for part in url.path.split("/") if part]
+
+                if len(parts) == 3 and parts[0] == "img":
+                    time.sleep(mock.image_latency_ms / 1000)
+                    mock._count(parts[1], "images")
+                    number = parts[2].rsplit(".", 1)[0]
+                    return self._send((IMAGE_SVG % html.escape(number)).encode("utf-8"), "image/svg+xml")
+
+                if not parts:
+                    return self._send(b"Not found", "text/plain", 404)
+                time.sleep(mock.latency_ms / 1000)
+                if parts[0] not in STORES:
+                    mock._count("detail", "details")
+                    return self._send(mock.render_detail(url.path).encode("utf-8"), "text/html; charset=utf-8")
+                store = parts[0]
+
+                if len(parts) == 1 or parts[1] == "listing":
+                    mock._count(store, "pages")
+                    page = int(query.get("page", ["1"])[0])
+                    return self._send(mock.render_listing(store, page).encode("utf-8"), "text/html; charset=utf-8")
+                if parts[1] == "tiles":
+                    mock._count(store, "tiles")
+                    start = int(query.get("start", ["0"])[0])
+                    count = int(query.get("count", [str(mock.page_size)])[0])
+                    return self._send(mock._tiles(store, start, count).encode("utf-8"), "text/html; charset=utf-8")
+                return self._send(html.escape(self.path).encode("utf-8"), "text/plain", 404)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve mock store listings')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--items', type=int, default=200, help='Products per listing')
+    parser.add_argument('--page-size', type=int, default=40, help='Products per page or batch')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay for pages and tiles')
+    parser.add_argument('--image-latency-ms', type=float, default=0, help='Delay for images')
+    parser.add_argument('--no-popup', action='store_true', help='Do not inject popups')
+    parser.add_argument('--popup-delay-ms', type=float, default=1500, help='Popup delay after page load')
+    parser.add_argument('--eager-images', action='store_true', help='Load all images immediately')
+    args = parser.parse_args()
+
+    mock = MockStore(args.host, args.port, args.items, args.page_size, args.latency_ms, args.image_latency_ms,
+                     popup=not args.no_popup, popup_delay_ms=args.popup_delay_ms, lazy_images=not args.eager_images)
+    for store in STORES:
+        print(f"{store:<10} {mock.listing_url(store)}")
+    try:
+        mock._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock._server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,230 +1,154 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from abc import ABC
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timezone
 import random
+import re
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementNotInteractableException
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 import platform
 import os
-from dotenv import load_dotenv
 
 
 from utils.logger import logger
+from crawlers.dedup import normalize_product_id
+from crawlers.extraction import SelectorMixin, parse_tiles
+from crawlers.metrics import RunMetrics, timed
+from crawlers.page_cache import DEFAULT_TTL_MINUTES
+from crawlers.watchdog import heartbeat
 
-# Load environment variables from .env file
-load_dotenv()
+# Selenium, webdriver_manager and dotenv are imported where a driver is created or
+# used, so the extraction engine and result tools can be imported without them
+if TYPE_CHECKING:
+    from selenium import webdriver
 
-class SelectorMixin:
-    """Mixin class for handling selectors in a consistent way across scrapers."""
-    
-    def _transform_price(self, value: str) -> str:
-        """Clean and transform price string."""
-        try:
-            if not value:
-                return None
-            # Remove currency symbols and any whitespace
-            cleaned = value.replace('$', '').replace('USD', '').strip()
-            logger.debug(f"Transformed price from '{value}' to '{cleaned}'")
-            return cleaned
-        except Exception as e:
-            logger.error(f"Error in _transform_price for value '{value}': {str(e)}")
-            return None
-    
-    def _extract_price_range(self, value: str) -> tuple:
-        """Extract min and max prices from a price range string."""
-        try:
-            if not value:
-                return None, None
-            
-            # Clean the string and split by range indicator
-            clean_value = value.replace('$', '').replace('USD', '').strip()
-            logger.debug(f"Cleaned price range value: {clean_value}")
-            
-            # Remove discount information in parentheses if present
-            if '(' in clean_value:
-                clean_value = clean_value.split('(')[0].strip()
-                logger.debug(f"Removed parentheses info: {clean_value}")
-            
-            # Handle both regular hyphen (-) and en dash (–)
-            if '-' in clean_value or '–' in clean_value:
-                clean_value = clean_value.replace('–', '-')
-                parts = clean_value.split('-')
-                min_price = parts[0].strip()
-                max_price = parts[1].strip()
-                logger.debug(f"Split price range: min={min_price}, max={max_price}")
-                return min_price, max_price
-            
-            logger.debug(f"Single price value: {clean_value}")
-            return clean_value, clean_value
-            
-        except Exception as e:
-            logger.error(f"Error extracting price range from '{value}': {str(e)}")
-            return None, None
-    
-    def extract_with_selector(self, soup_item: BeautifulSoup, selector: Dict[str, Any] | str) -> Any:
-        """Extract data from BeautifulSoup object using a selector configuration."""
-        if selector is None:
-            logger.debug("Selector is None, skipping")
-            return None
-        
-        try:
-            # Handle string selector (direct CSS pattern)
-            if isinstance(selector, str):
-                elements = soup_item.select(selector)
-                return elements or None
-            
-            # Handle dictionary selector configuration
-            method = selector.get('method', 'select_one')
-            pattern = selector.get('pattern')
-            attribute = selector.get('attribute')
-            text_only = selector.get('text', False)
-            transform = selector.get('transform')
-            
-            logger.debug(f"Extracting with selector - Method: {method}, Pattern: {pattern}, "
-                        f"Attribute: {attribute}, Text Only: {text_only}, Transform: {transform}")
-            
-            if method == 'select_one':
-                element = soup_item.select_one(pattern)
-                if element:
-                    if attribute:
-                        value = element.get(attribute) or None
-                    else:
-                        value = element.text.strip() if text_only else str(element)
-                else:
-                    value = None
-                    
-            elif method == 'select':
-                elements = soup_item.select(pattern)
-                if elements:
-                    if attribute:
-                        value = [el.get(attribute) or None for el in elements]
-                    else:
-                        value = [el.text.strip() if text_only else str(el) for el in elements]
-                else:
-                    value = None
-            else:
-                logger.warning(f"Unsupported selector method: {method}")
-                return None
-
-            # Apply transformations if specified
-            if transform and value:
-                logger.debug(f"Applying transform '{transform}' to value: {value}")
-                if transform == 'first_url':
-                    value = value.split(',')[0].split(' ')[0] if isinstance(value, str) else value
-                elif transform == 'clean_price':
-                    value = self._transform_price(value) or None
-                elif transform == 'first_price':
-                    min_price, _ = self._extract_price_range(value)
-                    value = min_price or None
-                elif transform == 'last_price':
-                    _, max_price = self._extract_price_range(value)
-                    value = max_price or None
-                
-            logger.debug(f"Final extracted value: {value}")
-            return value
-            
-        except Exception as e:
-            logger.error(f"Error in extract_with_selector: {e}")
-            return None
+__all__ = ["BaseScraper", "BlockedError", "HumanScrollingMixin", "SelectorMixin"]
 
-    def get_config_value(self, field: str, config: Dict[str, Any]) -> Any:
-        """
-        Get a value directly from config for fields that don't need selectors.
-        Args:
-            field: The field name to look for in config
-            config: The configuration dictionary
-        Returns:
-            The config value if found, None otherwise
-        """
-        # First check if it's a direct config value
-        if field in config:
-            return config[field]
-        return None
+# Empties the first arguments[1] tiles matching arguments[0] (the tiles of the last
+# page_source snapshot, as listings only append tiles) and fixes their height, so the
+# page keeps its scroll position and layout. Returns the number of tiles pruned.
+PRUNE_TILES_SCRIPT = """
+var tiles = document.querySelectorAll(arguments[0]);
+var count = Math.min(arguments[1], tiles.length), pruned = 0;
+for (var i = 0; i < count; i++) {
+  var tile = tiles[i];
+  if (tile.hasAttribute('data-scraper-pruned')) { continue; }
+  var height = tile.getBoundingClientRect().height;
+  tile.style.boxSizing = 'border-box';
+  tile.style.height = height + 'px';
+  tile.replaceChildren();
+  tile.setAttribute('data-scraper-pruned', '');
+  pruned++;
+}
+return pruned;
+"""
 
-    def extract_metadata(self, soup_item: BeautifulSoup, selector_config: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Extract metadata fields using nested selectors configuration.
-        
-        Args:
-            soup_item: BeautifulSoup object to extract from
-            selector_config: Dictionary containing metadata selectors configuration
-            
-        Returns:
-            Dictionary of extracted metadata where each key is the metadata field
-            and value is the extracted data
-        """
-        metadata = {}
-        
-        # Get the nested selectors for metadata fields
-        selectors = selector_config.get('selectors', {})
-        
-        # Extract each configured metadata field
-        for field, field_selector in selectors.items():
-            try:
-                value = self.extract_with_selector(soup_item, field_selector)
-                if value is not None:
-                    metadata[field] = value
-            except Exception as e:
-                logger.debug(f"Failed to extract metadata field '{field}': {str(e)}")
-                continue
-            
-        return metadata
+# Bundled scripts: each replaces several WebDriver commands with one round-trip, which
+# matters most for remote browsers (use_scraping_browser). They return plain values, so
+# they work the same with the playwright backend and in recorded sessions.
+
+# Number of elements matching arguments[0]; find_elements would send every element back
+COUNT_TILES_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+
+# Whether an element matching arguments[0] is visible; scrolls the first visible one to
+# the center of the viewport if arguments[1] is true
+VISIBLE_ELEMENT_SCRIPT = """
+var elements = document.querySelectorAll(arguments[0]);
+for (var i = 0; i < elements.length; i++) {
+  var element = elements[i];
+  if (element.getClientRects().length && getComputedStyle(element).visibility !== 'hidden') {
+    if (arguments[1]) { element.scrollIntoView({behavior: 'smooth', block: 'center'}); }
+    return true;
+  }
+}
+return false;
+"""
+
+# Clicks every visible element matching arguments[0] (popup close buttons). Returns
+# [number clicked], or null while no element matches
+DISMISS_POPUP_SCRIPT = """
+var elements = document.querySelectorAll(arguments[0]);
+if (!elements.length) { return null; }
+var clicked = 0;
+for (var i = 0; i < elements.length; i++) {
+  if (elements[i].getClientRects().length) {
+    try { elements[i].click(); clicked++; } catch (e) {}
+  }
+}
+return [clicked];
+"""
+
+# Document height, viewport height and scroll offset for human_like_scroll
+SCROLL_METRICS_SCRIPT = "return [document.body.scrollHeight, window.innerHeight, window.pageYOffset];"
+
+class BlockedError(Exception):
+    """Raised when a store appears to be blocking the scraper."""
 
-    def extract_product_info(self, soup_item: BeautifulSoup, selectors: Dict[str, Any], config: Dict[str, Any] = None) -> Dict[str, Any]:
-        """
-        Extract all product information using configured selectors and config values.
-        Args:
-            soup_item: BeautifulSoup object of the product item
-            selectors: Dictionary of selector configurations
-            config: Full configuration dictionary for non-selector values
-        Returns:
-            Dictionary of extracted product information
-        """
-        product_info = {}
-        config = config or {}
-        
-        for field, selector in selectors.items():
-            try:
-                # First try to get value from config if it's a direct config field
-                config_value = self.get_config_value(field, config)
-                if config_value is not None:
-                    product_info[field] = config_value
-                    logger.debug(f"Using config value for {field}: {config_value}")
-                    continue
-                
-                # Special handling for metadata field
-                if field == 'product_metadata' and isinstance(selector, dict) and selector.get('method') == 'extract_metadata':
-                    metadata = self.extract_metadata(soup_item, selector)
-                    product_info[field] = metadata if metadata else None
-                    continue
-                    
-                # If no config value, try to extract using selector
-                value = self.extract_with_selector(soup_item, selector)
-                # Always add the field to product_info, even if value is None
-                product_info[field] = value
-                
-            except Exception as e:
-                logger.error(f"Error extracting field '{field}': {str(e)}")
-                product_info[field] = None
-                continue
-            
-        return product_info
 
 class BaseScraper(ABC):
+    """
+    Config-driven scraper engine.
+
+    Store scrapers combine this class with SelectorMixin (field extraction) and
+    HumanScrollingMixin (scrolling), and usually only need their SCRAPER_CONFIG.
+    Override open_page or the pagination helpers for store-specific behaviour.
+    """
+
     def __init__(self, config: dict):
         self.config = config
         self.driver = None
+        # Set by run_scraper in incremental mode (see crawlers.incremental.TileIndex)
+        self.tile_index = None
+        # Set by run_scraper (see crawlers.checkpoint.CheckpointManager)
+        self.checkpoint = None
+        # Last checkpoint to continue from when resuming
+        self.resume_state = None
+        # Set by run_scraper to deduplicate across URLs and runs (see crawlers.dedup)
+        self.dedup_index = None
+        # Set by run_scraper when the store has a rate_limit (see crawlers.rate_limit.HostSession)
+        self.host_session = None
+        # Optional callable(scraper) -> driver replacing the browser, e.g. to record or
+        # replay sessions (see crawlers.replay)
+        self.driver_factory = None
+        # Per-phase timers and counters; run_scraper shares one across URLs (see crawlers.metrics)
+        self.metrics = RunMetrics()
+        # Empty extracted tiles in the live page so DOM size stays bounded (see prune_tiles)
+        self.prune_dom = bool(config.get("dom_pruning", {}).get("enabled", False))
+        # Set by run_scraper to serve and store listing snapshots (see crawlers.page_cache)
+        self.page_cache = None
+        # Listing URL the current crawl started from, the page cache key
+        self.listing_url = None
+        # Number of cached steps to extract from instead of the browser (see load_cached_listing)
+        self.cached_steps = 0
+        # Next step to store in the page cache during a live crawl, None when not storing
+        self._cache_step = None
 
+    def restore_checkpoint(self) -> Tuple[List[Dict[str, Any]], Set[str], int]:
+        """
+        Return the crawl state to start extraction from.
+        Returns:
+            Tuple of (items emitted so far, seen product IDs, page index)
+        """
+        state = self.resume_state
+        if not state:
+            return [], set(), 0
+        logger.info(f"Resuming from checkpoint at page {state['page_index']} "
+                    f"with {len(state['items'])} items already extracted")
+        return list(state["items"]), set(state["seen_product_ids"]), state["page_index"]
+
+    def save_checkpoint(self, page_index: int, seen_product_ids: Set[str], items: List[Dict[str, Any]]) -> None:
+        """Write a checkpoint for the current page if checkpointing is enabled."""
+        if not self.checkpoint:
+            return
+        try:
+            self.checkpoint.maybe_save(self.driver.current_url, page_index, seen_product_ids, items)
+        except Exception as e:
+            logger.warning(f"Failed to write checkpoint: {e}")
+
+    @timed("popups")
     def handle_popups(self, wait_time: int = 5) -> None:
         """Handle any popups that might appear."""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
         popup_handlers = self.config.get("popup_handlers", [])
         logger.info(f"Found {len(popup_handlers)} popup handlers")
         logger.info(f"Popup handlers: {popup_handlers}")
@@ -239,64 +163,662 @@ class BaseScraper(ABC):
                 if handler_type == "close_button":
                     logger.info(f"Looking for popup close button: {selector}")
                     
-                    # Wait for elements to appear
+                    # Wait for close buttons to appear and click the visible ones, one round-trip per check
                     try:
                         wait = WebDriverWait(self.driver, handler_wait_time)
-                        wait.until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
+                        clicked = wait.until(
+                            lambda driver: driver.execute_script(DISMISS_POPUP_SCRIPT, selector)
+                        )[0]
                     except TimeoutException:
                         logger.info(f"No popup appeared within {handler_wait_time} seconds")
                         continue
                     
-                    # Find and try to click elements
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        logger.info(f"Found {len(elements)} popup close buttons")
-                        for elem in elements:
-                            try:
-                                button_id = elem.get_attribute('id')
-                                logger.info(f"Trying to click button ID: {button_id}")
-                                if elem.is_displayed():  # Just check if it's visible
-                                    elem.click()
-                                    logger.info(f"Successfully clicked popup button: {button_id}")
-                                    time.sleep(0.5)
-                            except Exception as e:
-                                logger.debug(f"Could not click button {button_id}: {e}")
-                                continue
+                    if clicked:
+                        logger.info(f"Clicked {clicked} popup close buttons")
+                        self.pause(0.5, 0.5)
                     else:
-                        logger.info("No popup buttons found")
+                        logger.info("No visible popup buttons found")
                     
             except Exception as e:
                 logger.warning(f"Error handling popup: {str(e)}")
 
-    @abstractmethod
+    @timed("sleep")
+    def pause(self, min_seconds: float, max_seconds: float) -> None:
+        """Sleep for a random duration between min_seconds and max_seconds."""
+        heartbeat()
+        time.sleep(random.uniform(min_seconds, max_seconds))
+
+    @timed("rate_limit_wait")
+    def throttle(self) -> None:
+        """Wait for the host's rate limiter before a page load or pagination action."""
+        heartbeat()
+        if self.host_session:
+            self.host_session.throttle()
+
+    def report_block(self, reason: str) -> None:
+        """Report a block signal so all workers back off from this store's host."""
+        logger.warning(f"Block signal: {reason}")
+        self.metrics.count("blocks")
+        if self.host_session:
+            self.host_session.report_failure()
+
     def open_page(self, url: str) -> None:
-        """Open the URL using either normal or scraping browser."""
-        pass
+        """Open the URL using configured browser."""
+        logger.info(f"Opening page: {url}")
+        self.driver = self.setup_driver()
+        self.throttle()
+        with self.metrics.phase("page_load"):
+            self.driver.get(url)
+        self.pause(2.0, 4.0)
+        logger.debug("Page loaded successfully")
+
+        # Handle any popups
+        self.handle_popups()
+        logger.debug("Popup handling completed")
 
-    @abstractmethod
+    @timed("scroll")
     def scroll_page(self) -> None:
-        """Perform any scroll logic or pagination required."""
-        pass
+        """Scroll the page using human-like behavior."""
+        logger.debug("Starting page scroll")
+        if self.config.get("scroll_behavior", {}).get("human_like", True):
+            self.human_like_scroll(self.driver)
+        else:
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
+        self.pause(1.5, 3.0)
+        logger.debug("Page scroll completed")
+
+    def load_cached_listing(self, url: str, items_limit: Optional[int] = None) -> bool:
+        """
+        Check the page cache for fresh snapshots of a listing.
+        Returns:
+            True if extract_items will be served from the cache, so no browser is needed
+        """
+        self.listing_url = url
+        self.cached_steps = 0
+        if self.page_cache is None:
+            return False
+        ttl_minutes = self.config.get("page_cache", {}).get("ttl_minutes", DEFAULT_TTL_MINUTES)
+        with self.metrics.phase("page_cache"):
+            self.cached_steps = self.page_cache.lookup(self.config.get("store"), url, ttl_minutes * 60, items_limit)
+        self.metrics.count("page_cache_hits" if self.cached_steps else "page_cache_misses")
+        return bool(self.cached_steps)
+
+    def extract_cached_items(self, items_limit: int = None) -> List[Dict[str, Any]]:
+        """Extract items from the cached snapshots of the listing (see load_cached_listing)."""
+        logger.info(f"Extracting {self.listing_url} from {self.cached_steps} cached pages")
+        all_items_data: List[Dict[str, Any]] = []
+        seen_product_ids: Set[str] = set()
+        for step in range(self.cached_steps):
+            with self.metrics.phase("page_cache"):
+                html = self.page_cache.page(self.config.get("store"), self.listing_url, step)
+            self.metrics.count("pages")
+            self.metrics.count("cached_pages")
+            new_items = self.extract_page_items(all_items_data, seen_product_ids, items_limit, html=html)
+            logger.info(f"Extracted {new_items} new items (total: {len(all_items_data)})")
+            if self._limit_reached(seen_product_ids, items_limit):
+                logger.info(f"Reached specified items limit of {items_limit}")
+                break
+        logger.info(f"Completed extraction. Total unique items: {len(all_items_data)}")
+        return all_items_data
+
+    @property
+    def pagination_config(self) -> Dict[str, Any]:
+        """Pagination settings, defaulting to infinite scroll when none are configured."""
+        return self.config.get("pagination") or {"type": "infinite_scroll"}
+
+    def extract_items(self, items_limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Extract product information, paginating according to the store's config.
+
+        Supports the "next_button", "load_more_button" and "infinite_scroll"
+        pagination types. Extraction stops as soon as items_limit products have been
+        seen, without loading any further pages.
+
+        Load more and infinite scroll listings are extracted after every step by
+        default ("interleaved" mode). In "expand_then_extract" mode the listing is
+        first expanded to items_limit tiles or to its end, and then extracted from a
+        single snapshot (see expand_listing). Next button listings always use
+        interleaved mode.
+
+        Args:
+            items_limit: Maximum number of items to extract (optional)
+        """
+        pagination_type = self.pagination_config.get("type", "infinite_scroll")
+        if pagination_type not in ("next_button", "load_more_button", "infinite_scroll"):
+            raise ValueError(f"Unsupported pagination type: {pagination_type}")
+        mode = self.pagination_config.get("mode", "interleaved")
+        if mode not in ("interleaved", "expand_then_extract"):
+            raise ValueError(f"Unsupported pagination mode: {mode}")
+        if mode == "expand_then_extract" and pagination_type == "next_button":
+            # Each page replaces the previous one, so there is no listing to expand
+            logger.warning("expand_then_extract mode needs load_more_button or infinite_scroll pagination; "
+                           "using interleaved mode")
+            mode = "interleaved"
+
+        if self.cached_steps:
+            return self.extract_cached_items(items_limit)
+
+        logger.info(f"Starting item extraction ({pagination_type} pagination)")
+        all_items_data, seen_product_ids, page_index = self.restore_checkpoint()
+
+        # Store the crawl's snapshots, unless it continues a checkpoint and misses the first pages
+        self._cache_step = None
+        if self.page_cache is not None and self.listing_url and not page_index:
+            self.page_cache.begin(self.config.get("store"), self.listing_url)
+            self._cache_step = 0
+        # Whether the crawl reached the end of the listing, rather than a limit or an error
+        exhausted = False
+
+        if mode == "expand_then_extract":
+            # Checkpointed items are kept, and the listing is expanded again from the start
+            exhausted = self.expand_listing(items_limit)
+            self.metrics.count("pages")
+            new_items = self.extract_page_items(all_items_data, seen_product_ids, items_limit)
+            logger.info(f"Extracted {new_items} new items (total: {len(all_items_data)})")
+
+        # On resume, re-expand load more listings to where the checkpoint was taken
+        elif page_index and pagination_type == "load_more_button":
+            self.reexpand_load_more(page_index)
+
+        tile_count = None
+        # Pages served by the current browser session (see browser_recycling)
+        session_pages = 0
+        while mode == "interleaved" and not self._limit_reached(seen_product_ids, items_limit):
+            reason = self.recycle_reason(session_pages)
+            if reason:
+                self.recycle_browser(reason, page_index)
+                session_pages = 0
+                tile_count = None
+            session_pages += 1
+            self.save_checkpoint(page_index, seen_product_ids, all_items_data)
+
+            next_button_visible = False
+            if pagination_type == "next_button":
+                # Bring the footer into view so lazily rendered tiles are loaded
+                next_button_visible = self.scroll_to_next_button()
+
+            self.metrics.count("pages")
+            seen_before = len(seen_product_ids)
+            new_items = self.extract_page_items(all_items_data, seen_product_ids, items_limit)
+            logger.info(f"Extracted {new_items} new items (total: {len(all_items_data)})")
+
+            if self._limit_reached(seen_product_ids, items_limit):
+                break
+
+            if pagination_type == "next_button":
+                # A button seen while scrolling to it needs no second check
+                if not next_button_visible and not self.has_next_page():
+                    logger.info("No more pages available")
+                    exhausted = True
+                    break
+                logger.info("Going to next page...")
+                if not self.click_next_page():
+                    break
+                self.pause(2.0, 4.0)
+
+            elif pagination_type == "load_more_button":
+                # Unchanged tiles skipped in incremental mode still count as progress
+                if len(seen_product_ids) == seen_before:
+                    logger.info("No new items found, stopping")
+                    exhausted = True
+                    break
+                current, total = self.get_total_items_info()
+                if total and current >= total:
+                    logger.info(f"All {total} items are loaded")
+                    exhausted = True
+                    break
+                if not self.check_load_more_button():
+                    logger.info("No load more button found, stopping")
+                    exhausted = True
+                    break
+                logger.info("Found load more button, clicking...")
+                if not self.click_load_more():
+                    logger.warning("Failed to click load more button")
+                    break
+                self.pause(2.0, 4.0)
+                self.scroll_page()
+
+            else:
+                tile_count = self.scroll_until_new_tiles(tile_count)
+                if tile_count is None:
+                    logger.info("No more items to load")
+                    exhausted = True
+                    break
+
+            page_index += 1
 
-    @abstractmethod
-    def extract_items(self) -> List[Dict[str, Any]]:
-        """Extract the clothing items from the currently loaded page."""
-        pass
+        if self._limit_reached(seen_product_ids, items_limit):
+            logger.info(f"Reached specified items limit of {items_limit}")
+        if self._cache_step is not None:
+            with self.metrics.phase("page_cache"):
+                self.page_cache.finish(self.config.get("store"), self.listing_url, self._cache_step,
+                                       len(seen_product_ids), exhausted)
+            self._cache_step = None
+        logger.info(f"Completed extraction. Total unique items: {len(all_items_data)}")
+        return all_items_data
 
-    @abstractmethod
+    def expand_listing(self, target: Optional[int] = None) -> bool:
+        """
+        Load tiles until the page holds target tiles or the listing is exhausted
+        (expand_then_extract mode). Progress is judged from in-page tile counts and
+        the total_items_indicator only, without taking snapshots.
+        Args:
+            target: Number of tiles to load, None to load the whole listing
+        Returns:
+            True if the end of the listing was reached
+        """
+        load_more = self.pagination_config.get("type") == "load_more_button"
+        tile_count = self.count_tiles()
+        steps = 0
+        while True:
+            logger.info(f"Expanded listing to {tile_count} tiles after {steps} steps")
+            if target and tile_count >= target:
+                return False
+            if load_more:
+                # "Viewing X of Y" knows the end of the listing before a missing button does
+                current, total = self.get_total_items_info()
+                if total and current >= total:
+                    logger.info(f"All {total} items are loaded")
+                    return True
+                if not self.check_load_more_button():
+                    logger.info("No load more button found, stopping")
+                    return True
+                if not self.click_load_more():
+                    logger.warning("Failed to click load more button")
+                    return False
+                self.pause(2.0, 4.0)
+                self.scroll_page()
+                new_count = self.count_tiles()
+                if new_count <= tile_count:
+                    logger.info("No new tiles loaded, stopping")
+                    return True
+            else:
+                new_count = self.scroll_until_new_tiles(tile_count)
+                if new_count is None:
+                    logger.info("No more items to load")
+                    return True
+            tile_count = new_count
+            steps += 1
+            self.metrics.count("expansions")
+
+    def reexpand_load_more(self, page_index: int) -> None:
+        """Click load more page_index times, to return a reopened listing to where the crawl was."""
+        logger.info(f"Re-expanding {page_index} load more pages before extraction")
+        for _ in range(page_index):
+            if not self.click_load_more():
+                logger.warning("Could not re-expand listing to its previous position")
+                break
+
+    def browser_memory(self) -> Optional[int]:
+        """
+        Return the memory of the local browser's processes in bytes (PSS, see
+        crawlers.multiplex.process_tree_memory), or None if it cannot be measured,
+        e.g. for remote, shared, recorded or replayed browsers.
+        """
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        if process is None:
+            return None
+        from crawlers.multiplex import process_tree_memory
+
+        return process_tree_memory(process.pid)
+
+    def recycle_reason(self, session_pages: int) -> Optional[str]:
+        """
+        Check the store's browser_recycling limits for the current browser session.
+        Args:
+            session_pages: Pages served by the session so far
+        Returns:
+            Why the browser should be replaced before the next page, or None
+        """
+        settings = self.config.get("browser_recycling") or {}
+        max_pages = settings.get("max_pages")
+        if max_pages and session_pages >= max_pages:
+            return f"{session_pages} pages served"
+        max_memory_mb = settings.get("max_memory_mb")
+        if max_memory_mb and session_pages:
+            memory = self.browser_memory()
+            if memory is not None and memory > max_memory_mb * 1024 * 1024:
+                return f"browser memory at {memory / (1024 * 1024):.0f} MB"
+        return None
+
+    def recycle_browser(self, reason: str, page_index: int) -> None:
+        """
+        Replace the browser mid-crawl and return to the current position: reopen the
+        current page, and re-expand load more listings. Tiles of infinite scroll
+        listings are scrolled past again and skipped as already seen.
+        Args:
+            reason: Why the browser is replaced, for the log
+            page_index: Pagination steps taken so far
+        """
+        current_url = self.driver.current_url
+        logger.info(f"Recycling the browser ({reason}), reopening {current_url}")
+        self.metrics.count("recycles")
+        self.cleanup()
+        self.driver = None
+        self.open_page(current_url)
+        if page_index and self.pagination_config.get("type") == "load_more_button":
+            self.reexpand_load_more(page_index)
+
+    @staticmethod
+    def _limit_reached(seen_product_ids: Set[str], items_limit: Optional[int]) -> bool:
+        """
+        Check whether items_limit products have been seen.
+        Unchanged tiles skipped in incremental mode count towards the limit, so an
+        incremental run covers the same part of the listing as a full run.
+        """
+        return bool(items_limit) and len(seen_product_ids) >= items_limit
+
+    def extract_page_items(self, all_items_data: List[Dict[str, Any]], seen_product_ids: Set[str],
+                           items_limit: Optional[int] = None, html: Optional[str] = None) -> int:
+        """
+        Parse the current page and extract all product tiles not seen before.
+        Args:
+            all_items_data: List that new items are appended to
+            seen_product_ids: Product IDs already handled, updated in place
+            items_limit: Stop extracting once this many products have been seen
+            html: Snapshot to extract from instead of the live page (e.g. from the page cache)
+        Returns:
+            Number of new items appended
+        """
+        heartbeat()
+        live = html is None
+        if live:
+            with self.metrics.phase("page_source"):
+                html = self.driver.page_source
+            if self._cache_step is not None:
+                with self.metrics.phase("page_cache"):
+                    self.page_cache.add_page(self.config.get("store"), self.listing_url, self._cache_step, html)
+                self._cache_step += 1
+        with self.metrics.phase("parse"):
+            items = parse_tiles(html, self.config["selectors"]["product_item"])
+        logger.debug(f"Found {len(items)} items in current view")
+        self.metrics.count("tiles", len(items))
+        with self.metrics.phase("extract"):
+            new_items = self._extract_tiles(items, all_items_data, seen_product_ids, items_limit)
+        if live and self.prune_dom:
+            self.prune_tiles(len(items))
+        return new_items
+
+    @timed("prune")
+    def prune_tiles(self, tile_count: int) -> int:
+        """
+        Empty the extracted tiles in the live page, keeping their height (dom_pruning mode).
+
+        Pruned tiles keep matching the product_item selector, so tile counts and the
+        site's own "append after the last tile" logic are unaffected, but they no longer
+        hold markup or images. Browser memory and the size of page_source then stay
+        roughly constant however deep an infinite scroll or load more listing goes.
+        Args:
+            tile_count: Number of tiles in the snapshot that was just extracted
+        Returns:
+            Number of tiles pruned
+        """
+        try:
+            pruned = self.driver.execute_script(
+                PRUNE_TILES_SCRIPT, self.config["selectors"]["product_item"], tile_count
+            ) or 0
+        except Exception as e:
+            logger.warning(f"Failed to prune extracted tiles: {e}")
+            return 0
+        logger.debug(f"Pruned {pruned} extracted tiles from the page")
+        self.metrics.count("pruned", pruned)
+        return pruned
+
+    def _extract_tiles(self, items: List[Any], all_items_data: List[Dict[str, Any]],
+                       seen_product_ids: Set[str], items_limit: Optional[int]) -> int:
+        """Extract the parsed tiles not seen before (see extract_page_items)."""
+        field_selectors = {
+            field: selector for field, selector in self.config["selectors"].items()
+            if field != "product_item"
+        }
+
+        new_items = 0
+        for idx, item in enumerate(items, 1):
+            if self._limit_reached(seen_product_ids, items_limit):
+                break
+
+            # Emptied by prune_tiles on an earlier iteration
+            if self.prune_dom and item.has_attr("data-scraper-pruned"):
+                continue
+
+            # Incremental mode: skip tiles unchanged since the previous run
+            if self.tile_index and self.tile_index.skip_tile(item, seen_product_ids):
+                self.metrics.count("unchanged")
+                continue
+
+            try:
+                product_info = self.extract_product_info(item, field_selectors, self.config)
+            except Exception as e:
+                logger.error(f"Error extracting item {idx}: {e}")
+                continue
+
+            raw_id = product_info.get('store_product_id') if product_info else None
+            product_id = normalize_product_id(raw_id, self.config.get("id_normalizer"))
+            if not product_id or product_id in seen_product_ids:
+                continue
+            product_info['store_product_id'] = product_id
+            seen_product_ids.add(product_id)
+
+            if self.tile_index and not self.tile_index.track(product_id, item, product_info):
+                self.metrics.count("unchanged")
+                continue
+            # Skip products already emitted for another URL or in a previous run
+            if self.dedup_index is not None and not self.dedup_index.add(f"{self.config.get('store')}:{product_id}"):
+                self.metrics.count("duplicates")
+                continue
+            all_items_data.append(product_info)
+            self.metrics.count("items")
+            new_items += 1
+
+        return new_items
+
+    def count_tiles(self) -> int:
+        """Count the product tiles currently in the DOM."""
+        return int(self.driver.execute_script(COUNT_TILES_SCRIPT, self.config["selectors"]["product_item"]) or 0)
+
+    def scroll_until_new_tiles(self, tile_count: Optional[int] = None) -> Optional[int]:
+        """
+        Scroll until more product tiles are loaded (infinite scroll pagination).
+        Args:
+            tile_count: Tile count before scrolling, if already known
+        Returns:
+            The new tile count, or None if no tiles were added within max_idle_scrolls scrolls
+        """
+        max_idle_scrolls = self.pagination_config.get("max_idle_scrolls", 2)
+        if tile_count is None:
+            tile_count = self.count_tiles()
+
+        for attempt in range(1, max_idle_scrolls + 1):
+            self.throttle()
+            self.scroll_page()
+            new_count = self.count_tiles()
+            if new_count > tile_count:
+                logger.debug(f"Found {new_count - tile_count} newly loaded items")
+                return new_count
+            logger.info(f"No new items loaded after scroll {attempt}/{max_idle_scrolls}")
+        return None
+
+    @timed("scroll")
+    def scroll_to_next_button(self) -> bool:
+        """Scroll the next page button into view, if present. Returns whether it is visible."""
+        try:
+            next_button_selector = self.pagination_config["selectors"]["next_button"]["pattern"]
+            if not self.driver.execute_script(VISIBLE_ELEMENT_SCRIPT, next_button_selector, True):
+                # Continue anyway as we might be on the last page
+                logger.debug("No visible next button to scroll to")
+                return False
+            # Wait for dynamic content to load
+            self.pause(2.0, 3.0)
+            return True
+        except Exception as e:
+            logger.debug(f"Could not scroll to next button: {e}")
+            return False
+
+    @timed("pagination")
     def has_next_page(self) -> bool:
-        """Determine if there is another page to load."""
-        pass
+        """Check if there is a visible next page button."""
+        try:
+            next_button_selector = self.pagination_config["selectors"]["next_button"]["pattern"]
+            if not self.driver.execute_script(VISIBLE_ELEMENT_SCRIPT, next_button_selector, False):
+                logger.info("No next page button found on the page")
+                return False
+            return True
+        except Exception as e:
+            logger.info(f"Error checking for next page button: {e}")
+            return False
+
+    @timed("pagination")
+    def click_next_page(self) -> bool:
+        """Click the next page button."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        try:
+            next_button_selector = self.pagination_config["selectors"]["next_button"]["pattern"]
+            # Wait for a visible button and scroll it into view, one round-trip per check
+            WebDriverWait(self.driver, 5).until(
+                lambda driver: driver.execute_script(VISIBLE_ELEMENT_SCRIPT, next_button_selector, True)
+            )
+            self.pause(3.0, 5.0)
+
+            # Quick check for popups before clicking
+            logger.info("Checking for popups before clicking")
+            self.handle_popups(wait_time=self.pagination_config.get("popup_check_wait", 1))
+            logger.info("Popup check completed")
+
+            self.throttle()
+            # A native click, which sites treat as a user action, unlike a scripted one
+            self.driver.find_element(By.CSS_SELECTOR, next_button_selector).click()
+            self.pause(4.0, 6.0)
+            return True
+        except Exception as e:
+            logger.error(f"Error clicking next page button: {e}")
+            return False
 
-    @abstractmethod
     def go_to_next_page(self) -> None:
-        """Go to the next page (click the next button, if applicable)."""
-        pass
+        """Click the next page button if it exists."""
+        logger.info("Attempting to navigate to next page")
+        if self.has_next_page():
+            self.click_next_page()
+        else:
+            logger.info("No next page button found - we may be on the last page")
+
+    def _find_load_more_button(self, timeout: int):
+        """Return the load more button matching the configured text, or None."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        button_config = self.pagination_config["selectors"]["load_more_button"]
+        button_text = button_config.get("text_contains", "")
+
+        wait = WebDriverWait(self.driver, timeout)
+        buttons = wait.until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, button_config["pattern"]))
+        )
+        for button in buttons:
+            if button_text.lower() in button.text.lower():
+                return button
+        return None
+
+    @timed("pagination")
+    def check_load_more_button(self) -> bool:
+        """Check if the load more button is present and scroll it into view."""
+        try:
+            button = self._find_load_more_button(timeout=3)
+            if button is None:
+                return False
+            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
+            self.pause(1.0, 2.0)
+            return True
+        except Exception as e:
+            logger.debug(f"Load more button not found: {e}")
+            return False
+
+    @timed("pagination")
+    def click_load_more(self) -> bool:
+        """Click the load more button if it exists."""
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        try:
+            button = self._find_load_more_button(timeout=5)
+            if button is None:
+                return False
+            # Wait specifically for this button to be clickable
+            clickable_button = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable(button))
+            self.pause(0.5, 1.0)
+            self.throttle()
+            clickable_button.click()
+            self.pause(2.0, 4.0)
+            return True
+        except Exception as e:
+            logger.error(f"Error clicking load more button: {e}")
+            return False
+
+    def get_total_items_info(self) -> Tuple[int, int]:
+        """Get current and total items count from the indicator, or (0, 0) if unavailable."""
+        from selenium.webdriver.common.by import By
 
-    def setup_driver(self) -> webdriver.Remote:
+        indicator_config = self.pagination_config.get("selectors", {}).get("total_items_indicator")
+        if not indicator_config:
+            return 0, 0
+        try:
+            indicators = self.driver.find_elements(By.CSS_SELECTOR, indicator_config["pattern"])
+            if indicators:
+                match = re.search(indicator_config["text_pattern"], indicators[0].text)
+                if match:
+                    return int(match.group(1)), int(match.group(2))
+            return 0, 0
+        except Exception as e:
+            logger.error(f"Error getting total items info: {e}")
+            return 0, 0
+
+    @timed("driver_startup")
+    def setup_driver(self) -> "webdriver.Remote":
+        """Return the driver for a new session, from driver_factory if one is set."""
+        if self.driver_factory is not None:
+            driver = self.driver_factory(self)
+        else:
+            driver = self.launch_browser()
+        self.count_driver_calls(driver)
+        return driver
+
+    def count_driver_calls(self, driver) -> None:
+        """
+        Count the driver's round-trips to the browser as the driver_calls metric.
+        Every Selenium command, including element commands, goes through the driver's
+        execute (also for tab sessions), and every playwright backend call, including
+        element calls, through the driver's _run. Proxies such as RecordingDriver are
+        counted at the driver they wrap. Replayed sessions make no round-trips and are
+        not counted.
+        """
+        driver = getattr(driver, "_driver", driver)
+        for name in ("execute", "_run"):
+            method = getattr(driver, name, None)
+            if callable(method):
+                def counted(*args, _method=method, **kwargs):
+                    self.metrics.count("driver_calls")
+                    return _method(*args, **kwargs)
+                setattr(driver, name, counted)
+                return
+
+    def launch_browser(self) -> "webdriver.Remote":
         """Setup and return a configured webdriver based on config."""
+        backend = self.config.get("browser_backend", "selenium")
+        if backend == "playwright":
+            from crawlers.playwright_driver import launch_playwright
+            return launch_playwright(self.config)
+        if backend != "selenium":
+            raise ValueError(f"Unknown browser_backend '{backend}' (expected 'selenium' or 'playwright')")
+
+        from dotenv import load_dotenv
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        # Load environment variables from .env file
+        load_dotenv()
+
         chrome_options = Options()
         
         # Get browser config
@@ -355,6 +877,10 @@ class BaseScraper(ABC):
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--start-maximized")
+        for argument in browser_config.get("arguments", []):
+            chrome_options.add_argument(argument)
+        if browser_config.get("page_load_strategy"):
+            chrome_options.page_load_strategy = browser_config["page_load_strategy"]
         
         if self.config.get("use_scraping_browser"):
             # Setup the remote scraping browser
@@ -396,6 +922,7 @@ class BaseScraper(ABC):
         
         return driver
 
+    @timed("driver_shutdown")
     def cleanup(self) -> None:
         """Clean up resources."""
         if self.driver:
@@ -405,9 +932,7 @@ class BaseScraper(ABC):
 class HumanScrollingMixin:
     def human_like_scroll(self, driver):
         """Scroll down the page in a human-like manner."""
-        total_height = driver.execute_script("return document.body.scrollHeight")
-        viewport_height = driver.execute_script("return window.innerHeight")
-        current_position = driver.execute_script("return window.pageYOffset")
+        total_height, viewport_height, current_position = driver.execute_script(SCROLL_METRICS_SCRIPT) or (0, 0, 0)
         scroll_steps = random.randint(5, 8)
         
         for step in range(scroll_steps):
@@ -417,11 +942,11 @@ class HumanScrollingMixin:
                 current_position = total_height - viewport_height
             
             driver.execute_script(f"window.scrollTo({{top: {current_position}, behavior: 'smooth'}})")
-            time.sleep(random.uniform(0.5, 2.0))
+            self.pause(0.5, 2.0)
             
             # Occasionally pause longer (10% chance)
             if random.random() < 0.1:
-                time.sleep(random.uniform(1.5, 3.0))
+                self.pause(1.5, 3.0)
             
             if current_position >= total_height - viewport_height:
                 break
\ No newline at end of file
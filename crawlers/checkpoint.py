@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable
+
+from utils.files import atomic_write_json, read_json
+from utils.logger import logger
+
+
+class CheckpointManager:
+    """
+    Periodic, crash-safe checkpoints for a single paginated crawl.
+
+    A checkpoint records the page the crawl should continue from, the product IDs
+    already handled and the items emitted so far. The position is kept in a small,
+    atomically written JSON file; IDs and items are appended to a JSONL log next to
+    it, one line per checkpoint with only what is new since the previous one. The
+    JSON file holds the log's committed length, so a line left half-written by a
+    crash is ignored and overwritten. Each checkpoint therefore costs I/O for the
+    new page only, however long the listing gets.
+
+    One checkpoint is kept per (store, start URL) pair and removed once the URL completes.
+    """
+
+    def __init__(self, store_name: str, url: str, checkpoint_dir: str = "crawler_state/checkpoints",
+                 every_pages: int = 1):
+        """
+        Args:
+            store_name: Name of the store
+            url: Start URL of the crawl
+            checkpoint_dir: Directory for checkpoint files
+            every_pages: Write a checkpoint every N pages
+        """
+        self.store_name = store_name
+        self.url = url
+        self.every_pages = max(1, every_pages)
+        url_hash = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+        self.path = Path(checkpoint_dir) / f"{store_name}_{url_hash}.json"
+        self.log_path = self.path.with_suffix(".jsonl")
+        # What the log already holds: a fresh crawl starts over, load() continues the log
+        self._log_bytes = 0
+        self._logged_items = 0
+        self._logged_ids = set()
+
+    def save(self, current_url: str, page_index: int, seen_product_ids: Iterable[str],
+             items: List[Dict[str, Any]]) -> None:
+        """
+        Write a checkpoint for the given crawl position.
+        Args:
+            seen_product_ids: All product IDs handled so far; only new ones are written
+            items: All items emitted so far, in order; only those after the last checkpoint are written
+        """
+        new_ids = [product_id for product_id in seen_product_ids if product_id not in self._logged_ids]
+        new_items = items[self._logged_items:]
+        line = json.dumps({"seen_product_ids": new_ids, "items": new_items},
+                          ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "ab") as f:
+            # Drop anything past the committed length, e.g. a line from a crashed save
+            f.truncate(self._log_bytes)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        atomic_write_json(self.path, {
+            "store": self.store_name,
+            "start_url": self.url,
+            "current_url": current_url,
+            "page_index": page_index,
+            "log_bytes": self._log_bytes + len(line),
+            "saved_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        })
+        self._log_bytes += len(line)
+        self._logged_items = len(items)
+        self._logged_ids.update(new_ids)
+        logger.debug(f"Checkpoint saved at page {page_index} with {len(new_items)} new items to {self.path}")
+
+    def maybe_save(self, current_url: str, page_index: int, seen_product_ids: Iterable[str],
+                   items: List[Dict[str, Any]]) -> None:
+        """Write a checkpoint if page_index falls on the configured interval."""
+        if page_index > 0 and page_index % self.every_pages == 0:
+            self.save(current_url, page_index, seen_product_ids, items)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the last checkpoint for this crawl, or None. Later saves continue its log.
+        Returns:
+            Dict with current_url, page_index, seen_product_ids and items
+        """
+        try:
+            state = read_json(self.path)
+            if not state or state.get("start_url") != self.url:
+                return None
+            # Checkpoints of older versions hold everything inline; the next save logs it all
+            seen_product_ids, items = state.get("seen_product_ids", []), state.get("items", [])
+            log_bytes = state.get("log_bytes", 0)
+            if log_bytes:
+                with open(self.log_path, "rb") as f:
+                    committed = f.read(log_bytes)
+                if len(committed) < log_bytes:
+                    raise ValueError(f"{self.log_path} is shorter than its checkpoint")
+                for line in committed.splitlines():
+                    entry = json.loads(line)
+                    seen_product_ids.extend(entry["seen_product_ids"])
+                    items.extend(entry["items"])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+        self._log_bytes = log_bytes
+        self._logged_items = len(items) if log_bytes else 0
+        self._logged_ids = set(seen_product_ids) if log_bytes else set()
+        return {**state, "seen_product_ids": seen_product_ids, "items": items}
+
+    def clear(self) -> None:
+        """Remove the checkpoint after the crawl completed."""
+        for path in (self.path, self.log_path):
+            if path.exists():
+                os.remove(path)
+        logger.debug(f"Removed checkpoint {self.path}")
@@ -0,0 +1,231 @@
+import hashlib
+import math
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit, parse_qs, urlencode, urlunsplit
+
+from utils.logger import logger
+
+
+def normalize_product_id(raw_id: Optional[str], rule: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Normalize a raw store_product_id using a store's "id_normalizer" rule.
+
+    Supported rule types:
+        query_param: {"type": "query_param", "param": "ID"} returns the value of a query parameter
+        strip_query: {"type": "strip_query", "keep_params": [...]} drops query parameters
+            (tracking, color swatches) except the listed ones, and any fragment
+        regex: {"type": "regex", "pattern": "...", "group": 1} returns a regex capture group
+
+    Args:
+        raw_id: Extracted product ID (often an href)
+        rule: Normalizer configuration, or None to return the ID unchanged
+    Returns:
+        The normalized ID, or the raw ID if the rule does not match
+    """
+    if not raw_id or not rule:
+        return raw_id
+
+    rule_type = rule.get("type")
+    try:
+        if rule_type == "query_param":
+            values = parse_qs(urlsplit(raw_id).query).get(rule["param"])
+            if values and values[0]:
+                return values[0]
+        elif rule_type == "strip_query":
+            parts = urlsplit(raw_id)
+            keep = set(rule.get("keep_params", []))
+            query = {k: v for k, v in parse_qs(parts.query).items() if k in keep}
+            return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query, doseq=True), ""))
+        elif rule_type == "regex":
+            match = re.search(rule["pattern"], raw_id)
+            if match:
+                return match.group(rule.get("group", 1))
+        else:
+            logger.warning(f"Unsupported id_normalizer type: {rule_type}")
+    except Exception as e:
+        logger.error(f"Error normalizing product ID '{raw_id}': {e}")
+
+    logger.debug(f"id_normalizer {rule_type} did not match '{raw_id}', keeping raw ID")
+    return raw_id
+
+
+class MemoryDedupIndex:
+    """In-memory dedup index, shared across the URLs of a single run."""
+
+    def __init__(self):
+        self._ids = set()
+
+    def add(self, key: str) -> bool:
+        """Add a key, returning True if it was not present before."""
+        if key in self._ids:
+            return False
+        self._ids.add(key)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class StagedDedupIndex:
+    """
+    Keys of one crawl attempt, staged on top of a shared index.
+
+    Keys already in the shared index are rejected, but new keys only reach it through
+    publish(). A failed attempt that is retried (crawlers.retry) therefore leaves no
+    keys behind that would make the retry drop its own products.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self._staged = set()
+
+    def add(self, key: str) -> bool:
+        """Stage a key, returning True if it is neither staged nor in the shared index."""
+        if key in self._staged or key in self.index:
+            return False
+        self._staged.add(key)
+        return True
+
+    def publish(self, keys: List[str]) -> List[bool]:
+        """
+        Add the keys of the items the attempt returned to the shared index.
+        Returns:
+            For each key, False if another URL emitted it in the meantime
+        """
+        return [self.index.add(key) for key in keys]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._staged or key in self.index
+
+    def __len__(self) -> int:
+        return len(self._staged)
+
+
+class SQLiteDedupIndex:
+    """
+    Disk-backed dedup index that persists across runs.
+
+    Memory use stays bounded regardless of catalog size. Keys added during a run
+    are only made permanent by commit(), so a run that fails before its results
+    are saved does not hide those products from the next run.
+    """
+
+    def __init__(self, path: str = "crawler_state/dedup.db"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Tab sessions (crawlers.multiplex) use the index from their own threads, one at a time
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen_ids (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.conn.commit()
+
+    def add(self, key: str) -> bool:
+        """Add a key, returning True if it was not present before."""
+        cursor = self.conn.execute("INSERT OR IGNORE INTO seen_ids (key) VALUES (?)", (key,))
+        return cursor.rowcount == 1
+
+    def __contains__(self, key: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM seen_ids WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM seen_ids").fetchone()[0]
+
+    def commit(self) -> None:
+        self.conn.commit()
+        logger.debug(f"Committed dedup index at {self.path}")
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class BloomDedupIndex:
+    """
+    Fixed-size Bloom filter dedup index, persisted to a file across runs.
+
+    Uses a constant amount of memory for the configured capacity. False positives
+    (a new product treated as already seen) occur at roughly error_rate; there are
+    no false negatives.
+    """
+
+    def __init__(self, path: Optional[str] = "crawler_state/dedup.bloom", capacity: int = 10_000_000,
+                 error_rate: float = 0.001):
+        self.path = Path(path) if path else None
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+
+        if self.path and self.path.exists():
+            data = self.path.read_bytes()
+            if len(data) == (self.num_bits + 7) // 8:
+                self.bits = bytearray(data)
+                logger.info(f"Loaded Bloom dedup index from {self.path}")
+                return
+            logger.warning(f"Bloom dedup index at {self.path} has a different size, starting empty")
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> bool:
+        """Add a key, returning True if it was (probably) not present before."""
+        added = False
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        """Number of keys added in this session."""
+        return self.count
+
+    def commit(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_bytes(self.bits)
+        tmp_path.replace(self.path)
+        logger.debug(f"Saved Bloom dedup index to {self.path}")
+
+    def close(self) -> None:
+        pass
+
+
+def create_dedup_index(backend: str = "memory", path: Optional[str] = None, **kwargs):
+    """
+    Create a dedup index.
+    Args:
+        backend: "memory" (single run), "sqlite" or "bloom" (persisted across runs)
+        path: File for persisted backends (optional)
+    Returns:
+        A dedup index with add/commit/close methods
+    """
+    if backend == "memory":
+        return MemoryDedupIndex()
+    if backend == "sqlite":
+        return SQLiteDedupIndex(path or "crawler_state/dedup.db")
+    if backend == "bloom":
+        return BloomDedupIndex(path or "crawler_state/dedup.bloom", **kwargs)
+    raise ValueError(f"Unsupported dedup backend: {backend}")
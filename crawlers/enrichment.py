@@ -0,0 +1,207 @@
+"""
+Product detail enrichment stage (run_scraper --enrich).
+
+Listing tiles lack sizes, materials and full color lists. This stage fetches the
+product_url of every extracted item over plain HTTP (no browser), concurrently
+with a cap per host, and extracts the fields configured in the store's
+detail_page selectors into the item's product_details. Selectors use the same
+format as the listing selectors (see SelectorMixin).
+
+Extracted fields are cached per product in SQLite, so a product is only fetched
+again once its cache entry is older than the configured TTL.
+"""
+import asyncio
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from crawlers.extraction import Extractor
+from crawlers.fetch import AsyncFetcher
+from utils.logger import logger
+
+DEFAULT_TTL_HOURS = 24
+
+
+def store_origin(base_url: str) -> str:
+    """Return the scheme and host of a store URL, e.g. https://www.macys.com."""
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def detail_url(product_url: Any, origin: str) -> Optional[str]:
+    """Resolve a (possibly relative) product_url against the store origin."""
+    if isinstance(product_url, list):
+        product_url = next((url for url in product_url if url), None)
+    if not product_url or not isinstance(product_url, str):
+        return None
+    url = urljoin(origin + "/", product_url.strip())
+    return url if urlsplit(url).scheme in ('http', 'https') else None
+
+
+class DetailCache:
+    """
+    SQLite cache of extracted detail fields per product.
+    Entries older than the TTL are treated as missing.
+    """
+
+    def __init__(self, path: str = "crawler_state/details.db"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS details (
+                store TEXT NOT NULL,
+                store_product_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                fields TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (store, store_product_id)
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    def get_fresh(self, store: str, product_ids: List[str], ttl_seconds: float) -> Dict[str, Dict[str, Any]]:
+        """Return the cached fields of the given products that are younger than ttl_seconds."""
+        cutoff = time.time() - ttl_seconds
+        fresh: Dict[str, Dict[str, Any]] = {}
+        ids = list(product_ids)
+        # Stay below SQLite's host parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT store_product_id, fields FROM details WHERE store = ? AND fetched_at >= ? "
+                f"AND store_product_id IN ({', '.join('?' for _ in chunk)})",
+                [store, cutoff, *chunk]
+            )
+            for product_id, fields in rows:
+                fresh[product_id] = json.loads(fields)
+        return fresh
+
+    def put(self, store: str, product_id: str, url: str, fields: Dict[str, Any]) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO details (store, store_product_id, url, fields, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (store, product_id, url, json.dumps(fields, ensure_ascii=False, default=str), time.time())
+        )
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class DetailEnricher:
+    """
+    Fetches product detail pages concurrently and adds their fields to items.
+
+    Each enriched item gets a product_details dict of the fields extracted from
+    its detail page; items whose page could not be fetched get none.
+    """
+
+    def __init__(self, config: Dict[str, Any], cache: Optional[DetailCache] = None, per_host: Optional[int] = None,
+                 max_concurrency: int = 16, timeout: float = 30):
+        """
+        Args:
+            config: The store's SCRAPER_CONFIG, with a detail_page section
+            cache: Cache of previously extracted fields (optional)
+            per_host: Maximum concurrent requests per host (default: detail_page.concurrency or 4)
+            max_concurrency: Maximum concurrent requests overall
+            timeout: Socket timeout per request, in seconds
+        """
+        detail_config = config.get("detail_page") or {}
+        if not detail_config.get("selectors"):
+            raise ValueError(f"Store '{config.get('store')}' has no detail_page selectors configured")
+        self.store = config.get("store")
+        self.origin = store_origin(config["base_url"])
+        self.selector_config = {"selectors": detail_config["selectors"]}
+        self.ttl_seconds = detail_config.get("ttl_hours", DEFAULT_TTL_HOURS) * 3600
+        self.cache = cache
+        self.extractor = Extractor()
+        self.fetcher = AsyncFetcher(per_host or detail_config.get("concurrency", 4), max_concurrency, timeout,
+                                    accept='text/html,application/xhtml+xml')
+        self.counts = {"products": 0, "cached": 0, "fetched": 0, "failed": 0, "no_url": 0}
+
+    def _extract(self, final_url: str, headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+        """Extract the detail fields from a fetched page (runs on a worker thread)."""
+        from bs4 import BeautifulSoup
+
+        charset = headers.get('content-type', '').partition('charset=')[2].split(';')[0].strip() or 'utf-8'
+        try:
+            html = body.decode(charset, errors='replace')
+        except LookupError:
+            html = body.decode('utf-8', errors='replace')
+        soup = BeautifulSoup(html, 'html.parser')
+        return self.extractor.extract_metadata(soup, self.selector_config)
+
+    async def _fetch(self, product_id: str, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            fields = await self.fetcher.fetch(url, self._extract)
+        except Exception as e:
+            logger.warning(f"Failed to fetch product details from {url}: {e}")
+            self.counts["failed"] += 1
+            return None
+        self.counts["fetched"] += 1
+        if self.cache:
+            self.cache.put(self.store, product_id, url, fields)
+        return fields
+
+    async def enrich_items(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Add detail page fields to items in place.
+        Returns:
+            Summary counts for the stage
+        """
+        started = time.perf_counter()
+        targets: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}
+        for item in items:
+            url = detail_url(item.get("product_url"), self.origin)
+            if not url:
+                self.counts["no_url"] += 1
+                continue
+            product_id = item.get("store_product_id") or url
+            targets.setdefault(product_id, (url, []))[1].append(item)
+        self.counts["products"] = len(targets)
+
+        details = self.cache.get_fresh(self.store, list(targets), self.ttl_seconds) if self.cache else {}
+        self.counts["cached"] = len(details)
+
+        pending = {product_id: url for product_id, (url, _) in targets.items() if product_id not in details}
+        async with self.fetcher:
+            results = await asyncio.gather(*(self._fetch(product_id, url) for product_id, url in pending.items()))
+        details.update((product_id, fields) for product_id, fields in zip(pending, results) if fields is not None)
+        if self.cache:
+            self.cache.commit()
+
+        for product_id, (_, product_items) in targets.items():
+            fields = details.get(product_id)
+            if not fields:
+                continue
+            for item in product_items:
+                item["product_details"] = fields
+
+        summary = {**self.counts, "seconds": round(time.perf_counter() - started, 3)}
+        logger.info(f"Detail enrichment: {summary}")
+        return summary
+
+
+def enrich_items(items: List[Dict[str, Any]], config: Dict[str, Any], cache_path: Optional[str] = None,
+                 **kwargs) -> Dict[str, Any]:
+    """
+    Enrich items with detail page fields (see DetailEnricher for the options).
+    Args:
+        items: Extracted items, updated in place
+        config: The store's SCRAPER_CONFIG
+        cache_path: SQLite detail cache; None disables caching
+    Returns:
+        Summary counts for the stage
+    """
+    cache = DetailCache(cache_path) if cache_path else None
+    try:
+        return asyncio.run(DetailEnricher(config, cache, **kwargs).enrich_items(items))
+    finally:
+        if cache:
+            cache.close()
@@ -0,0 +1,346 @@
+"""
+Browser-free extraction engine: field selectors, transforms and listing parsing.
+
+Importing this module loads neither Selenium nor BeautifulSoup, so tools that
+re-extract saved HTML or post-process results start quickly. BeautifulSoup is
+imported on first parse.
+
+Usage:
+    python -m crawlers.extraction --store macys saved_page.html [more_pages.html ...]
+"""
+import argparse
+import importlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from utils.logger import logger
+from crawlers.dedup import normalize_product_id
+
+if TYPE_CHECKING:
+    from bs4 import Tag
+
+
+def parse_tiles(html: str, tile_selector: str) -> List["Tag"]:
+    """
+    Parse a listing page and return its product tiles.
+    Args:
+        html: Page source
+        tile_selector: CSS selector of a product tile (the config's product_item selector)
+    Returns:
+        List of tile elements
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    return soup.select(tile_selector)
+
+
+def project_config(config: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """
+    Restrict a store's config to the selectors of the requested fields (run_scraper --fields).
+
+    Unrequested selectors, including unrequested product_metadata sub-selectors, are
+    dropped, so they never run and their fields are absent from the items.
+    Args:
+        config: The store's SCRAPER_CONFIG
+        fields: Field names; "product_metadata.<name>" keeps a single metadata field.
+            store_product_id is always kept, since items are deduplicated on it.
+    Returns:
+        A copy of the config with the projected selectors
+    Raises:
+        ValueError: If a field has no selector in the config
+    """
+    selectors = config["selectors"]
+    projected = {"product_item": selectors["product_item"], "store_product_id": selectors["store_product_id"]}
+    metadata_fields = []
+    for field in fields:
+        field, _, sub_field = field.strip().partition(".")
+        if field not in selectors or field == "product_item":
+            raise ValueError(f"Unknown field '{field}' for store {config.get('store')}")
+        if sub_field:
+            metadata_selectors = selectors[field].get("selectors", {}) if isinstance(selectors[field], dict) else {}
+            if field != "product_metadata" or sub_field not in metadata_selectors:
+                raise ValueError(f"Unknown field '{field}.{sub_field}' for store {config.get('store')}")
+            metadata_fields.append(sub_field)
+        else:
+            projected[field] = selectors[field]
+
+    if metadata_fields and "product_metadata" not in projected:
+        metadata = selectors["product_metadata"]
+        projected["product_metadata"] = {
+            **metadata,
+            "selectors": {name: sel for name, sel in metadata["selectors"].items() if name in metadata_fields},
+        }
+    # Keep the store's field order
+    return {**config, "selectors": {field: projected[field] for field in selectors if field in projected}}
+
+
+class SelectorMixin:
+    """Mixin class for handling selectors in a consistent way across scrapers."""
+    
+    def _transform_price(self, value: str) -> str:
+        """Clean and transform price string."""
+        try:
+            if not value:
+                return None
+            # Remove currency symbols and any whitespace
+            cleaned = value.replace('$', '').replace('USD', '').strip()
+            logger.debug(f"Transformed price from '{value}' to '{cleaned}'")
+            return cleaned
+        except Exception as e:
+            logger.error(f"Error in _transform_price for value '{value}': {str(e)}")
+            return None
+    
+    def _extract_price_range(self, value: str) -> tuple:
+        """Extract min and max prices from a price range string."""
+        try:
+            if not value:
+                return None, None
+            
+            # Clean the string and split by range indicator
+            clean_value = value.replace('$', '').replace('USD', '').strip()
+            logger.debug(f"Cleaned price range value: {clean_value}")
+            
+            # Remove discount information in parentheses if present
+            if '(' in clean_value:
+                clean_value = clean_value.split('(')[0].strip()
+                logger.debug(f"Removed parentheses info: {clean_value}")
+            
+            # Handle both regular hyphen (-) and en dash (–)
+            if '-' in clean_value or '–' in clean_value:
+                clean_value = clean_value.replace('–', '-')
+                parts = clean_value.split('-')
+                min_price = parts[0].strip()
+                max_price = parts[1].strip()
+                logger.debug(f"Split price range: min={min_price}, max={max_price}")
+                return min_price, max_price
+            
+            logger.debug(f"Single price value: {clean_value}")
+            return clean_value, clean_value
+            
+        except Exception as e:
+            logger.error(f"Error extracting price range from '{value}': {str(e)}")
+            return None, None
+    
+    def extract_with_selector(self, soup_item: "Tag", selector: Dict[str, Any] | str) -> Any:
+        """Extract data from BeautifulSoup object using a selector configuration."""
+        if selector is None:
+            logger.debug("Selector is None, skipping")
+            return None
+        
+        try:
+            # Handle string selector (direct CSS pattern)
+            if isinstance(selector, str):
+                elements = soup_item.select(selector)
+                return elements or None
+            
+            value = self._select_value(soup_item, selector)
+
+            # Apply transformations if specified
+            transform = selector.get('transform')
+            if transform and value:
+                value = self._apply_transform(value, transform)
+                
+            logger.debug(f"Final extracted value: {value}")
+            return value
+            
+        except Exception as e:
+            logger.error(f"Error in extract_with_selector: {e}")
+            return None
+
+    def _select_value(self, soup_item: "Tag", selector: Dict[str, Any]) -> Any:
+        """Look up the raw value of a dictionary selector configuration, before any transform."""
+        method = selector.get('method', 'select_one')
+        pattern = selector.get('pattern')
+        attribute = selector.get('attribute')
+        text_only = selector.get('text', False)
+        
+        logger.debug(f"Extracting with selector - Method: {method}, Pattern: {pattern}, "
+                    f"Attribute: {attribute}, Text Only: {text_only}, Transform: {selector.get('transform')}")
+        
+        if method == 'select_one':
+            element = soup_item.select_one(pattern)
+            if element:
+                if attribute:
+                    return element.get(attribute) or None
+                return element.text.strip() if text_only else str(element)
+            return None
+                
+        if method == 'select':
+            elements = soup_item.select(pattern)
+            if elements:
+                if attribute:
+                    return [el.get(attribute) or None for el in elements]
+                return [el.text.strip() if text_only else str(el) for el in elements]
+            return None
+
+        logger.warning(f"Unsupported selector method: {method}")
+        return None
+
+    def _apply_transform(self, value: Any, transform: str) -> Any:
+        """Apply a selector's named transform to an extracted value."""
+        logger.debug(f"Applying transform '{transform}' to value: {value}")
+        if transform == 'first_url':
+            return value.split(',')[0].split(' ')[0] if isinstance(value, str) else value
+        if transform == 'clean_price':
+            return self._transform_price(value) or None
+        if transform == 'first_price':
+            min_price, _ = self._extract_price_range(value)
+            return min_price or None
+        if transform == 'last_price':
+            _, max_price = self._extract_price_range(value)
+            return max_price or None
+        return value
+
+    def get_config_value(self, field: str, config: Dict[str, Any]) -> Any:
+        """
+        Get a value directly from config for fields that don't need selectors.
+        Args:
+            field: The field name to look for in config
+            config: The configuration dictionary
+        Returns:
+            The config value if found, None otherwise
+        """
+        # First check if it's a direct config value
+        if field in config:
+            return config[field]
+        return None
+
+    def extract_metadata(self, soup_item: "Tag", selector_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract metadata fields using nested selectors configuration.
+        
+        Args:
+            soup_item: BeautifulSoup Tag to extract from
+            selector_config: Dictionary containing metadata selectors configuration
+            
+        Returns:
+            Dictionary of extracted metadata where each key is the metadata field
+            and value is the extracted data
+        """
+        metadata = {}
+        
+        # Get the nested selectors for metadata fields
+        selectors = selector_config.get('selectors', {})
+        
+        # Extract each configured metadata field
+        for field, field_selector in selectors.items():
+            try:
+                value = self.extract_with_selector(soup_item, field_selector)
+                if value is not None:
+                    metadata[field] = value
+            except Exception as e:
+                logger.debug(f"Failed to extract metadata field '{field}': {str(e)}")
+                continue
+            
+        return metadata
+
+    def extract_product_info(self, soup_item: "Tag", selectors: Dict[str, Any], config: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Extract all product information using configured selectors and config values.
+        Args:
+            soup_item: BeautifulSoup Tag of the product item
+            selectors: Dictionary of selector configurations
+            config: Full configuration dictionary for non-selector values
+        Returns:
+            Dictionary of extracted product information
+        """
+        product_info = {}
+        config = config or {}
+        
+        for field, selector in selectors.items():
+            try:
+                # First try to get value from config if it's a direct config field
+                config_value = self.get_config_value(field, config)
+                if config_value is not None:
+                    product_info[field] = config_value
+                    logger.debug(f"Using config value for {field}: {config_value}")
+                    continue
+                
+                # Special handling for metadata field
+                if field == 'product_metadata' and isinstance(selector, dict) and selector.get('method') == 'extract_metadata':
+                    metadata = self.extract_metadata(soup_item, selector)
+                    product_info[field] = metadata if metadata else None
+                    continue
+                    
+                # If no config value, try to extract using selector
+                value = self.extract_with_selector(soup_item, selector)
+                # Always add the field to product_info, even if value is None
+                product_info[field] = value
+                
+            except Exception as e:
+                logger.error(f"Error extracting field '{field}': {str(e)}")
+                product_info[field] = None
+                continue
+            
+        return product_info
+
+
+class Extractor(SelectorMixin):
+    """SelectorMixin on its own, for extraction without a scraper or browser."""
+
+
+def extract_listing(html: str, config: Dict[str, Any],
+                    extractor: Optional[SelectorMixin] = None) -> List[Dict[str, Any]]:
+    """
+    Extract the products of a saved listing page, the way a scraper would.
+    Args:
+        html: Page source
+        config: The store's SCRAPER_CONFIG
+        extractor: SelectorMixin to extract with (optional)
+    Returns:
+        List of product information, one entry per unique product ID
+    """
+    extractor = extractor or Extractor()
+    field_selectors = {field: sel for field, sel in config["selectors"].items() if field != "product_item"}
+
+    items = []
+    seen_product_ids = set()
+    for idx, tile in enumerate(parse_tiles(html, config["selectors"]["product_item"]), 1):
+        try:
+            product_info = extractor.extract_product_info(tile, field_selectors, config)
+        except Exception as e:
+            logger.error(f"Error extracting item {idx}: {e}")
+            continue
+        product_id = normalize_product_id(product_info.get("store_product_id"), config.get("id_normalizer"))
+        if not product_id or product_id in seen_product_ids:
+            continue
+        product_info["store_product_id"] = product_id
+        seen_product_ids.add(product_id)
+        items.append(product_info)
+    return items
+
+
+def main():
+    """Re-extract products from saved listing pages and save them like a crawl."""
+    parser = argparse.ArgumentParser(description='Extract products from saved listing HTML')
+    parser.add_argument('--store', type=str, required=True, help='Store name (e.g., lululemon)')
+    parser.add_argument('html_files', nargs='+', help='Saved page sources')
+    parser.add_argument('--output', type=str, default='crawler_output', help='Output directory for results')
+    parser.add_argument('--db', type=str, help='SQLite database to upsert results into (optional)')
+    args = parser.parse_args()
+
+    from crawlers.output import save_results, save_results_sqlite
+
+    config = importlib.import_module(f"crawlers.stores.{args.store}.scripts.config").SCRAPER_CONFIG
+    extractor = Extractor()
+    items = []
+    seen_product_ids = set()
+    for path in args.html_files:
+        page_items = extract_listing(Path(path).read_text(encoding='utf-8'), config, extractor)
+        new_items = [item for item in page_items if item["store_product_id"] not in seen_product_ids]
+        seen_product_ids.update(item["store_product_id"] for item in new_items)
+        items.extend(new_items)
+        logger.info(f"Extracted {len(new_items)} new items from {path}")
+
+    if not items:
+        print("\nNo items were extracted.")
+        return
+    output_file = save_results(items, args.store, args.output, {"source_files": args.html_files})
+    if args.db:
+        save_results_sqlite(items, args.store, args.db)
+    print(f"\nTotal items extracted: {len(items)}")
+    print(f"Results saved to: {output_file}")
+
+if __name__ == "__main__":
+    main()
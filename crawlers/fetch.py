@@ -0,0 +1,138 @@
+"""
+Pooled HTTP client for the post-crawl stages (image downloads, detail enrichment).
+
+Requests run on worker threads over keep-alive connections and are scheduled
+from an asyncio event loop, with a concurrency cap per host and overall.
+"""
+import asyncio
+import http.client
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from crawlers.watchdog import heartbeat
+
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+MAX_REDIRECTS = 5
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections, pooled per host.
+    Connections are used by one request at a time; callers bound concurrency.
+    """
+
+    def __init__(self, timeout: float = 30, user_agent: str = DEFAULT_USER_AGENT, accept: str = '*/*'):
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.accept = accept
+        self._idle: Dict[Tuple[str, str], queue.SimpleQueue] = {}
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _request(self, scheme: str, netloc: str, target: str) -> Tuple[int, Dict[str, str], bytes]:
+        idle = self._idle.setdefault((scheme, netloc), queue.SimpleQueue())
+        try:
+            conn, reused = idle.get_nowait(), True
+        except queue.Empty:
+            conn, reused = self._connect(scheme, netloc), False
+        try:
+            conn.request('GET', target, headers={'User-Agent': self.user_agent, 'Accept': self.accept})
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; retry on a fresh one
+            return self._request(scheme, netloc, target)
+        headers = {key.lower(): value for key, value in response.getheaders()}
+        if response.will_close:
+            conn.close()
+        else:
+            idle.put(conn)
+        return response.status, headers, body
+
+    def get(self, url: str) -> Tuple[str, Dict[str, str], bytes]:
+        """
+        GET a URL, following redirects.
+        Returns:
+            Tuple of (final URL, lower-cased response headers, body)
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+            status, headers, body = self._request(parts.scheme, parts.netloc, target)
+            if status in (301, 302, 303, 307, 308) and headers.get('location'):
+                url = urljoin(url, headers['location'])
+                continue
+            if status != 200:
+                raise IOError(f"HTTP {status} for {url}")
+            return url, headers, body
+        raise IOError(f"Too many redirects for {url}")
+
+    def close(self) -> None:
+        for idle in self._idle.values():
+            while not idle.empty():
+                idle.get_nowait().close()
+        self._idle = {}
+
+
+class AsyncFetcher:
+    """
+    Runs GETs through a ConnectionPool with bounded concurrency per host and overall.
+
+    Use as an async context manager:
+
+        async with AsyncFetcher(per_host=4) as fetcher:
+            final_url, headers, body = await fetcher.fetch(url)
+    """
+
+    def __init__(self, per_host: int = 4, max_concurrency: int = 16, timeout: float = 30, accept: str = '*/*'):
+        """
+        Args:
+            per_host: Maximum concurrent requests per host
+            max_concurrency: Maximum concurrent requests overall
+            timeout: Socket timeout per request, in seconds
+            accept: Accept header sent with every request
+        """
+        self.per_host = per_host
+        self.max_concurrency = max_concurrency
+        self.pool = ConnectionPool(timeout, accept=accept)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._overall: Optional[asyncio.Semaphore] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="fetch")
+        self._overall = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+    async def fetch(self, url: str, process: Optional[Callable[[str, Dict[str, str], bytes], Any]] = None) -> Any:
+        """
+        GET a URL once a slot for its host is free.
+        Args:
+            url: Absolute http(s) URL
+            process: Called with (final URL, headers, body) on the worker thread, e.g. to
+                parse or store the response without blocking the event loop (optional)
+        Returns:
+            The result of process, or (final URL, headers, body) without one
+        """
+        def run():
+            response = self.pool.get(url)
+            heartbeat()
+            return process(*response) if process else response
+
+        host_limit = self._host_limits.setdefault(urlsplit(url).netloc, asyncio.Semaphore(self.per_host))
+        # Host slot first, so requests queued for a busy host do not hold overall slots
+        async with host_limit, self._overall:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, run)
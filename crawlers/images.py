@@ -0,0 +1,156 @@
+"""
+Concurrent image download stage (run_scraper --download-images).
+
+Downloads the image_url of every extracted item into a content-addressed
+directory and records the local path and SHA-256 in the item:
+
+    <images_dir>/<sha256[:2]>/<sha256>.<ext>
+
+Identical URLs are fetched once per run, and images with identical content are
+stored once, whatever URL they came from. Downloads go through the pooled client
+in crawlers.fetch, so slow image hosts do not serialize the stage.
+"""
+import asyncio
+import hashlib
+import mimetypes
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from crawlers.fetch import AsyncFetcher
+from utils.files import atomic_write_bytes
+from utils.logger import logger
+
+
+def image_source(value: Any, base_url: Optional[str] = None) -> Optional[str]:
+    """
+    Return the absolute URL to download from an extracted image_url value.
+    Handles lists (first entry), srcset strings (first candidate), and
+    protocol-relative or relative URLs (resolved against base_url).
+    """
+    if isinstance(value, list):
+        value = next((v for v in value if v), None)
+    if not value or not isinstance(value, str):
+        return None
+    url = value.split(',')[0].strip().split(' ')[0]
+    if url.startswith('data:'):
+        return None
+    if url.startswith('//'):
+        url = 'https:' + url
+    elif base_url:
+        url = urljoin(base_url, url)
+    return url if urlsplit(url).scheme in ('http', 'https') else None
+
+
+class ImageStore:
+    """Content-addressed image directory."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path_for(self, digest: str, extension: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{extension}"
+
+    def save(self, data: bytes, extension: str) -> Tuple[str, Path, bool]:
+        """
+        Store image data under its SHA-256.
+        Returns:
+            Tuple of (sha256, path, whether the content was already stored)
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest, extension)
+        with self._lock:
+            if path.exists():
+                return digest, path, True
+            atomic_write_bytes(path, data)
+        return digest, path, False
+
+
+class ImageDownloader:
+    """
+    Downloads item images concurrently into an ImageStore.
+
+    Each item with an image_url gets image_path (relative to the image directory)
+    and image_sha256, or None for both if the download failed.
+    """
+
+    def __init__(self, images_dir: str, per_host: int = 4, max_concurrency: int = 16,
+                 timeout: float = 30, base_url: Optional[str] = None):
+        """
+        Args:
+            images_dir: Root of the content-addressed image directory
+            per_host: Maximum concurrent requests per host
+            max_concurrency: Maximum concurrent requests overall
+            timeout: Socket timeout per request, in seconds
+            base_url: Base for resolving relative image URLs (e.g. the store's base_url)
+        """
+        self.store = ImageStore(images_dir)
+        self.base_url = base_url
+        self.fetcher = AsyncFetcher(per_host, max_concurrency, timeout, accept='image/*,*/*;q=0.8')
+        self.counts = {"urls": 0, "downloaded": 0, "duplicate_urls": 0, "duplicate_content": 0,
+                       "failed": 0, "bytes": 0}
+
+    def _store(self, final_url: str, headers: Dict[str, str], body: bytes) -> Tuple[str, str, bool, int]:
+        """Store one downloaded image (runs on a worker thread)."""
+        content_type = headers.get('content-type', '').split(';')[0].strip()
+        extension = (mimetypes.guess_extension(content_type) if content_type else None) \
+            or Path(urlsplit(final_url).path).suffix.lower() or '.bin'
+        digest, path, existed = self.store.save(body, extension)
+        return digest, str(path.relative_to(self.store.root)), existed, len(body)
+
+    async def _download(self, url: str) -> Optional[Tuple[str, str]]:
+        try:
+            digest, path, existed, size = await self.fetcher.fetch(url, self._store)
+        except Exception as e:
+            logger.warning(f"Failed to download image {url}: {e}")
+            self.counts["failed"] += 1
+            return None
+        self.counts["downloaded"] += 1
+        self.counts["bytes"] += size
+        if existed:
+            self.counts["duplicate_content"] += 1
+        return digest, path
+
+    async def download_items(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Download the images of items and record their local path and hash in place.
+        Returns:
+            Summary counts for the stage
+        """
+        started = time.perf_counter()
+        urls: Dict[int, str] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async with self.fetcher:
+            for idx, item in enumerate(items):
+                url = image_source(item.get("image_url"), self.base_url)
+                if not url:
+                    continue
+                urls[idx] = url
+                if url in tasks:
+                    self.counts["duplicate_urls"] += 1
+                    continue
+                tasks[url] = asyncio.create_task(self._download(url))
+            self.counts["urls"] = len(tasks)
+            results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+
+        for idx, url in urls.items():
+            digest, path = results[url] or (None, None)
+            items[idx]["image_path"] = path
+            items[idx]["image_sha256"] = digest
+
+        summary = {**self.counts, "seconds": round(time.perf_counter() - started, 3)}
+        logger.info(f"Image download: {summary}")
+        return summary
+
+
+def download_images(items: List[Dict[str, Any]], images_dir: str, **kwargs) -> Dict[str, Any]:
+    """
+    Download item images into images_dir (see ImageDownloader for the options).
+    Returns:
+        Summary counts for the stage
+    """
+    return asyncio.run(ImageDownloader(images_dir, **kwargs).download_items(items))
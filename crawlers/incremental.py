@@ -0,0 +1,154 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional, Set
+
+from utils.files import atomic_write_json, read_json
+from utils.logger import logger
+
+# Fields that make up an item's identity when hashing extracted values
+HASHED_FIELDS = (
+    "store_product_id",
+    "brand",
+    "name",
+    "product_url",
+    "image_url",
+    "price_current",
+    "price_original",
+    "price_min",
+    "price_max",
+    "product_metadata",
+)
+
+
+class TileIndex:
+    """
+    Persisted index of product tile hashes used for incremental crawling.
+
+    Each run compares tile hashes against the index written by the previous run:
+    with hash_source="html" an unchanged tile is recognised from its HTML alone and
+    skips extraction entirely; with hash_source="fields" the tile is extracted but an
+    unchanged field tuple skips downstream processing.
+    """
+
+    def __init__(self, store_name: str, state_dir: str = "crawler_state", hash_source: str = "html"):
+        if hash_source not in ("html", "fields"):
+            raise ValueError(f"Unsupported hash_source: {hash_source}")
+        self.store_name = store_name
+        self.hash_source = hash_source
+        self.path = Path(state_dir) / f"{store_name}_tile_index.json"
+
+        # product_id -> hash from the previous run, and the reverse lookup
+        self.previous: Dict[str, str] = {}
+        self.previous_by_hash: Dict[str, str] = {}
+        # product_id -> hash seen in this run
+        self.current: Dict[str, str] = {}
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0}
+
+    def load(self) -> None:
+        """Load the index written by the previous run, if any."""
+        data = read_json(self.path, default=None)
+        if not data:
+            logger.info(f"No previous tile index at {self.path}, all items will be treated as new")
+            return
+        if data.get("hash_source") != self.hash_source:
+            logger.warning(
+                f"Tile index at {self.path} uses hash_source '{data.get('hash_source')}', "
+                f"expected '{self.hash_source}'; ignoring previous hashes"
+            )
+            self.previous = {product_id: "" for product_id in data.get("products", {})}
+            return
+        self.previous = data.get("products", {})
+        self.previous_by_hash = {tile_hash: product_id for product_id, tile_hash in self.previous.items()}
+        logger.info(f"Loaded tile index with {len(self.previous)} products from {self.path}")
+
+    def save(self, carry_over_missing: bool = False) -> None:
+        """
+        Persist the hashes seen in this run.
+        Args:
+            carry_over_missing: Keep previous entries that were not seen in this run,
+                e.g. when some URLs failed and their products were never reached
+        """
+        products = dict(self.previous) if carry_over_missing else {}
+        products.update(self.current)
+        atomic_write_json(self.path, {
+            "store": self.store_name,
+            "hash_source": self.hash_source,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "products": products,
+        })
+        logger.info(f"Saved tile index with {len(products)} products to {self.path}")
+
+    @staticmethod
+    def _digest(data: str) -> str:
+        return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+    def hash_tile(self, soup_item: Any) -> str:
+        """Hash a product tile's HTML."""
+        return self._digest(str(soup_item))
+
+    def hash_fields(self, product_info: Dict[str, Any]) -> str:
+        """Hash the extracted field tuple of a product."""
+        values = [product_info.get(field) for field in HASHED_FIELDS]
+        return self._digest(json.dumps(values, sort_keys=True, ensure_ascii=False, default=str))
+
+    def skip_tile(self, soup_item: Any, seen_product_ids: Optional[Set[str]] = None) -> bool:
+        """
+        Check whether a tile is unchanged since the previous run (html mode only).
+        Unchanged tiles are recorded as seen so they are not reported as disappeared.
+        Args:
+            soup_item: BeautifulSoup object of the product tile
+            seen_product_ids: The pipeline's set of already handled product IDs
+        Returns:
+            True if the tile can be skipped without extraction
+        """
+        if self.hash_source != "html":
+            return False
+
+        tile_hash = self.hash_tile(soup_item)
+        product_id = self.previous_by_hash.get(tile_hash)
+        if product_id is None:
+            return False
+
+        if product_id not in self.current:
+            self.current[product_id] = tile_hash
+            self.counts["unchanged"] += 1
+        if seen_product_ids is not None:
+            seen_product_ids.add(product_id)
+        return True
+
+    def track(self, product_id: str, soup_item: Any, product_info: Dict[str, Any]) -> bool:
+        """
+        Record an extracted product and classify it against the previous run.
+        Args:
+            product_id: The product's store_product_id
+            soup_item: BeautifulSoup object of the product tile
+            product_info: Extracted product information
+        Returns:
+            True if the item is new or changed and should be emitted
+        """
+        if self.hash_source == "html":
+            tile_hash = self.hash_tile(soup_item)
+        else:
+            tile_hash = self.hash_fields(product_info)
+
+        if product_id in self.current:
+            # Already classified earlier in this run
+            return self.current[product_id] != self.previous.get(product_id)
+
+        self.current[product_id] = tile_hash
+        previous_hash = self.previous.get(product_id)
+        if previous_hash is None:
+            self.counts["new"] += 1
+            return True
+        if previous_hash != tile_hash:
+            self.counts["changed"] += 1
+            return True
+        self.counts["unchanged"] += 1
+        return False
+
+    def summary(self) -> Dict[str, int]:
+        """Return counts of new, changed, unchanged and disappeared items."""
+        disappeared = sum(1 for product_id in self.previous if product_id not in self.current)
+        return {**self.counts, "disappeared": disappeared}
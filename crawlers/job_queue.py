@@ -0,0 +1,220 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from utils.logger import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key TEXT UNIQUE,
+    store TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    worker_id TEXT,
+    lease_expires REAL,
+    heartbeat_at REAL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    items INTEGER,
+    output_file TEXT,
+    error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+"""
+
+
+def default_worker_id() -> str:
+    """Worker identifier that is unique across processes and hosts."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """
+    Durable local work queue for scrape jobs, backed by SQLite.
+
+    Workers claim a job with a time-limited lease and extend it with heartbeats
+    while the job runs. A job whose lease expires (crashed or hung worker) is put
+    back in the queue on the next claim, up to max_attempts attempts. Several
+    processes, or several hosts sharing the queue file on a filesystem with
+    working locks, can drain the same queue.
+    """
+
+    def __init__(self, path: str = "crawler_state/jobs.db"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; multi-statement updates use explicit BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def enqueue(self, spec: Dict[str, Any], max_attempts: int = 3) -> Optional[int]:
+        """
+        Add a job to the queue.
+        Args:
+            spec: Job specification (store, urls, items_limit, output settings)
+            max_attempts: Attempts before the job is marked failed
+        Returns:
+            The job ID, or None if a job with the same job_key is already queued
+        """
+        if not spec.get("store") or not spec.get("urls"):
+            raise ValueError(f"Job needs 'store' and 'urls': {spec}")
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (job_key, store, spec, max_attempts, enqueued_at) VALUES (?, ?, ?, ?, ?)",
+            (spec.get("job_key"), spec["store"], json.dumps(spec), spec.get("max_attempts", max_attempts), time.time()),
+        )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def enqueue_file(self, path: str) -> int:
+        """
+        Enqueue every job in a JSONL job file.
+        Args:
+            path: File with one JSON job specification per line
+        Returns:
+            Number of jobs added
+        """
+        added = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                try:
+                    if self.enqueue(json.loads(line)) is not None:
+                        added += 1
+                except (ValueError, json.JSONDecodeError) as e:
+                    logger.error(f"Skipping invalid job on line {line_no} of {path}: {e}")
+        logger.info(f"Enqueued {added} jobs from {path}")
+        return added
+
+    def _requeue_expired(self, now: float) -> None:
+        """Return jobs with expired leases to the queue, or fail them if out of attempts."""
+        expired = self.conn.execute(
+            "SELECT id, worker_id, attempts, max_attempts FROM jobs WHERE status = 'running' AND lease_expires < ?",
+            (now,),
+        ).fetchall()
+        for job in expired:
+            status = 'queued' if job["attempts"] < job["max_attempts"] else 'failed'
+            logger.warning(f"Lease of job {job['id']} held by {job['worker_id']} expired, marking {status}")
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = CASE WHEN ? = 'failed' THEN ? ELSE NULL END, "
+                "worker_id = NULL, lease_expires = NULL, error = ? WHERE id = ?",
+                (status, status, now, f"lease expired (worker {job['worker_id']})", job["id"]),
+            )
+
+    def claim(self, worker_id: str, lease_seconds: float = 300,
+              exclude_stores: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Claim the oldest queued job.
+        Args:
+            worker_id: Identifier of the claiming worker
+            lease_seconds: Lease duration; must be renewed with heartbeat()
+            exclude_stores: Stores to skip, e.g. because their host is saturated
+        Returns:
+            The job (id, attempts and spec), or None if no job is available
+        """
+        now = time.time()
+        exclude_stores = list(exclude_stores or [])
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._requeue_expired(now)
+            query = "SELECT id, attempts, spec FROM jobs WHERE status = 'queued'"
+            if exclude_stores:
+                query += f" AND store NOT IN ({', '.join('?' for _ in exclude_stores)})"
+            row = self.conn.execute(query + " ORDER BY id LIMIT 1", exclude_stores).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, attempts = attempts + 1, "
+                "lease_expires = ?, heartbeat_at = ?, started_at = ?, error = NULL WHERE id = ?",
+                (worker_id, now + lease_seconds, now, now, row["id"]),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Worker {worker_id} claimed job {row['id']}")
+        return {"id": row["id"], "attempts": row["attempts"] + 1, "spec": json.loads(row["spec"])}
+
+    def queued_stores(self) -> List[str]:
+        """Return the distinct stores that have queued jobs."""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT store FROM jobs WHERE status = 'queued'")]
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float = 300) -> bool:
+        """
+        Extend a job's lease.
+        Returns:
+            False if the worker no longer holds the lease
+        """
+        now = time.time()
+        cursor = self.conn.execute(
+            "UPDATE jobs SET lease_expires = ?, heartbeat_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = 'running'",
+            (now + lease_seconds, now, job_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, items: int, output_file: Optional[str] = None) -> None:
+        """Mark a job as done."""
+        self.conn.execute(
+            "UPDATE jobs SET status = 'done', finished_at = ?, items = ?, output_file = ?, lease_expires = NULL "
+            "WHERE id = ? AND worker_id = ?",
+            (time.time(), items, output_file, job_id, worker_id),
+        )
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> None:
+        """Record a failed attempt, re-queueing the job if it has attempts left."""
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+            "finished_at = ?, error = ?, worker_id = NULL, lease_expires = NULL WHERE id = ? AND worker_id = ?",
+            (time.time(), error, job_id, worker_id),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job counts by status and overall throughput of finished jobs."""
+        counts = {row[0]: row[1] for row in self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")}
+        row = self.conn.execute(
+            "SELECT COALESCE(SUM(items), 0), MIN(started_at), MAX(finished_at) FROM jobs WHERE status = 'done'"
+        ).fetchone()
+        total_items, first_start, last_finish = row
+        elapsed = (last_finish - first_start) if first_start and last_finish else 0
+        return {
+            "counts": counts,
+            "items": total_items,
+            "items_per_minute": round(total_items / elapsed * 60, 1) if elapsed > 0 else None,
+        }
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """Return per-job status, attempts and throughput."""
+        now = time.time()
+        result = []
+        for row in self.conn.execute("SELECT * FROM jobs ORDER BY id"):
+            duration = None
+            if row["started_at"]:
+                end = row["finished_at"] if row["status"] in ("done", "failed") else now
+                duration = end - row["started_at"]
+            result.append({
+                "id": row["id"],
+                "store": row["store"],
+                "status": row["status"],
+                "attempts": row["attempts"],
+                "worker_id": row["worker_id"],
+                "items": row["items"],
+                "duration_seconds": round(duration, 1) if duration is not None else None,
+                "items_per_minute": round(row["items"] / duration * 60, 1) if row["items"] and duration else None,
+                "error": row["error"],
+            })
+        return result
+
+    def close(self) -> None:
+        self.conn.close()
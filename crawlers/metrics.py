@@ -0,0 +1,153 @@
+import functools
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from utils.files import atomic_write_text
+from utils.logger import logger
+
+# Phases timed by BaseScraper and the pipelines
+PHASES = (
+    "driver_startup",    # Launching the browser (setup_driver)
+    "page_load",         # driver.get
+    "rate_limit_wait",   # Waiting for the host's rate limiter
+    "popups",            # handle_popups, excluding its sleeps
+    "scroll",            # Scrolling (human_like_scroll, scroll_page), excluding sleeps
+    "pagination",        # Finding and clicking next page / load more buttons, excluding sleeps
+    "sleep",             # Fixed and random pauses
+    "page_source",       # Reading the DOM from the browser
+    "parse",             # Parsing page_source with BeautifulSoup
+    "extract",           # extract_product_info, ID normalization and dedup
+    "prune",             # Emptying extracted tiles in the page (dom_pruning)
+    "page_cache",        # Reading and storing listing snapshots (crawlers.page_cache)
+    "driver_shutdown",   # Quitting the browser
+    "enrich",            # Fetching product detail pages after the crawl (crawlers.enrichment)
+    "images",            # Downloading item images after the crawl (crawlers.images)
+)
+
+
+def timed(phase: str):
+    """Decorator that times a scraper method as the given phase (uses self.metrics)."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.phase(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RunMetrics:
+    """
+    Per-phase timers and counters for a crawl run.
+
+    Phases nest: time spent in an inner phase (e.g. a sleep inside scrolling) is
+    attributed to the inner phase only, so phase totals add up to at most the
+    run's wall time and the remainder is reported as "other".
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        # Time spent in nested phases, one entry per open phase
+        self._stack: List[float] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block as the given phase."""
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            stats = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+            stats["seconds"] += elapsed - nested
+            stats["calls"] += 1
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: "RunMetrics") -> None:
+        """
+        Add another run's phase totals and counters to this one, e.g. those of
+        concurrent tab sessions. Phase totals of concurrent sessions can exceed the wall time.
+        """
+        for name, stats in other.phases.items():
+            totals = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+            totals["seconds"] += stats["seconds"]
+            totals["calls"] += stats["calls"]
+        for name, value in other.counters.items():
+            self.count(name, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the totals, e.g. for the metadata block of the results file."""
+        wall = time.perf_counter() - self.started
+        # Always report the standard phases, so every run exports the same series
+        names = list(PHASES) + [name for name in self.phases if name not in PHASES]
+        phases = {}
+        for name in names:
+            stats = self.phases.get(name, {"seconds": 0.0, "calls": 0})
+            phases[name] = {"seconds": round(stats["seconds"], 3), "calls": stats["calls"]}
+        return {
+            "wall_seconds": round(wall, 3),
+            "phases": phases,
+            "other_seconds": round(max(0.0, wall - sum(s["seconds"] for s in self.phases.values())), 3),
+            "counters": dict(self.counters),
+            # WebDriver round-trips per listing page, the cost of a remote browser's latency
+            "driver_calls_per_page": (round(self.counters["driver_calls"] / self.counters["pages"], 1)
+                                      if self.counters.get("driver_calls") and self.counters.get("pages") else None),
+        }
+
+    def to_prometheus(self, labels: Optional[Dict[str, str]] = None) -> str:
+        """Render the totals in the Prometheus text exposition format."""
+        data = self.to_dict()
+        base = dict(labels or {})
+
+        def sample(name: str, value: float, **extra: str) -> str:
+            merged = {**base, **extra}
+            label_text = ",".join(f'{key}="{str(val)}"' for key, val in merged.items())
+            return f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}"
+
+        lines = [
+            "# HELP crawler_run_duration_seconds Wall time of the last crawl run.",
+            "# TYPE crawler_run_duration_seconds gauge",
+            sample("crawler_run_duration_seconds", data["wall_seconds"]),
+            "# HELP crawler_run_timestamp_seconds Unix time the last crawl run finished.",
+            "# TYPE crawler_run_timestamp_seconds gauge",
+            sample("crawler_run_timestamp_seconds", round(datetime.now(timezone.utc).timestamp())),
+            "# HELP crawler_phase_seconds Time spent per crawl phase in the last run, excluding nested phases.",
+            "# TYPE crawler_phase_seconds gauge",
+        ]
+        for name, stats in data["phases"].items():
+            lines.append(sample("crawler_phase_seconds", stats["seconds"], phase=name))
+        lines.append(sample("crawler_phase_seconds", data["other_seconds"], phase="other"))
+        lines += [
+            "# HELP crawler_phase_calls Number of times each crawl phase ran in the last run.",
+            "# TYPE crawler_phase_calls gauge",
+        ]
+        for name, stats in data["phases"].items():
+            lines.append(sample("crawler_phase_calls", stats["calls"], phase=name))
+        lines += [
+            "# HELP crawler_run_count Pages, tiles, items and other counts of the last run.",
+            "# TYPE crawler_run_count gauge",
+        ]
+        for name, value in sorted(data["counters"].items()):
+            lines.append(sample("crawler_run_count", value, counter=name))
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, labels: Optional[Dict[str, str]] = None) -> None:
+        """
+        Write the totals to a Prometheus textfile (for node exporter's textfile collector).
+        Args:
+            path: Destination .prom file, written atomically
+            labels: Labels added to every sample, e.g. {"store": "macys"}
+        """
+        atomic_write_text(path, self.to_prometheus(labels))
+        logger.info(f"Metrics written to {path}")
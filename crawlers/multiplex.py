@@ -0,0 +1,403 @@
+"""
+Tab multiplexing: several crawl sessions in one browser process (run_scraper --tabs N).
+
+Instead of launching a browser per URL, SharedBrowser launches one and gives each
+crawl session its own window in it (its own browser context with the playwright
+backend). Every session runs its store pipeline unchanged on a thread of its own;
+with Selenium, WebDriver commands from the sessions are serialized on the single
+WebDriver session and switch to the issuing session's window first. Pauses,
+waits and page loads happen outside that lock (pages are loaded with
+pageLoadStrategy "none" and polled), so one session's load or scroll wait
+overlaps with extraction in the others.
+
+Selenium windows share the browser profile (cookies, storage); playwright
+contexts are fully isolated.
+
+While it runs, SharedBrowser samples the memory of the browser processes, so
+the run report can compare memory per concurrent crawl with the cost of a
+browser per URL.
+"""
+import copy
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from selenium.common.exceptions import NoSuchWindowException, TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.logger import logger
+
+# Keep windows that are not in front rendering and running timers at full speed,
+# so lazy loading and infinite scroll work in every session
+MULTIPLEX_ARGUMENTS = [
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+]
+
+# Seconds between document.readyState checks while a page loads
+LOAD_POLL_INTERVAL = 0.1
+
+# Set on the old document before navigating, so a load is only complete once a new document replaced it
+LOAD_MARKER_SCRIPT = "window.__scraperNavigating = true;"
+LOAD_STATE_SCRIPT = "return window.__scraperNavigating ? 'navigating' : document.readyState;"
+
+
+def _w3c_locator(by: str, value: str) -> tuple:
+    """Translate a locator to the strategies W3C WebDriver supports (as Selenium does)."""
+    if by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{value}"]'
+    if by == By.TAG_NAME:
+        return By.CSS_SELECTOR, value
+    if by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f".{value}"
+    if by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{value}"]'
+    return by, value
+
+
+def _pss(pid: int) -> int:
+    """Proportional set size of a process in bytes (RSS where PSS is unavailable), 0 if it exited."""
+    try:
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def process_tree_memory(root_pid: Optional[int] = None) -> Optional[int]:
+    """
+    Return the memory of all descendants of a process (default: this one) in bytes.
+    Browsers, drivers and their renderers are child processes of the crawler, so this
+    is the memory of every local browser it started. PSS is used so memory shared
+    between a browser's processes is counted once. Returns None where /proc is unavailable.
+    """
+    proc = Path("/proc")
+    if not (proc / "self").exists():
+        return None
+    children: Dict[int, List[int]] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses; the fields after it do not
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    total = 0
+    pending = list(children.get(root_pid or os.getpid(), []))
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        total += _pss(pid)
+    return total
+
+
+class MemorySampler:
+    """Samples the memory of the crawler's browser processes on a background thread."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.peak: Optional[int] = None
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> Optional[int]:
+        """Take one sample and return it."""
+        memory = process_tree_memory()
+        if memory is not None:
+            self.samples += 1
+            self.peak = max(self.peak or 0, memory)
+        return memory
+
+    def _run(self) -> None:
+        # Event.wait rather than time.sleep, which a replay's VirtualClock replaces
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+
+class Synchronized:
+    """Proxy that serializes method calls to an object shared by tab threads (dedup and tile indexes)."""
+
+    def __init__(self, target: Any, lock: Optional[threading.Lock] = None):
+        self._target = target
+        self._lock = lock or threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+        return call
+
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            return key in self._target
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._target)
+
+    def __bool__(self) -> bool:
+        return True
+
+
+class SharedBrowser:
+    """
+    One browser process shared by up to `tabs` concurrent crawl sessions.
+
+    Use open_tab as the scrapers' driver_factory; each session's driver.quit()
+    only closes that session's windows. The browser itself is closed by close().
+    """
+
+    def __init__(self, tabs: int, sample_interval: float = 0.5):
+        """
+        Args:
+            tabs: Maximum concurrent crawl sessions in the browser
+            sample_interval: Seconds between browser memory samples
+        """
+        self.tabs = tabs
+        self.driver = None
+        self.backend = "selenium"
+        self.page_load_timeout = 60.0
+        self.memory = MemorySampler(sample_interval)
+        self.base_memory: Optional[int] = None
+        self.concurrency = tabs
+        self.opened = 0
+        # Serializes commands on the single WebDriver session, and the window switches they need
+        self.lock = threading.RLock()
+        self.current_handle: Optional[str] = None
+        self.anchor_handle: Optional[str] = None
+        self.owners: Dict[str, "TabDriver"] = {}
+
+    @staticmethod
+    def launch_config(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a store config for launching the shared browser."""
+        config = copy.deepcopy(config)
+        browser_config = config.setdefault("browser_config", {})
+        browser_config["page_load_strategy"] = "none"
+        browser_config["arguments"] = MULTIPLEX_ARGUMENTS + list(browser_config.get("arguments", []))
+        return config
+
+    def start(self, launcher, concurrency: Optional[int] = None) -> None:
+        """
+        Launch the browser.
+        Args:
+            launcher: A scraper configured with launch_config(), used to launch the browser
+            concurrency: Number of sessions that will actually run at once (default: tabs)
+        """
+        self.backend = launcher.config.get("browser_backend", "selenium")
+        self.page_load_timeout = launcher.config.get("browser_config", {}).get("page_load_timeout", 60)
+        self.concurrency = max(1, min(self.tabs, concurrency or self.tabs))
+        self.driver = launcher.launch_browser()
+        if self.backend == "selenium":
+            # The first window stays open and idle, so closing the last session's window
+            # does not end the WebDriver session
+            self.anchor_handle = self.current_handle = self.driver.current_window_handle
+        self.base_memory = self.memory.sample()
+        self.memory.start()
+        logger.info(f"Started shared {self.backend} browser for {self.concurrency} concurrent sessions")
+
+    def open_tab(self, scraper) -> Any:
+        """Open a session for a scraper (usable as its driver_factory) and return its driver."""
+        self.opened += 1
+        if self.backend == "playwright":
+            # Every launch is a new context in the one Playwright browser process
+            return scraper.launch_browser()
+        with self.lock:
+            handle = self.driver.execute(Command.NEW_WINDOW, {"type": "window"})["value"]["handle"]
+            tab = TabDriver(self, handle)
+            self.owners[handle] = tab
+        return tab
+
+    def execute(self, tab: "TabDriver", command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a WebDriver command in the tab's current window."""
+        with self.lock:
+            if self.current_handle != tab.handle:
+                self.driver.switch_to.window(tab.handle)
+                self.current_handle = tab.handle
+            return self.driver.execute(command, params)
+
+    def tab_handles(self, tab: "TabDriver") -> List[str]:
+        """Return the tab's windows, adopting windows it opened itself (e.g. with window.open)."""
+        with self.lock:
+            handles = self.driver.window_handles
+            for handle in handles:
+                if handle != self.anchor_handle and handle not in self.owners:
+                    self.owners[handle] = tab
+            return [handle for handle in handles if self.owners.get(handle) is tab]
+
+    def close_tab(self, tab: "TabDriver") -> None:
+        """Close all windows of a tab."""
+        with self.lock:
+            for handle in [h for h, owner in self.owners.items() if owner is tab]:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except (NoSuchWindowException, WebDriverException) as e:
+                    logger.debug(f"Window {handle} already closed: {e}")
+                del self.owners[handle]
+            self.driver.switch_to.window(self.anchor_handle)
+            self.current_handle = self.anchor_handle
+
+    def close(self) -> None:
+        """Stop sampling memory and close the browser."""
+        self.memory.stop()
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f"Error closing shared browser: {e}")
+            self.driver = None
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the memory report of the run.
+        The browser-per-URL estimate charges every session the memory of an idle
+        browser plus its share of the memory the sessions added.
+        """
+        summary = {
+            "backend": self.backend,
+            "tabs": self.tabs,
+            "concurrent_sessions": self.concurrency,
+            "sessions": self.opened,
+            "browser_memory_base_mb": None,
+            "browser_memory_peak_mb": None,
+            "memory_per_crawl_mb": None,
+            "estimated_browser_per_url_mb": None,
+            "estimated_memory_saving": None,
+        }
+        if self.base_memory is None or self.memory.peak is None:
+            return summary
+        mb = 1024 * 1024
+        per_crawl = self.memory.peak / self.concurrency
+        per_url = self.base_memory + (self.memory.peak - self.base_memory) / self.concurrency
+        summary.update({
+            "browser_memory_base_mb": round(self.base_memory / mb, 1),
+            "browser_memory_peak_mb": round(self.memory.peak / mb, 1),
+            "memory_per_crawl_mb": round(per_crawl / mb, 1),
+            "estimated_browser_per_url_mb": round(per_url / mb, 1),
+            "estimated_memory_saving": round(1 - per_crawl / per_url, 3) if per_url else None,
+        })
+        return summary
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _TabSwitchTo:
+    def __init__(self, tab: "TabDriver"):
+        self._tab = tab
+
+    def window(self, handle: str) -> None:
+        if handle not in self._tab.window_handles:
+            raise NoSuchWindowException(f"Window {handle} does not belong to this session")
+        self._tab.handle = handle
+
+
+class TabDriver:
+    """
+    Selenium-compatible driver for one session's window in a SharedBrowser.
+
+    Elements it returns are regular WebElements that send their commands through
+    the tab, so WebDriverWait and expected_conditions work unchanged.
+    """
+
+    def __init__(self, shared: SharedBrowser, handle: str):
+        self.shared = shared
+        self.handle = handle
+        self.switch_to = _TabSwitchTo(self)
+
+    def execute(self, command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        response = self.shared.execute(self, command, params)
+        value = response.get("value")
+        elements = value if isinstance(value, list) else [value]
+        for element in elements:
+            if isinstance(element, WebElement):
+                element._parent = self
+        return response
+
+    def get(self, url: str) -> None:
+        """Navigate and wait for the page to load, without holding the browser while it loads."""
+        self.execute_script(LOAD_MARKER_SCRIPT)
+        self.execute(Command.GET, {"url": url})
+        deadline = time.monotonic() + self.shared.page_load_timeout
+        while True:
+            try:
+                if self.execute_script(LOAD_STATE_SCRIPT) == "complete":
+                    return
+            except WebDriverException as e:
+                # The document can be swapped out while the script runs
+                logger.debug(f"Load state check failed while loading {url}: {e}")
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"Timed out after {self.shared.page_load_timeout}s loading {url}")
+            time.sleep(LOAD_POLL_INTERVAL)
+
+    @property
+    def title(self) -> str:
+        return self.execute(Command.GET_TITLE)["value"]
+
+    @property
+    def current_url(self) -> str:
+        return self.execute(Command.GET_CURRENT_URL)["value"]
+
+    @property
+    def page_source(self) -> str:
+        return self.execute(Command.GET_PAGE_SOURCE)["value"]
+
+    @property
+    def current_window_handle(self) -> str:
+        return self.handle
+
+    @property
+    def window_handles(self) -> List[str]:
+        return self.shared.tab_handles(self)
+
+    def execute_script(self, script: str, *args) -> Any:
+        return self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": list(args)})["value"]
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> WebElement:
+        by, value = _w3c_locator(by, value)
+        return self.execute(Command.FIND_ELEMENT, {"using": by, "value": value})["value"]
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[WebElement]:
+        by, value = _w3c_locator(by, value)
+        return self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})["value"] or []
+
+    def set_window_size(self, width: int, height: int) -> None:
+        self.execute(Command.SET_WINDOW_RECT, {"width": int(width), "height": int(height)})
+
+    def quit(self) -> None:
+        """Close this session's windows; the shared browser keeps running."""
+        self.shared.close_tab(self)
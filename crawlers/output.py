@@ -0,0 +1,59 @@
+"""Result writers shared by the crawl CLIs and offline re-extraction (crawlers.extraction)."""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from utils.logger import logger
+from crawlers.storage import SQLiteResultStore
+
+def save_results(items: List[Dict[str, Any]], store_name: str, output_dir: str = "crawler_output",
+                 extra_metadata: Optional[Dict[str, Any]] = None, filename: Optional[str] = None) -> str:
+    """
+    Save scraping results to a JSON file.
+    Args:
+        items: List of extracted items
+        store_name: Name of the store
+        output_dir: Directory to save results in
+        extra_metadata: Additional fields for the metadata block (optional)
+        filename: Overwrite this file, e.g. one saved before enrichment, instead of creating a new one (optional)
+    Returns:
+        Path to the saved file
+    """
+    # Create output directory if it doesn't exist
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    
+    # Generate filename with timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = Path(filename) if filename else output_path / f"{store_name}_{timestamp}.json"
+    
+    # Save results
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump({
+            "metadata": {
+                "store": store_name,
+                "timestamp": timestamp,
+                "total_items": len(items),
+                **(extra_metadata or {})
+            },
+            "items": items
+        }, f, indent=2, ensure_ascii=False, default=str)
+        
+    logger.info(f"Results saved to {filename}")
+    return str(filename)
+
+def save_results_sqlite(items: List[Dict[str, Any]], store_name: str, db_path: str,
+                        fields: Optional[List[str]] = None) -> int:
+    """
+    Upsert scraping results into the local SQLite result store.
+    Args:
+        items: List of extracted items
+        store_name: Name of the store
+        db_path: Path to the SQLite database file
+        fields: Fields the items were projected to; other stored columns are kept (optional)
+    Returns:
+        Number of rows written
+    """
+    with SQLiteResultStore(db_path) as store:
+        return store.upsert_items(items, store_name, fields)
@@ -0,0 +1,198 @@
+"""
+On-disk cache of listing page snapshots (run_scraper --page-cache).
+
+Every pagination step of a live crawl (the page_source that was extracted) is
+stored zlib-compressed, keyed by store, listing URL and step. When the same
+listing is crawled again while its snapshots are fresh (the store's
+page_cache.ttl_minutes), BaseScraper.extract_items extracts from the snapshots
+instead of opening a browser, e.g. when a failed multi-URL run is rerun or
+several jobs ask for the same category within minutes.
+
+A listing is only served if its crawl ran to the end of the listing, or saw at
+least as many products as the new run's items_limit. The cache's total size is
+capped, and the least recently used listings are evicted whole.
+"""
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from utils.logger import logger
+
+DEFAULT_TTL_MINUTES = 30
+DEFAULT_MAX_MB = 500
+
+# Snapshots of crawls that never finished are dropped once they are this old
+ORPHAN_SECONDS = 24 * 3600
+
+
+class PageCache:
+    """
+    SQLite store of compressed listing snapshots with per-listing TTL checks and LRU eviction.
+    Safe to share between threads (e.g. tab sessions) and, through SQLite, between processes.
+    """
+
+    def __init__(self, path: str = "crawler_state/pages.db", max_mb: float = DEFAULT_MAX_MB,
+                 compression_level: int = 6):
+        """
+        Args:
+            path: SQLite file of the cache
+            max_mb: Size cap for the compressed snapshots; least recently used listings are evicted beyond it
+            compression_level: zlib level for the snapshots (1 fastest, 9 smallest)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS listings (
+                store TEXT NOT NULL,
+                url TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                steps INTEGER NOT NULL,
+                products INTEGER NOT NULL,
+                complete INTEGER NOT NULL,
+                bytes INTEGER NOT NULL,
+                PRIMARY KEY (store, url)
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                store TEXT NOT NULL,
+                url TEXT NOT NULL,
+                step INTEGER NOT NULL,
+                html BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (store, url, step)
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+        self.counts = {"hits": 0, "misses": 0, "stale": 0, "pages_served": 0, "pages_stored": 0,
+                       "bytes_stored": 0, "listings_evicted": 0}
+
+    def lookup(self, store: str, url: str, ttl_seconds: float, items_limit: Optional[int] = None) -> int:
+        """
+        Return the number of cached steps to serve a listing from, or 0 if it must be crawled.
+        Args:
+            store: Store name
+            url: Listing URL the crawl starts from
+            ttl_seconds: Maximum age of the listing's snapshots
+            items_limit: items_limit of the new run; a listing cut short by a limit is
+                only served to runs with the same or a lower limit
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT started_at, steps, products, complete FROM listings WHERE store = ? AND url = ?",
+                (store, url)
+            ).fetchone()
+            if row is None:
+                self.counts["misses"] += 1
+                return 0
+            started_at, steps, products, complete = row
+            if started_at < time.time() - ttl_seconds:
+                self.counts["stale"] += 1
+                return 0
+            if not complete and not (items_limit and products >= items_limit):
+                self.counts["misses"] += 1
+                return 0
+            self.conn.execute("UPDATE listings SET accessed_at = ? WHERE store = ? AND url = ?",
+                              (time.time(), store, url))
+            self.conn.commit()
+            self.counts["hits"] += 1
+            return steps
+
+    def page(self, store: str, url: str, step: int) -> str:
+        """Return the snapshot of one pagination step."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT html FROM pages WHERE store = ? AND url = ? AND step = ?", (store, url, step)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"Step {step} of {url} is not in the page cache")
+            self.counts["pages_served"] += 1
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def begin(self, store: str, url: str) -> None:
+        """Drop the cached listing before a live crawl of the URL replaces it."""
+        with self._lock:
+            self.conn.execute("DELETE FROM listings WHERE store = ? AND url = ?", (store, url))
+            self.conn.execute("DELETE FROM pages WHERE store = ? AND url = ?", (store, url))
+            self.conn.commit()
+
+    def add_page(self, store: str, url: str, step: int, html: str) -> None:
+        """Store the snapshot of one pagination step of a live crawl."""
+        data = zlib.compress(html.encode("utf-8"), self.compression_level)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (store, url, step, html, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (store, url, step, data, time.time())
+            )
+            self.conn.commit()
+            self.counts["pages_stored"] += 1
+            self.counts["bytes_stored"] += len(data)
+
+    def finish(self, store: str, url: str, steps: int, products: int, complete: bool) -> None:
+        """
+        Make a finished crawl's snapshots available, then evict down to the size cap.
+        Args:
+            store: Store name
+            url: Listing URL the crawl started from
+            steps: Number of steps stored
+            products: Products seen by the crawl
+            complete: Whether the crawl reached the end of the listing
+        """
+        now = time.time()
+        with self._lock:
+            size, started_at = self.conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(html)), 0), MIN(stored_at) FROM pages WHERE store = ? AND url = ?",
+                (store, url)
+            ).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO listings (store, url, started_at, accessed_at, steps, products, complete, "
+                "bytes) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (store, url, started_at or now, now, steps, products, int(complete), size)
+            )
+            self.conn.commit()
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop old orphaned snapshots and least recently used listings beyond the size cap."""
+        self.conn.execute(
+            "DELETE FROM pages WHERE stored_at < ? AND NOT EXISTS "
+            "(SELECT 1 FROM listings WHERE listings.store = pages.store AND listings.url = pages.url)",
+            (time.time() - ORPHAN_SECONDS,)
+        )
+        total = self.conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM listings").fetchone()[0]
+        if total > self.max_bytes:
+            for store, url, size in self.conn.execute(
+                "SELECT store, url, bytes FROM listings ORDER BY accessed_at"
+            ).fetchall():
+                self.conn.execute("DELETE FROM listings WHERE store = ? AND url = ?", (store, url))
+                self.conn.execute("DELETE FROM pages WHERE store = ? AND url = ?", (store, url))
+                self.counts["listings_evicted"] += 1
+                logger.debug(f"Evicted {url} ({size / 1e6:.1f} MB) from the page cache")
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self.conn.commit()
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the hit counts of this run and the cache's size."""
+        with self._lock:
+            listings, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM listings").fetchone()
+        lookups = self.counts["hits"] + self.counts["misses"] + self.counts["stale"]
+        return {
+            **self.counts,
+            "hit_rate": round(self.counts["hits"] / lookups, 3) if lookups else None,
+            "listings": listings,
+            "size_mb": round(size / (1024 * 1024), 2),
+        }
+
+    def close(self) -> None:
+        self.conn.close()
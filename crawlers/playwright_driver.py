@@ -0,0 +1,293 @@
+"""
+Playwright browser backend ("browser_backend": "playwright" in SCRAPER_CONFIG).
+
+One Chromium process per Python process is driven by async Playwright on a
+background asyncio event loop. Every scraper session gets its own lightweight
+browser context (separate cookies and storage, like Selenium's incognito
+windows) inside that process, so many sessions, e.g. scrapers running in
+threads, share a single browser.
+
+PlaywrightDriver exposes the subset of the Selenium WebDriver API that
+BaseScraper and the store pipelines use (get, page_source, current_url,
+find_element(s), execute_script, element text/attributes/visibility and clicks,
+tabs), so WebDriverWait, expected_conditions, selector configs, popup handlers
+and pagination settings work unchanged.
+
+Needs the playwright package and its Chromium build:
+    pip install playwright && playwright install chromium
+"""
+import asyncio
+import atexit
+import random
+import threading
+from typing import Dict, Any, List, Optional
+
+from selenium.common.exceptions import (
+    ElementNotInteractableException, NoSuchElementException, TimeoutException, WebDriverException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.logger import logger
+
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-infobars',
+    '--disable-notifications',
+    '--disable-popup-blocking',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--no-sandbox',
+    '--no-first-run',
+]
+LOCALES = ['en-US', 'en-GB', 'en-CA']
+HIDE_WEBDRIVER_SCRIPT = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+
+# Runs a Selenium-style script (using arguments[i] and return) through page.evaluate
+SCRIPT_WRAPPER = "(args) => (function () {\n%s\n}).apply(null, args)"
+
+# Timeout for clicks, in milliseconds; Selenium clicks fail immediately instead of waiting
+CLICK_TIMEOUT_MS = 5000
+
+
+def _selector(by: str, value: str) -> str:
+    """Translate a Selenium locator to a Playwright selector."""
+    if by == By.CSS_SELECTOR:
+        return value
+    if by == By.XPATH:
+        return f"xpath={value}"
+    if by == By.ID:
+        return f'[id="{value}"]'
+    if by == By.NAME:
+        return f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return f".{value}"
+    if by == By.TAG_NAME:
+        return value
+    if by == By.LINK_TEXT:
+        return f'a:text-is("{value}")'
+    if by == By.PARTIAL_LINK_TEXT:
+        return f'a:has-text("{value}")'
+    raise WebDriverException(f"Unsupported locator strategy: {by}")
+
+
+class PlaywrightBrowser:
+    """
+    A Chromium process driven by async Playwright on its own event loop thread.
+    Use PlaywrightBrowser.shared() to get the process-wide instance.
+    """
+
+    _shared: Dict[bool, "PlaywrightBrowser"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, headless: bool = True):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="playwright", daemon=True)
+        self._thread.start()
+        self._playwright = None
+        self.browser = None
+        try:
+            self.run(self._start(headless))
+        except BaseException:
+            self.close()
+            raise
+
+    @classmethod
+    def shared(cls, headless: bool = True) -> "PlaywrightBrowser":
+        """Return the browser process shared by all sessions with this headless setting."""
+        with cls._shared_lock:
+            browser = cls._shared.get(headless)
+            if browser is None:
+                browser = cls._shared[headless] = cls(headless)
+            return browser
+
+    @classmethod
+    def close_shared(cls) -> None:
+        """Close all shared browser processes (registered with atexit)."""
+        with cls._shared_lock:
+            for browser in cls._shared.values():
+                browser.close()
+            cls._shared = {}
+
+    def run(self, coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the browser's event loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    async def _start(self, headless: bool) -> None:
+        try:
+            from playwright.async_api import async_playwright
+        except ImportError as e:
+            raise ImportError("The playwright browser backend needs the playwright package: "
+                              "pip install playwright && playwright install chromium") from e
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+        logger.info(f"Started Playwright Chromium {self.browser.version} (headless={headless})")
+
+    async def _new_session(self, window_size: List[int]):
+        context = await self.browser.new_context(
+            viewport={"width": window_size[0], "height": window_size[1]},
+            locale=random.choice(LOCALES),
+        )
+        await context.add_init_script(HIDE_WEBDRIVER_SCRIPT)
+        page = await context.new_page()
+        return context, page
+
+    def new_driver(self, config: Dict[str, Any]) -> "PlaywrightDriver":
+        """Open a new browser context for a scraper session."""
+        browser_config = config.get("browser_config", {})
+        context, page = self.run(self._new_session(browser_config.get("window_size", [1920, 1080])))
+        return PlaywrightDriver(self, context, page, browser_config.get("page_load_timeout", 60))
+
+    def close(self) -> None:
+        try:
+            if self.browser is not None:
+                self.run(self.browser.close(), timeout=30)
+            if self._playwright is not None:
+                self.run(self._playwright.stop(), timeout=30)
+        except Exception as e:
+            logger.warning(f"Error closing Playwright browser: {e}")
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+
+
+atexit.register(PlaywrightBrowser.close_shared)
+
+
+def launch_playwright(config: Dict[str, Any]) -> "PlaywrightDriver":
+    """Return a driver for a new session in the shared Playwright browser."""
+    if config.get("use_scraping_browser"):
+        raise ValueError("The playwright backend does not support use_scraping_browser; use the selenium backend")
+    headless = config.get("browser_config", {}).get("headless", True)
+    return PlaywrightBrowser.shared(headless).new_driver(config)
+
+
+class PlaywrightElement(WebElement):
+    """Selenium-style element backed by a Playwright ElementHandle."""
+
+    def __init__(self, driver: "PlaywrightDriver", handle):
+        self._parent = driver
+        self._id = f"playwright-{id(handle)}"
+        self.handle = handle
+
+    def _run(self, coroutine) -> Any:
+        return self._parent._run(coroutine)
+
+    @property
+    def text(self) -> str:
+        return self._run(self.handle.inner_text())
+
+    @property
+    def tag_name(self) -> str:
+        return self._run(self.handle.evaluate("element => element.tagName.toLowerCase()"))
+
+    def get_attribute(self, name: str):
+        return self._run(self.handle.get_attribute(name))
+
+    get_dom_attribute = get_attribute
+
+    def is_displayed(self) -> bool:
+        return self._run(self.handle.is_visible())
+
+    def is_enabled(self) -> bool:
+        return self._run(self.handle.is_enabled())
+
+    def click(self) -> None:
+        try:
+            self._run(self.handle.click(timeout=CLICK_TIMEOUT_MS))
+        except Exception as e:
+            raise ElementNotInteractableException(f"Click failed: {e}") from e
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List["PlaywrightElement"]:
+        handles = self._run(self.handle.query_selector_all(_selector(by, value)))
+        return [PlaywrightElement(self._parent, handle) for handle in handles]
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> "PlaywrightElement":
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element matches {by}={value}")
+        return elements[0]
+
+
+class _PlaywrightSwitchTo:
+    def __init__(self, driver: "PlaywrightDriver"):
+        self._driver = driver
+
+    def window(self, handle: str) -> None:
+        for page in self._driver.context.pages:
+            if self._driver._handle(page) == handle:
+                self._driver.page = page
+                return
+        raise WebDriverException(f"No window with handle {handle}")
+
+
+class PlaywrightDriver:
+    """
+    Selenium-compatible driver for one Playwright browser context.
+    Calls block the calling thread while they run on the browser's event loop.
+    """
+
+    def __init__(self, browser: PlaywrightBrowser, context, page, page_load_timeout: float = 60):
+        self.browser = browser
+        self.context = context
+        self.page = page
+        self.page_load_timeout = page_load_timeout
+        self.switch_to = _PlaywrightSwitchTo(self)
+
+    def _run(self, coroutine) -> Any:
+        return self.browser.run(coroutine)
+
+    @staticmethod
+    def _handle(page) -> str:
+        return f"page-{id(page)}"
+
+    def get(self, url: str) -> None:
+        try:
+            self._run(self.page.goto(url, wait_until="load", timeout=self.page_load_timeout * 1000))
+        except Exception as e:
+            if type(e).__name__ == "TimeoutError":
+                raise TimeoutException(f"Timed out loading {url}: {e}") from e
+            raise WebDriverException(f"Failed to load {url}: {e}") from e
+
+    @property
+    def current_url(self) -> str:
+        return self.page.url
+
+    @property
+    def title(self) -> str:
+        return self._run(self.page.title())
+
+    @property
+    def page_source(self) -> str:
+        return self._run(self.page.content())
+
+    @property
+    def window_handles(self) -> List[str]:
+        return [self._handle(page) for page in self.context.pages]
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[PlaywrightElement]:
+        handles = self._run(self.page.query_selector_all(_selector(by, value)))
+        return [PlaywrightElement(self, handle) for handle in handles]
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> PlaywrightElement:
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element matches {by}={value}")
+        return elements[0]
+
+    def execute_script(self, script: str, *args) -> Any:
+        values = [arg.handle if isinstance(arg, PlaywrightElement) else arg for arg in args]
+        try:
+            return self._run(self.page.evaluate(SCRIPT_WRAPPER % script, values))
+        except Exception as e:
+            raise WebDriverException(f"Script failed: {e}") from e
+
+    def set_window_size(self, width: int, height: int) -> None:
+        self._run(self.page.set_viewport_size({"width": width, "height": height}))
+
+    def quit(self) -> None:
+        """Close this session's context; the shared browser keeps running for other sessions."""
+        try:
+            self._run(self.context.close())
+        except Exception as e:
+            logger.warning(f"Error closing Playwright context: {e}")
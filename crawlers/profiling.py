@@ -0,0 +1,212 @@
+"""
+Profiling mode for crawl runs (run_scraper --profile).
+
+Collects, for the duration of a run:
+    cpu.pstats        cProfile call statistics (snakeviz, gprof2dot, pstats)
+    cpu.txt           the top functions by cumulative time
+    samples.folded    wall-clock stack samples in folded format, for flamegraph.pl or speedscope
+    memory.txt        the largest allocation sites (tracemalloc)
+    summary.json      time inside WebDriver calls versus local Python, and the files above
+
+Works in replay mode, where the WebDriver time is the fake driver's.
+"""
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, List
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from crawlers.playwright_driver import PlaywrightBrowser
+from crawlers.replay import ReplayDriver, ReplayElement
+from utils.logger import logger
+
+# Entry points of WebDriver calls; every Selenium command goes through WebDriver.execute,
+# and every Playwright backend call through PlaywrightBrowser.run
+DRIVER_METHODS = [
+    (WebDriver, ["execute"]),
+    (PlaywrightBrowser, ["run"]),
+    (ReplayDriver, ["get", "page_source", "current_url", "title", "find_element", "find_elements",
+                    "execute_script"]),
+    (ReplayElement, ["text", "tag_name", "get_attribute", "is_displayed", "is_enabled", "click"]),
+]
+
+
+class DriverCallTimer:
+    """
+    Times calls into the WebDriver by wrapping its entry points.
+    Nested calls (e.g. find_element calling find_elements) are counted once.
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self._depth = 0
+        self._patched = []
+
+    def _wrap(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if self._depth:
+                return func(*args, **kwargs)
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - start
+                self.calls += 1
+                self._depth -= 1
+        return wrapper
+
+    def install(self) -> None:
+        for cls, names in DRIVER_METHODS:
+            for name in names:
+                original = cls.__dict__[name]
+                if isinstance(original, property):
+                    wrapped = property(self._wrap(original.fget), original.fset, original.fdel, original.__doc__)
+                else:
+                    wrapped = self._wrap(original)
+                self._patched.append((cls, name, original))
+                setattr(cls, name, wrapped)
+
+    def uninstall(self) -> None:
+        for cls, name, original in reversed(self._patched):
+            setattr(cls, name, original)
+        self._patched = []
+
+
+class StackSampler:
+    """Samples the stack of a thread at a fixed interval and counts folded stacks."""
+
+    def __init__(self, thread_id: int, interval: float = 0.01):
+        self.thread_id = thread_id
+        self.interval = interval
+        # Stacks are counted as tuples of code objects and named when written, to keep sampling cheap
+        self.stacks: Counter = Counter()
+        self._names: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        # Event.wait rather than time.sleep, which a replay's VirtualClock replaces
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code not in self._names:
+                    self._names[code] = f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}"
+                stack.append(code)
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(stack)] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_folded(self, path: Path) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(self._names[code] for code in reversed(stack))} {count}\n")
+
+
+class Profiler:
+    """
+    Context manager that profiles the enclosed crawl and writes the results to a directory.
+    """
+
+    def __init__(self, output_dir: str, metrics=None, sample_interval: float = 0.01, top: int = 40):
+        """
+        Args:
+            output_dir: Directory for the profile files (created if needed)
+            metrics: RunMetrics of the run, used to separate sleeps from Python time (optional)
+            sample_interval: Seconds between stack samples
+            top: Number of functions and allocation sites to list in the text reports
+        """
+        self.output_dir = Path(output_dir)
+        self.metrics = metrics
+        self.top = top
+        self.cpu = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), sample_interval)
+        self.driver_timer = DriverCallTimer()
+        self.started = 0.0
+        self.wall_seconds = 0.0
+
+    def __enter__(self):
+        self.driver_timer.install()
+        # One frame per allocation is enough for per-line statistics and keeps the overhead down
+        tracemalloc.start(1)
+        self.sampler.start()
+        self.started = time.perf_counter()
+        self.cpu.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cpu.disable()
+        self.wall_seconds = time.perf_counter() - self.started
+        self.sampler.stop()
+        memory = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.driver_timer.uninstall()
+        try:
+            self.write(memory, peak)
+        except Exception as e:
+            logger.error(f"Failed to write profile to {self.output_dir}: {e}")
+
+    def write(self, memory: tracemalloc.Snapshot, peak_memory: int) -> Dict[str, Any]:
+        """Write the profile files and return the summary."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.cpu.dump_stats(str(self.output_dir / "cpu.pstats"))
+        report = io.StringIO()
+        pstats.Stats(self.cpu, stream=report).sort_stats("cumulative").print_stats(self.top)
+        (self.output_dir / "cpu.txt").write_text(report.getvalue(), encoding="utf-8")
+
+        self.sampler.write_folded(self.output_dir / "samples.folded")
+
+        memory = memory.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        top_sites: List[str] = [str(stat) for stat in memory.statistics("lineno")[:self.top]]
+        (self.output_dir / "memory.txt").write_text(
+            f"Peak traced memory: {peak_memory / 1e6:.1f} MB\n\n" + "\n".join(top_sites) + "\n", encoding="utf-8"
+        )
+
+        sleep_seconds = 0.0
+        if self.metrics is not None:
+            sleep_seconds = self.metrics.phases.get("sleep", {}).get("seconds", 0.0)
+        summary = {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "webdriver_seconds": round(self.driver_timer.seconds, 3),
+            "webdriver_calls": self.driver_timer.calls,
+            "sleep_seconds": round(sleep_seconds, 3),
+            "python_seconds": round(max(0.0, self.wall_seconds - self.driver_timer.seconds - sleep_seconds), 3),
+            "peak_memory_bytes": peak_memory,
+            "samples": sum(self.sampler.stacks.values()),
+            "files": {
+                "call_stats": "cpu.pstats",
+                "call_report": "cpu.txt",
+                "flame_graph": "samples.folded",
+                "memory": "memory.txt",
+            },
+        }
+        (self.output_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        logger.info(f"Profile written to {self.output_dir}: {summary['webdriver_seconds']}s in WebDriver calls, "
+                    f"{summary['python_seconds']}s in Python, {summary['sleep_seconds']}s sleeping")
+        return summary
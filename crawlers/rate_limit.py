@@ -0,0 +1,223 @@
+import random
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+from utils.logger import logger
+from crawlers.watchdog import heartbeat
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS host_buckets (
+    host TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    failures INTEGER NOT NULL DEFAULT 0,
+    backoff_until REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS host_slots (
+    holder TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_host_slots_host ON host_slots (host, expires_at);
+"""
+
+DEFAULT_LIMITS = {
+    "requests_per_minute": 30,   # Sustained page loads / pagination actions per host
+    "burst": 5,                  # Token bucket size
+    "max_concurrency": 2,        # Concurrent crawl sessions per host
+    "backoff_base": 30,          # Seconds to back off after the first failure signal
+    "backoff_max": 900,          # Upper bound for exponential backoff
+    "slot_ttl": 600,             # A session slot expires if not renewed for this long
+}
+
+
+def host_of(url: str) -> str:
+    """Return the host part of a URL."""
+    return urlsplit(url).netloc.lower()
+
+
+class HostScheduler:
+    """
+    Per-host rate limiter and concurrency scheduler shared by all workers.
+
+    State lives in a SQLite file, so every worker process on a host (or on hosts
+    sharing the file) sees the same token buckets, session slots and backoff.
+    Each host has a token bucket for page loads, a cap on concurrent crawl
+    sessions and an exponential backoff that is triggered by failure signals such
+    as block pages. Slots expire if a worker dies without releasing them.
+    """
+
+    def __init__(self, path: str = "crawler_state/scheduler.db", poll_interval: float = 1.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def limits_for(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge a store's "rate_limit" config over the defaults."""
+        return {**DEFAULT_LIMITS, **(config.get("rate_limit") or {})}
+
+    def _bucket(self, host: str, limits: Dict[str, Any], now: float) -> sqlite3.Row:
+        row = self.conn.execute(
+            "SELECT tokens, updated_at, failures, backoff_until FROM host_buckets WHERE host = ?", (host,)
+        ).fetchone()
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO host_buckets (host, tokens, updated_at) VALUES (?, ?, ?)", (host, limits["burst"], now)
+            )
+            return (limits["burst"], now, 0, 0)
+        return row
+
+    def acquire_token(self, host: str, limits: Dict[str, Any], holder: Optional[str] = None) -> float:
+        """
+        Block until the host's token bucket allows another request.
+        Args:
+            host: Target host
+            limits: Rate limit settings (see DEFAULT_LIMITS)
+            holder: Session slot to renew while waiting (optional)
+        Returns:
+            Seconds spent waiting
+        """
+        rate = limits["requests_per_minute"] / 60.0
+        started = time.monotonic()
+        while True:
+            now = time.time()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                tokens, updated_at, _, backoff_until = self._bucket(host, limits, now)
+                tokens = min(limits["burst"], tokens + (now - updated_at) * rate)
+                if now < backoff_until:
+                    wait = backoff_until - now
+                elif tokens >= 1:
+                    tokens -= 1
+                    wait = 0
+                else:
+                    wait = (1 - tokens) / rate
+                self.conn.execute(
+                    "UPDATE host_buckets SET tokens = ?, updated_at = ? WHERE host = ?", (tokens, now, host)
+                )
+                if holder:
+                    self.conn.execute(
+                        "UPDATE host_slots SET expires_at = ? WHERE holder = ?", (now + limits["slot_ttl"], holder)
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+            if wait == 0:
+                return time.monotonic() - started
+            logger.debug(f"Rate limit for {host}: waiting {wait:.1f}s")
+            heartbeat()
+            time.sleep(min(wait, 5.0) + random.uniform(0, 0.2))
+
+    def try_acquire_slot(self, host: str, limits: Dict[str, Any], holder: str) -> bool:
+        """Take a session slot for the host if one is free and the host is not backing off."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM host_slots WHERE expires_at < ?", (now,))
+            _, _, _, backoff_until = self._bucket(host, limits, now)
+            active = self.conn.execute("SELECT COUNT(*) FROM host_slots WHERE host = ?", (host,)).fetchone()[0]
+            acquired = now >= backoff_until and active < limits["max_concurrency"]
+            if acquired:
+                self.conn.execute(
+                    "INSERT INTO host_slots (holder, host, expires_at) VALUES (?, ?, ?)",
+                    (holder, host, now + limits["slot_ttl"]),
+                )
+            self.conn.execute("COMMIT")
+            return acquired
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def release_slot(self, holder: str) -> None:
+        self.conn.execute("DELETE FROM host_slots WHERE holder = ?", (holder,))
+
+    def is_available(self, host: str, limits: Dict[str, Any]) -> bool:
+        """Check whether a new session could start on the host right now."""
+        now = time.time()
+        row = self.conn.execute("SELECT backoff_until FROM host_buckets WHERE host = ?", (host,)).fetchone()
+        if row and now < row[0]:
+            return False
+        active = self.conn.execute(
+            "SELECT COUNT(*) FROM host_slots WHERE host = ? AND expires_at >= ?", (host, now)
+        ).fetchone()[0]
+        return active < limits["max_concurrency"]
+
+    def report_failure(self, host: str, limits: Dict[str, Any]) -> float:
+        """
+        Record a failure signal (block page, missing header) and back off the host.
+        Returns:
+            Backoff duration in seconds
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            _, _, failures, _ = self._bucket(host, limits, now)
+            failures += 1
+            backoff = min(limits["backoff_max"], limits["backoff_base"] * 2 ** (failures - 1))
+            backoff *= random.uniform(0.8, 1.2)
+            self.conn.execute(
+                "UPDATE host_buckets SET failures = ?, backoff_until = ?, tokens = 0, updated_at = ? WHERE host = ?",
+                (failures, now + backoff, now, host),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        logger.warning(f"Failure signal #{failures} for {host}, backing off all workers for {backoff:.0f}s")
+        return backoff
+
+    def report_success(self, host: str) -> None:
+        """Reset the host's failure count after a successful crawl."""
+        self.conn.execute("UPDATE host_buckets SET failures = 0 WHERE host = ?", (host,))
+
+    def session(self, host: str, limits: Dict[str, Any]) -> "HostSession":
+        """Create a crawl session for the host; use it as a context manager."""
+        return HostSession(self, host, limits)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class HostSession:
+    """A crawl session holding one of a host's concurrency slots."""
+
+    def __init__(self, scheduler: HostScheduler, host: str, limits: Dict[str, Any]):
+        self.scheduler = scheduler
+        self.host = host
+        self.limits = limits
+        self.holder = f"{host}:{uuid.uuid4().hex}"
+        self.wait_seconds = 0.0
+
+    def __enter__(self):
+        started = time.monotonic()
+        while not self.scheduler.try_acquire_slot(self.host, self.limits, self.holder):
+            heartbeat()
+            time.sleep(self.scheduler.poll_interval + random.uniform(0, 0.5))
+        self.wait_seconds += time.monotonic() - started
+        logger.debug(f"Acquired session slot for {self.host}")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.scheduler.release_slot(self.holder)
+
+    def throttle(self) -> None:
+        """Wait for a request token before a page load or pagination action."""
+        self.wait_seconds += self.scheduler.acquire_token(self.host, self.limits, self.holder)
+
+    def report_failure(self) -> float:
+        return self.scheduler.report_failure(self.host, self.limits)
+
+    def report_success(self) -> None:
+        self.scheduler.report_success(self.host)
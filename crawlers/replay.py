@@ -0,0 +1,418 @@
+"""
+Record and replay browser sessions.
+
+A recording wraps the real WebDriver and stores every DOM state the crawl
+observes, together with the navigation, click and script calls that led to it.
+Replaying serves those states from a bs4-backed fake driver, so a full pipeline
+(open_page -> extract_items) runs without a browser or network. Combined with
+VirtualClock, which makes time.sleep free, a replayed crawl takes seconds.
+
+Usage:
+    python -m crawlers.run_scraper --store macys --urls <url> --record recordings/macys
+    python -m crawlers.run_scraper --store macys --urls <url> --replay recordings/macys
+"""
+import gzip
+import hashlib
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.files import atomic_write_json, read_json
+from utils.logger import logger
+
+
+def _script_key(script: str, args: tuple = ()) -> str:
+    """
+    Normalize a script and its arguments for matching; scroll offsets and step sizes
+    inlined in scripts are random. Element arguments are keyed by how they were located.
+    """
+    key = re.sub(r"\d+", "0", " ".join(script.split()))
+    if args:
+        key += " " + json.dumps([getattr(arg, "locator", None) if isinstance(arg, WebElement) else _jsonable(arg)
+                                 for arg in args], sort_keys=True, separators=(",", ":"))
+    return key
+
+
+def _locator_key(by: str, value: str, index: int) -> str:
+    return f"{by}={value}[{index}]"
+
+
+def _jsonable(value: Any) -> Any:
+    """Return the value if it can be stored in the cassette, else None (e.g. elements)."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    return None
+
+
+class Cassette:
+    """
+    Recorded browser sessions of one crawl, stored in a directory.
+
+    cassette.json lists one session per opened browser (one per URL) with its
+    events; the DOM snapshots are stored once each, gzipped, under pages/ and
+    referenced by content hash.
+    """
+
+    def __init__(self, path: str, store: Optional[str] = None):
+        self.path = Path(path)
+        self.store = store
+        self.sessions: List[Dict[str, Any]] = []
+        self._pages: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        data = read_json(Path(path) / "cassette.json")
+        if data is None:
+            raise FileNotFoundError(f"No recording found in {path}")
+        cassette = cls(path, data.get("store"))
+        cassette.sessions = data["sessions"]
+        return cassette
+
+    def save(self) -> None:
+        atomic_write_json(self.path / "cassette.json", {
+            "store": self.store,
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "sessions": self.sessions,
+        })
+        logger.info(f"Saved recording with {len(self.sessions)} sessions to {self.path}")
+
+    def new_session(self, seed: int) -> Dict[str, Any]:
+        session = {"seed": seed, "events": []}
+        self.sessions.append(session)
+        return session
+
+    def add_page(self, html: str) -> str:
+        """Store a DOM snapshot and return its content hash."""
+        digest = hashlib.blake2b(html.encode("utf-8"), digest_size=16).hexdigest()
+        if digest not in self._pages:
+            page_file = self.path / "pages" / f"{digest}.html.gz"
+            if not page_file.exists():
+                page_file.parent.mkdir(parents=True, exist_ok=True)
+                page_file.write_bytes(gzip.compress(html.encode("utf-8")))
+            self._pages[digest] = html
+        return digest
+
+    def page(self, digest: str) -> str:
+        if digest not in self._pages:
+            page_file = self.path / "pages" / f"{digest}.html.gz"
+            self._pages[digest] = gzip.decompress(page_file.read_bytes()).decode("utf-8")
+        return self._pages[digest]
+
+
+class VirtualClock:
+    """
+    Context manager that replaces time.sleep and time.monotonic with a virtual clock.
+
+    Sleeping advances the clock instead of blocking, so pauses and WebDriverWait
+    timeouts cost nothing. Patches the time module globally; use it for replays only.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+        self._originals = None
+
+    def sleep(self, seconds: float) -> None:
+        self.now += max(0.0, seconds)
+        self.slept += max(0.0, seconds)
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def __enter__(self):
+        self._originals = (time.sleep, time.monotonic)
+        self.now = self._originals[1]()
+        time.sleep, time.monotonic = self.sleep, self.monotonic
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        time.sleep, time.monotonic = self._originals
+        logger.info(f"Virtual clock skipped {self.slept:.1f}s of sleeps")
+
+
+class RecordingElement(WebElement):
+    """Proxy for a live element that remembers how it was located, so clicks can be replayed."""
+
+    def __init__(self, element: WebElement, recorder: "RecordingDriver", locator: str):
+        self._element = element
+        self._recorder = recorder
+        self.locator = locator
+        self._parent = recorder
+        self._id = element.id
+
+    @property
+    def text(self) -> str:
+        return self._element.text
+
+    @property
+    def tag_name(self) -> str:
+        return self._element.tag_name
+
+    def get_attribute(self, name: str):
+        return self._element.get_attribute(name)
+
+    def get_dom_attribute(self, name: str):
+        return self._element.get_dom_attribute(name)
+
+    def is_displayed(self) -> bool:
+        return self._element.is_displayed()
+
+    def is_enabled(self) -> bool:
+        return self._element.is_enabled()
+
+    def click(self) -> None:
+        self._element.click()
+        self._recorder._record("click", self.locator)
+
+
+class RecordingDriver:
+    """
+    WebDriver proxy that records a live session into a Cassette.
+
+    Navigation, clicks and scripts are recorded as events. Every observation of
+    the DOM (page_source, find_element(s), current_url) snapshots the page and
+    assigns it to the last event, so each event ends up with the state the page
+    settled into before the next action. The random module is reseeded at the
+    start of the session and the seed is saved, so a replay makes the same
+    random choices (pauses, scroll steps) as the recorded run.
+    """
+
+    def __init__(self, driver, cassette: Cassette):
+        self._driver = driver
+        self._cassette = cassette
+        seed = random.randrange(2 ** 32)
+        random.seed(seed)
+        self._events = cassette.new_session(seed)["events"]
+
+    def __getattr__(self, name: str):
+        return getattr(self._driver, name)
+
+    def _record(self, op: str, target: str, result: Any = None) -> None:
+        event = {"op": op, "target": target}
+        if result is not None:
+            event["result"] = result
+        self._events.append(event)
+
+    def _observe(self) -> None:
+        if not self._events:
+            return
+        try:
+            self._events[-1]["state"] = self._cassette.add_page(self._driver.page_source)
+            self._events[-1]["url"] = self._driver.current_url
+        except Exception as e:
+            logger.debug(f"Could not snapshot page: {e}")
+
+    def get(self, url: str) -> None:
+        self._driver.get(url)
+        self._record("get", url)
+        self._observe()
+
+    @property
+    def page_source(self) -> str:
+        self._observe()
+        return self._driver.page_source
+
+    @property
+    def current_url(self) -> str:
+        self._observe()
+        return self._driver.current_url
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> RecordingElement:
+        self._observe()
+        return RecordingElement(self._driver.find_element(by, value), self, _locator_key(by, value, 0))
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[RecordingElement]:
+        self._observe()
+        return [
+            RecordingElement(element, self, _locator_key(by, value, index))
+            for index, element in enumerate(self._driver.find_elements(by, value))
+        ]
+
+    def execute_script(self, script: str, *args):
+        key = _script_key(script, args)
+        args = [arg._element if isinstance(arg, RecordingElement) else arg for arg in args]
+        result = self._driver.execute_script(script, *args)
+        self._record("script", key, _jsonable(result))
+        return result
+
+    def quit(self) -> None:
+        try:
+            self._cassette.save()
+        finally:
+            self._driver.quit()
+
+
+class ReplayElement(WebElement):
+    """Element of a replayed DOM snapshot."""
+
+    def __init__(self, driver: "ReplayDriver", tag, locator: str):
+        self._parent = driver
+        self._id = f"replay-{id(tag)}"
+        self._tag = tag
+        self.locator = locator
+
+    @property
+    def text(self) -> str:
+        if not self.is_displayed():
+            return ""
+        return " ".join(self._tag.get_text(" ").split())
+
+    @property
+    def tag_name(self) -> str:
+        return self._tag.name
+
+    def get_attribute(self, name: str):
+        value = self._tag.get(name)
+        return " ".join(value) if isinstance(value, list) else value
+
+    get_dom_attribute = get_attribute
+
+    def is_displayed(self) -> bool:
+        for tag in [self._tag, *self._tag.parents]:
+            if getattr(tag, "attrs", None) is None:
+                continue
+            style = (tag.get("style") or "").replace(" ", "").lower()
+            if tag.has_attr("hidden") or "display:none" in style or "visibility:hidden" in style:
+                return False
+        return not (self._tag.name == "input" and self._tag.get("type") == "hidden")
+
+    def is_enabled(self) -> bool:
+        return not self._tag.has_attr("disabled")
+
+    def click(self) -> None:
+        # Fail like an unclickable element, so pagination stops instead of looping on one state
+        if self._parent._advance("click", self.locator) is None:
+            raise WebDriverException(f"Click on {self.locator} was not recorded")
+
+
+class _ReplaySwitchTo:
+    def window(self, handle: str) -> None:
+        pass
+
+
+class ReplayDriver:
+    """
+    Fake WebDriver that replays a recorded session.
+
+    Implements the subset of the Selenium API the scrapers use: get, page_source,
+    current_url, find_element(s) by CSS/ID/class/tag, execute_script, element
+    text/attributes/visibility and clicks, which also makes WebDriverWait and
+    expected_conditions work. Actions move through the recorded events in order;
+    each action jumps to the next matching event and shows the DOM state recorded
+    after it.
+    """
+
+    def __init__(self, cassette: Cassette, session: Dict[str, Any]):
+        self._cassette = cassette
+        self._events = session["events"]
+        self._cursor = 0
+        self._state: Optional[str] = None
+        self._url = "about:blank"
+        self._soup = None
+        self.window_handles = ["replay"]
+        self.switch_to = _ReplaySwitchTo()
+        random.seed(session["seed"])
+
+    def _advance(self, op: str, target: str) -> Optional[Dict[str, Any]]:
+        """
+        Move to the next recorded event matching the action and show its state.
+        Returns:
+            The event, or None if the recording has no further matching event
+        """
+        for index in range(self._cursor, len(self._events)):
+            event = self._events[index]
+            if event["op"] == op and event["target"] == target:
+                self._cursor = index + 1
+                if event.get("state") and event["state"] != self._state:
+                    self._state = event["state"]
+                    self._soup = None
+                self._url = event.get("url", self._url)
+                return event
+        logger.warning(f"Replay diverged from the recording: no {op} event for {target}")
+        return None
+
+    def _dom(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.page_source, 'html.parser')
+        return self._soup
+
+    def get(self, url: str) -> None:
+        if self._advance("get", url) is None:
+            raise WebDriverException(f"No recorded page load for {url}")
+
+    @property
+    def page_source(self) -> str:
+        return self._cassette.page(self._state) if self._state else "<html><head></head><body></body></html>"
+
+    @property
+    def current_url(self) -> str:
+        return self._url
+
+    @property
+    def title(self) -> str:
+        title = self._dom().title
+        return title.get_text(strip=True) if title else ""
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[ReplayElement]:
+        css = {
+            By.CSS_SELECTOR: value,
+            By.ID: f'[id="{value}"]',
+            By.CLASS_NAME: f".{value}",
+            By.TAG_NAME: value,
+            By.NAME: f'[name="{value}"]',
+        }.get(by)
+        if css is None:
+            raise NotImplementedError(f"Replay does not support locating elements by {by}")
+        return [ReplayElement(self, tag, _locator_key(by, value, index))
+                for index, tag in enumerate(self._dom().select(css))]
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> ReplayElement:
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element matches {by}={value}")
+        return elements[0]
+
+    def execute_script(self, script: str, *args):
+        event = self._advance("script", _script_key(script, args))
+        if event is not None:
+            return event.get("result")
+        # Scripts that read a value (e.g. scroll offsets) get a neutral number
+        return 0 if script.strip().startswith("return") else None
+
+    def set_window_size(self, width: int, height: int) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+
+def recording_driver_factory(cassette: Cassette) -> Callable:
+    """Return a BaseScraper.driver_factory that records each browser session into the cassette."""
+    def factory(scraper):
+        return RecordingDriver(scraper.launch_browser(), cassette)
+    return factory
+
+
+def replay_driver_factory(cassette: Cassette) -> Callable:
+    """Return a BaseScraper.driver_factory that replays the cassette's sessions in order."""
+    sessions = iter(cassette.sessions)
+
+    def factory(scraper):
+        session = next(sessions, None)
+        if session is None:
+            raise RuntimeError(f"Recording {cassette.path} has no more sessions to replay")
+        return ReplayDriver(cassette, session)
+    return factory
@@ -0,0 +1,222 @@
+"""
+Declarative retry policy and per-store circuit breaker (SCRAPER_CONFIG "retry").
+
+RetryPolicy decides which errors are retried (by exception class name, matched
+against the error's class hierarchy so "WebDriverException" also covers
+TimeoutException), how long to back off between attempts (exponential with
+jitter) and how many attempts to make. run_scraper retries each URL under the
+store's policy; named sub-policies (e.g. "homepage") cover steps inside a
+pipeline.
+
+CircuitBreaker counts consecutive failed URLs that look like blocks. Once a
+store reaches the threshold, its breaker opens: remaining URLs fail fast instead
+of burning minutes each, and batch workers skip the store. After the cooldown
+one trial URL is let through; its success closes the breaker, its failure opens
+it again. Breaker state is kept in SQLite, so all workers sharing the state
+directory see it.
+"""
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+
+from utils.logger import logger
+
+DEFAULT_RETRY = {
+    "max_attempts": 2,           # Attempts per URL, including the first
+    "backoff_base": 5.0,         # Seconds before the second attempt, doubled for every further one
+    "backoff_max": 120.0,        # Upper bound for the backoff
+    "jitter": 0.5,               # Backoff is drawn from [delay * (1 - jitter), delay]
+    # Errors worth retrying; anything else (e.g. a selector bug) fails at once
+    "retry_on": ["BlockedError", "TimeoutException", "WebDriverException", "TimeoutError", "ConnectionError",
+                 "WorkerCrashed"],
+}
+
+DEFAULT_CIRCUIT_BREAKER = {
+    "threshold": 3,              # Consecutive failed URLs that open the breaker
+    "cooldown_minutes": 30,      # Time before a trial URL is let through
+    "trip_on": ["BlockedError"],  # Errors that count as blocks
+}
+
+
+def _matches(error: BaseException, class_names: List[str]) -> bool:
+    """Check whether the error's class, or one of its base classes, is named in class_names."""
+    return any(cls.__name__ in class_names for cls in type(error).__mro__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of crawling a URL while the store's circuit breaker is open."""
+
+
+class RetryPolicy:
+    """Retryable error classes, exponential backoff with jitter and a maximum number of attempts."""
+
+    def __init__(self, max_attempts: int = DEFAULT_RETRY["max_attempts"],
+                 backoff_base: float = DEFAULT_RETRY["backoff_base"],
+                 backoff_max: float = DEFAULT_RETRY["backoff_max"], jitter: float = DEFAULT_RETRY["jitter"],
+                 retry_on: Optional[List[str]] = None):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.retry_on = list(DEFAULT_RETRY["retry_on"] if retry_on is None else retry_on)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], scope: Optional[str] = None) -> "RetryPolicy":
+        """
+        Build the policy from a store's "retry" config.
+        Args:
+            config: The store's SCRAPER_CONFIG
+            scope: Named sub-policy (e.g. "homepage") whose settings override the store's
+        """
+        retry_config = config.get("retry") or {}
+        settings = {**DEFAULT_RETRY, **{key: value for key, value in retry_config.items() if key in DEFAULT_RETRY}}
+        if scope:
+            settings.update(retry_config.get(scope) or {})
+        return cls(**settings)
+
+    def is_retryable(self, error: BaseException) -> bool:
+        return _matches(error, self.retry_on)
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Check whether to make another attempt after `attempt` failed with `error`."""
+        return attempt < self.max_attempts and self.is_retryable(error)
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to back off after failed attempt number `attempt` (1-based)."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return delay * random.uniform(1 - self.jitter, 1)
+
+    def call(self, func: Callable[[int], Any], description: str,
+             sleep: Optional[Callable[[float], None]] = None) -> Any:
+        """
+        Call func(attempt) until it succeeds, retrying retryable errors with backoff.
+        Args:
+            func: Called with the 1-based attempt number
+            description: What is being attempted, for the log
+            sleep: Sleeps for the backoff (default time.sleep), e.g. to time it as a pause
+        Returns:
+            The result of the first successful call; the last error is raised if all attempts fail
+        """
+        attempt = 1
+        while True:
+            try:
+                return func(attempt)
+            except Exception as e:
+                if not self.should_retry(e, attempt):
+                    raise
+                delay = self.delay(attempt)
+                logger.warning(f"{description} failed on attempt {attempt}/{self.max_attempts} ({e}); "
+                               f"retrying in {delay:.1f}s")
+                (sleep or time.sleep)(delay)
+                attempt += 1
+
+
+class CircuitBreaker:
+    """
+    Per-store circuit breaker shared through a SQLite file.
+    Safe to share between threads (e.g. tab sessions).
+    """
+
+    def __init__(self, path: str = "crawler_state/scheduler.db"):
+        """
+        Args:
+            path: SQLite file for the breaker state, or ":memory:" for a breaker local to this process
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS circuit_breakers (
+                store TEXT PRIMARY KEY,
+                failures INTEGER NOT NULL DEFAULT 0,
+                open_until REAL NOT NULL DEFAULT 0
+            )
+        """)
+
+    @staticmethod
+    def settings_for(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge a store's "retry.circuit_breaker" config over the defaults."""
+        return {**DEFAULT_CIRCUIT_BREAKER, **((config.get("retry") or {}).get("circuit_breaker") or {})}
+
+    def _state(self, store: str) -> tuple:
+        row = self.conn.execute("SELECT failures, open_until FROM circuit_breakers WHERE store = ?",
+                                (store,)).fetchone()
+        return row or (0, 0.0)
+
+    def is_open(self, store: str) -> bool:
+        """Check whether the store's breaker is open (without taking the trial slot)."""
+        with self._lock:
+            return time.time() < self._state(store)[1]
+
+    def allow(self, store: str, settings: Dict[str, Any]) -> bool:
+        """
+        Check whether a URL of the store may be crawled now.
+        Once the cooldown has passed, the first caller gets the trial and the breaker
+        stays open for everyone else until the trial's outcome is recorded.
+        """
+        with self._lock:
+            now = time.time()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                failures, open_until = self._state(store)
+                allowed = now >= open_until
+                if allowed and failures >= settings["threshold"]:
+                    # Half-open: hold the breaker open while the trial URL runs
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO circuit_breakers (store, failures, open_until) VALUES (?, ?, ?)",
+                        (store, failures, now + settings["cooldown_minutes"] * 60)
+                    )
+                    logger.info(f"Circuit breaker for {store}: cooldown over, letting a trial URL through")
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            return allowed
+
+    def record_success(self, store: str) -> None:
+        """Close the store's breaker after a successful live crawl."""
+        with self._lock:
+            self.conn.execute("DELETE FROM circuit_breakers WHERE store = ?", (store,))
+
+    def record_failure(self, store: str, error: BaseException, settings: Dict[str, Any]) -> bool:
+        """
+        Count a failed URL if its error is a block, opening the breaker at the threshold.
+        Any other error ends the run of consecutive blocks, unless the breaker is open
+        (a failed trial keeps it open until the next one).
+        Returns:
+            True if the breaker is open after this failure
+        """
+        if not _matches(error, settings["trip_on"]):
+            with self._lock:
+                self.conn.execute("UPDATE circuit_breakers SET failures = 0 WHERE store = ? AND open_until <= ?",
+                                  (store, time.time()))
+            return False
+        with self._lock:
+            now = time.time()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                failures, open_until = self._state(store)
+                failures += 1
+                if failures >= settings["threshold"]:
+                    open_until = now + settings["cooldown_minutes"] * 60
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO circuit_breakers (store, failures, open_until) VALUES (?, ?, ?)",
+                    (store, failures, open_until)
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        if open_until > now:
+            logger.warning(f"Circuit breaker for {store} opened after {failures} consecutive blocked URLs; "
+                           f"failing fast for {settings['cooldown_minutes']} minutes")
+            return True
+        return False
+
+    def close(self) -> None:
+        self.conn.close()
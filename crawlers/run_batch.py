@@ -0,0 +1,289 @@
+import argparse
+import importlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from utils.logger import logger
+from crawlers.enrichment import enrich_items
+from crawlers.images import download_images
+from crawlers.job_queue import JobQueue, default_worker_id
+from crawlers.metrics import RunMetrics
+from crawlers.page_cache import PageCache
+from crawlers.rate_limit import HostScheduler, host_of
+from crawlers.retry import CircuitBreaker, CircuitOpenError
+from crawlers.watchdog import DEFAULT_HEARTBEAT_SECONDS, Watchdog
+from crawlers.output import save_results, save_results_sqlite
+from crawlers.run_scraper import run_scraper
+
+
+class LeaseKeeper:
+    """Background thread that renews a job's lease while the job runs."""
+
+    def __init__(self, queue_path: str, job_id: int, worker_id: str, lease_seconds: float):
+        self.queue_path = queue_path
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{job_id}", daemon=True)
+
+    def _run(self) -> None:
+        # SQLite connections cannot be shared across threads, so use a separate one
+        queue = JobQueue(self.queue_path)
+        try:
+            while not self._stop.wait(self.lease_seconds / 3):
+                if not queue.heartbeat(self.job_id, self.worker_id, self.lease_seconds):
+                    logger.error(f"Lost lease on job {self.job_id}")
+                    self.lost = True
+                    return
+        finally:
+            queue.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+
+def unavailable_stores(queue: JobQueue, scheduler: HostScheduler,
+                       breaker: Optional[CircuitBreaker] = None) -> List[str]:
+    """
+    Return queued stores whose host is at its concurrency cap or backing off, or whose
+    circuit breaker is open. Workers skip these so they pick up jobs for stores with
+    spare capacity instead, and return to them once the breaker's cooldown is over.
+    """
+    unavailable = []
+    for store in queue.queued_stores():
+        if breaker and breaker.is_open(store):
+            unavailable.append(store)
+            continue
+        try:
+            config = importlib.import_module(f"crawlers.stores.{store}.scripts.config").SCRAPER_CONFIG
+        except ImportError:
+            continue
+        if config.get("rate_limit") and config.get("base_url"):
+            if not scheduler.is_available(host_of(config["base_url"]), HostScheduler.limits_for(config)):
+                unavailable.append(store)
+    return unavailable
+
+
+def run_job(spec: Dict[str, Any], resume: bool = False, state_dir: str = "crawler_state",
+            scheduler_path: Optional[str] = None) -> tuple:
+    """
+    Run a single scrape job.
+    Args:
+        spec: Job specification with store, urls and optional items_limit, fields, output, db,
+            prune_dom, page_cache, enrich and images_dir
+        resume: Continue each URL from its checkpoint, e.g. when a failed job is retried
+        state_dir: Directory for checkpoints, the page cache and the detail cache
+        scheduler_path: Shared per-host scheduler state (default: scheduler.db in state_dir)
+    Returns:
+        Tuple of (number of items, output file or None). A listing without products
+        completes with (0, None); URLs that failed raise instead, so the job is retried.
+    """
+    urls = spec["urls"]
+    if isinstance(urls, str):
+        urls = [url.strip() for url in urls.split(',')]
+    fields = spec.get("fields")
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',')]
+
+    config = importlib.import_module(f"crawlers.stores.{spec['store']}.scripts.config").SCRAPER_CONFIG
+    if spec.get("enrich") and not (config.get("detail_page") or {}).get("selectors"):
+        # Checked before the crawl, which would otherwise be repeated on every attempt
+        raise ValueError(f"Job asks for enrichment but the {spec['store']} config has no detail_page selectors")
+
+    metrics = RunMetrics()
+    # Jobs asking for the same category within the store's TTL share its cached pages
+    page_cache = PageCache(str(Path(state_dir) / "pages.db")) if spec.get("page_cache") else None
+    extra_metadata = {"fields": fields} if fields else {}
+    try:
+        items = run_scraper(urls, spec["store"], spec.get("items_limit"), metrics=metrics, resume=resume,
+                            checkpoint_dir=str(Path(state_dir) / "checkpoints"),
+                            scheduler_path=scheduler_path or str(Path(state_dir) / "scheduler.db"),
+                            prune_dom=spec.get("prune_dom"), page_cache=page_cache, fields=fields)
+        if page_cache:
+            extra_metadata["page_cache"] = page_cache.summary()
+    finally:
+        if page_cache:
+            page_cache.close()
+    if not items:
+        # run_scraper logs and swallows URL errors, so tell them apart from listings without products
+        if metrics.counters.get("circuit_open"):
+            raise CircuitOpenError(f"Circuit breaker for {spec['store']} is open; no items were extracted")
+        if metrics.counters.get("failed_urls"):
+            raise RuntimeError(f"No items were extracted; {metrics.counters['failed_urls']} URLs failed")
+        if metrics.counters.get("urls", 0) < len(urls):
+            # A fatal error (e.g. the store's pipeline failed to load) before all URLs were crawled
+            raise RuntimeError("No items were extracted; the scraper stopped before crawling every URL")
+        logger.info(f"Job for {spec['store']} completed: its listings contain no products")
+        return 0, None
+
+    output_dir = spec.get("output", "crawler_output")
+    output_file = None
+    if spec.get("enrich") or spec.get("images_dir"):
+        # Save the crawl first; a failing post-processing stage must not send the job back to the queue
+        output_file = save_results(items, spec["store"], output_dir, extra_metadata=extra_metadata)
+    if spec.get("enrich"):
+        try:
+            with metrics.phase("enrich"):
+                extra_metadata["enrichment"] = enrich_items(items, config, str(Path(state_dir) / "details.db"))
+            metrics.count("enriched",
+                          extra_metadata["enrichment"]["fetched"] + extra_metadata["enrichment"]["cached"])
+        except Exception as e:
+            logger.error(f"Detail enrichment failed: {e}", exc_info=True)
+            extra_metadata["enrichment"] = {"error": str(e)}
+    if spec.get("images_dir"):
+        try:
+            with metrics.phase("images"):
+                extra_metadata["images"] = download_images(items, spec["images_dir"],
+                                                           base_url=config.get("base_url"))
+            metrics.count("images", extra_metadata["images"]["downloaded"])
+        except Exception as e:
+            logger.error(f"Image downloads failed: {e}", exc_info=True)
+            extra_metadata["images"] = {"error": str(e)}
+    extra_metadata["metrics"] = metrics.to_dict()
+    output_file = save_results(items, spec["store"], output_dir, extra_metadata=extra_metadata,
+                               filename=output_file)
+    if spec.get("db"):
+        save_results_sqlite(items, spec["store"], spec["db"], fields)
+    return len(items), output_file
+
+
+def work(queue_path: str, worker_id: Optional[str] = None, lease_seconds: float = 300,
+         wait: bool = False, poll_interval: float = 10,
+         scheduler_path: Optional[str] = None, watchdog: Optional[Watchdog] = None,
+         state_dir: str = "crawler_state") -> int:
+    """
+    Claim and run jobs until the queue is empty.
+    Args:
+        queue_path: Path to the SQLite job queue
+        worker_id: Worker identifier (defaults to host:pid)
+        lease_seconds: Lease duration, renewed every third of the lease
+        wait: Keep polling for new jobs instead of exiting when the queue is empty
+        poll_interval: Seconds between polls when waiting
+        scheduler_path: Shared per-host scheduler state (default: scheduler.db in state_dir)
+        watchdog: Run each job in a supervised process that is killed, with its browsers,
+            when the job hangs (optional). The job is then retried like any failed job.
+        state_dir: Directory for crawl state shared by the jobs (checkpoints, caches)
+    Returns:
+        Number of jobs completed by this worker
+    """
+    worker_id = worker_id or default_worker_id()
+    scheduler_path = scheduler_path or str(Path(state_dir) / "scheduler.db")
+    queue = JobQueue(queue_path)
+    scheduler = HostScheduler(scheduler_path)
+    breaker = CircuitBreaker(scheduler_path)
+    completed = 0
+    logger.info(f"Worker {worker_id} started on queue {queue_path}")
+
+    try:
+        while True:
+            job = queue.claim(worker_id, lease_seconds, exclude_stores=unavailable_stores(queue, scheduler, breaker))
+            if job is None:
+                if not wait and not queue.queued_stores():
+                    break
+                # Remaining jobs are for saturated hosts, or we are waiting for new jobs
+                time.sleep(poll_interval)
+                continue
+
+            spec = job["spec"]
+            logger.info(f"Running job {job['id']} (attempt {job['attempts']}): {spec['store']}")
+            with LeaseKeeper(queue_path, job["id"], worker_id, lease_seconds) as lease:
+                try:
+                    # Retries continue from the checkpoints of the failed attempt
+                    resume = job["attempts"] > 1
+                    if watchdog:
+                        items, output_file = watchdog.run(run_job, spec, resume, state_dir, scheduler_path,
+                                                                 description=f"job {job['id']}")
+                    else:
+                        items, output_file = run_job(spec, resume, state_dir, scheduler_path)
+                except Exception as e:
+                    logger.error(f"Job {job['id']} failed: {e}", exc_info=True)
+                    queue.fail(job["id"], worker_id, str(e))
+                    continue
+
+            if lease.lost:
+                # Another worker may have picked the job up; keep our output but don't touch its status
+                logger.warning(f"Job {job['id']} finished after its lease was lost, output: {output_file}")
+                continue
+            queue.complete(job["id"], worker_id, items, output_file)
+            completed += 1
+            logger.info(f"Job {job['id']} done: {items} items saved to {output_file}")
+    finally:
+        queue.close()
+        scheduler.close()
+        breaker.close()
+
+    logger.info(f"Worker {worker_id} finished after completing {completed} jobs")
+    return completed
+
+
+def main():
+    """Manage and drain a local queue of scrape jobs."""
+    parser = argparse.ArgumentParser(description='Run scrape jobs from a JSONL job file')
+    parser.add_argument('--queue', type=str, default='crawler_state/jobs.db', help='SQLite job queue file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Add the jobs in a JSONL file to the queue')
+    enqueue_parser.add_argument('job_file', type=str, help='JSONL file with one job per line')
+
+    work_parser = subparsers.add_parser('work', help='Claim and run jobs')
+    work_parser.add_argument('--worker-id', type=str, help='Worker identifier (default: host:pid)')
+    work_parser.add_argument('--lease-seconds', type=float, default=300, help='Job lease duration')
+    work_parser.add_argument('--wait', action='store_true', help='Keep polling when the queue is empty')
+    work_parser.add_argument('--state-dir', type=str, default='crawler_state',
+                             help='Directory for crawl state: scheduler, checkpoints and caches '
+                                  '(default: crawler_state)')
+    work_parser.add_argument('--isolate', action='store_true',
+                             help='Run each job in a supervised process that is killed, with its browsers, '
+                                  'when it stops making progress')
+    work_parser.add_argument('--job-timeout', type=float, metavar='SECONDS',
+                             help='Kill a job after this many seconds (implies --isolate)')
+    work_parser.add_argument('--heartbeat-timeout', type=float, default=DEFAULT_HEARTBEAT_SECONDS,
+                             metavar='SECONDS',
+                             help=f'Kill a job that shows no progress for this long '
+                                  f'(default: {DEFAULT_HEARTBEAT_SECONDS})')
+
+    status_parser = subparsers.add_parser('status', help='Show job status and throughput')
+    status_parser.add_argument('--json', action='store_true', help='Print status as JSON')
+
+    args = parser.parse_args()
+
+    if args.command == 'enqueue':
+        queue = JobQueue(args.queue)
+        added = queue.enqueue_file(args.job_file)
+        queue.close()
+        print(f"Enqueued {added} jobs into {args.queue}")
+
+    elif args.command == 'work':
+        watchdog = None
+        if args.isolate or args.job_timeout is not None:
+            watchdog = Watchdog(args.job_timeout, args.heartbeat_timeout)
+        completed = work(args.queue, args.worker_id, args.lease_seconds, args.wait, watchdog=watchdog,
+                         state_dir=args.state_dir)
+        print(f"\nCompleted {completed} jobs")
+
+    elif args.command == 'status':
+        queue = JobQueue(args.queue)
+        stats, jobs = queue.stats(), queue.jobs()
+        queue.close()
+        if args.json:
+            print(json.dumps({"stats": stats, "jobs": jobs}, indent=2))
+            return
+        print(f"Jobs by status: {stats['counts']}")
+        print(f"Items scraped: {stats['items']} ({stats['items_per_minute']} items/min)")
+        for job in jobs:
+            print(f"  #{job['id']:<4} {job['store']:<10} {job['status']:<8} attempts={job['attempts']} "
+                  f"items={job['items']} duration={job['duration_seconds']}s "
+                  f"rate={job['items_per_minute']}/min {job['error'] or ''}")
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,291 @@
-import json
 import argparse
+import functools
 import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from utils.logger import logger
+from crawlers.checkpoint import CheckpointManager
+from crawlers.dedup import MemoryDedupIndex, StagedDedupIndex, create_dedup_index
+from crawlers.enrichment import enrich_items
+from crawlers.extraction import project_config
+from crawlers.images import download_images
+from crawlers.incremental import TileIndex
+from crawlers.metrics import RunMetrics
+from crawlers.output import save_results, save_results_sqlite
+from crawlers.page_cache import DEFAULT_MAX_MB, PageCache
+from crawlers.rate_limit import HostScheduler, host_of
+from crawlers.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+from crawlers.watchdog import DEFAULT_HEARTBEAT_SECONDS, Watchdog
 
-def run_scraper(urls: List[str], store_name: str, items_limit: int = None) -> List[Dict[str, Any]]:
+def _scrape_url(store_scraper, url: str, store_name: str, items_limit: Optional[int], resume: bool,
+                checkpoint_dir: str, scheduler: Optional[HostScheduler],
+                breaker: Optional[CircuitBreaker] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Crawl one URL with a configured scraper and close its browser afterwards.
+    Args:
+        breaker: Fails the URL fast with CircuitOpenError when it has to be crawled live
+            while the store's circuit breaker is open (optional)
+    Returns:
+        Tuple of (extracted items, whether the crawl continued from a checkpoint)
+    """
+    resumed = False
+    try:
+        logger.info(f"Processing URL: {url}")
+        checkpoint = CheckpointManager(
+            store_name, url, checkpoint_dir,
+            every_pages=store_scraper.config.get("checkpoint", {}).get("every_pages", 1)
+        )
+        store_scraper.checkpoint = checkpoint
+        store_scraper.resume_state = checkpoint.load() if resume else None
+
+        if store_scraper.load_cached_listing(url, items_limit):
+            # Fresh snapshots of the listing are cached: no browser or rate limit slot needed
+            logger.info(f"Serving {url} from the page cache")
+            items = store_scraper.extract_items(items_limit=items_limit)
+        else:
+            if breaker and not breaker.allow(store_name, CircuitBreaker.settings_for(store_scraper.config)):
+                raise CircuitOpenError(f"Circuit breaker for {store_name} is open; skipping {url}")
+            if scheduler:
+                host = host_of(store_scraper.config.get("base_url") or url)
+                host_session = scheduler.session(host, HostScheduler.limits_for(store_scraper.config))
+            else:
+                host_session = nullcontext()
+
+            # Waits here until the store's host has a free session slot
+            with host_session as session:
+                store_scraper.host_session = session
+
+                # Open the page, or the page the checkpoint was taken on
+                if store_scraper.resume_state:
+                    resumed = True
+                    logger.info(f"Resuming {url} from {store_scraper.resume_state['current_url']}")
+                    store_scraper.open_page(store_scraper.resume_state["current_url"])
+                else:
+                    store_scraper.open_page(url)
+                #add debug for items_limit if there is one 
+                logger.debug(f"Items limit set to: {items_limit}")
+
+                # Extract items (pagination is handled within extract_items)
+                items = store_scraper.extract_items(items_limit=items_limit)
+                if session:
+                    session.report_success()
+                    logger.debug(f"Waited {session.wait_seconds:.1f}s for rate limits on {session.host}")
+        logger.info(f"Extracted {len(items)} items from URL: {url}")
+        checkpoint.clear()
+        return items, resumed
+
+    finally:
+        store_scraper.cleanup()
+        store_scraper.host_session = None
+
+def _scrape_url_worker(store_name: str, config: Dict[str, Any], url: str, items_limit: Optional[int],
+                       resume: bool, checkpoint_dir: str, scheduler_path: Optional[str], prune_dom: bool,
+                       page_cache_path: Optional[str], page_cache_max_mb: float,
+                       check_breaker: bool) -> Dict[str, Any]:
+    """
+    Crawl one URL in a supervised worker process (see crawlers.watchdog).
+    The worker opens its own scheduler, page cache and breaker connections; products
+    shared with other URLs are dropped by the parent.
+    Returns:
+        Dict with the items, whether the crawl resumed or was served from the page cache,
+        the worker's metrics and its page cache counts
+    """
+    module = importlib.import_module(f"crawlers.stores.{store_name}.scripts.pipeline")
+    scraper = module.get_scraper(config)
+    scraper.prune_dom = prune_dom
+    if page_cache_path:
+        scraper.page_cache = PageCache(page_cache_path, page_cache_max_mb)
+    scheduler = HostScheduler(scheduler_path) if scheduler_path and config.get("rate_limit") else None
+    breaker = CircuitBreaker(scheduler_path) if check_breaker and scheduler_path else None
+    try:
+        items, resumed = _scrape_url(scraper, url, store_name, items_limit, resume, checkpoint_dir,
+                                     scheduler, breaker)
+        return {
+            "items": items,
+            "resumed": resumed,
+            "cached": bool(scraper.cached_steps),
+            "metrics": scraper.metrics,
+            "page_cache": scraper.page_cache.counts if scraper.page_cache else None,
+        }
+    finally:
+        for connection in (scheduler, breaker, scraper.page_cache):
+            if connection:
+                connection.close()
+
+def _crawl_url(store_scraper, url: str, store_name: str, items_limit: Optional[int], resume: bool,
+               checkpoint_dir: str, scheduler: Optional[HostScheduler], breaker: CircuitBreaker,
+               watchdog: Optional[Watchdog] = None,
+               scheduler_path: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Crawl one URL under the store's retry policy and circuit breaker (see crawlers.retry).
+    Retries continue from the checkpoint the failed attempt left behind.
+    Args:
+        watchdog: Runs each attempt in a supervised worker process that is killed when it
+            hangs (optional); scheduler_path is then opened by the worker
+    Returns:
+        Tuple of (extracted items, whether the crawl continued from a checkpoint)
+    """
+    store_scraper.metrics.count("urls")
+    policy = RetryPolicy.from_config(store_scraper.config)
+    settings = CircuitBreaker.settings_for(store_scraper.config)
+    checkpoint_path = CheckpointManager(store_name, url, checkpoint_dir).path
+    shared_index = store_scraper.dedup_index
+    started = time.time()
+    attempt = 1
+    while True:
+        # Product IDs reach the shared dedup index only once an attempt succeeds
+        staged = StagedDedupIndex(shared_index) if shared_index is not None else None
+        store_scraper.dedup_index = staged
+        try:
+            # Only the first attempt is checked against the breaker; an admitted URL keeps its retries
+            if watchdog:
+                page_cache = store_scraper.page_cache
+                outcome = watchdog.run(
+                    _scrape_url_worker, store_name, store_scraper.config, url, items_limit, resume, checkpoint_dir,
+                    scheduler_path, store_scraper.prune_dom, str(page_cache.path) if page_cache else None,
+                    page_cache.max_bytes / (1024 * 1024) if page_cache else 0, attempt == 1, description=url
+                )
+                store_scraper.metrics.merge(outcome["metrics"])
+                if page_cache:
+                    for name, value in outcome["page_cache"].items():
+                        page_cache.counts[name] += value
+                items, resumed, cached = outcome["items"], outcome["resumed"], outcome["cached"]
+            else:
+                items, resumed = _scrape_url(store_scraper, url, store_name, items_limit, resume, checkpoint_dir,
+                                             scheduler, breaker if attempt == 1 else None)
+                cached = bool(store_scraper.cached_steps)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            if not policy.should_retry(e, attempt):
+                breaker.record_failure(store_name, e, settings)
+                raise
+            delay = policy.delay(attempt)
+            logger.warning(f"Attempt {attempt}/{policy.max_attempts} for {url} failed ({e}); "
+                           f"retrying in {delay:.1f}s")
+            store_scraper.metrics.count("retries")
+            store_scraper.pause(delay, delay)
+            # Continue from the checkpoint if the failed attempt got far enough to write one
+            resume = resume or (checkpoint_path.exists() and checkpoint_path.stat().st_mtime >= started)
+            attempt += 1
+            continue
+        finally:
+            store_scraper.dedup_index = shared_index
+        if not cached:
+            breaker.record_success(store_name)
+        if staged is not None:
+            store = store_scraper.config.get("store")
+            added = staged.publish([f"{store}:{item['store_product_id']}" for item in items])
+            if not all(added):
+                # Emitted by a concurrent tab for another URL while this one was crawled
+                store_scraper.metrics.count("duplicates", added.count(False))
+                items = [item for item, new in zip(items, added) if new]
+        return items, resumed
+
+def _scrape_in_tabs(module, store_scraper, urls: List[str], store_name: str, items_limit: Optional[int],
+                    resume: bool, checkpoint_dir: str, scheduler_path: Optional[str], shared_browser,
+                    breaker: CircuitBreaker):
+    """
+    Crawl URLs concurrently in the tabs of a shared browser (see crawlers.multiplex).
+    Yields:
+        (url, callable returning the URL's _crawl_url result), in URL order
+    """
+    from crawlers.multiplex import Synchronized
+
+    launcher = module.get_scraper(shared_browser.launch_config(store_scraper.config))
+    with store_scraper.metrics.phase("driver_startup"):
+        shared_browser.start(launcher, concurrency=len(urls))
+    tile_index = Synchronized(store_scraper.tile_index) if store_scraper.tile_index else None
+    dedup_index = Synchronized(store_scraper.dedup_index)
+    tab_metrics: List[RunMetrics] = []
+
+    def scrape(url: str):
+        scraper = module.get_scraper(store_scraper.config)
+        scraper.tile_index = tile_index
+        scraper.dedup_index = dedup_index
+        scraper.driver_factory = shared_browser.open_tab
+        scraper.prune_dom = store_scraper.prune_dom
+        scraper.page_cache = store_scraper.page_cache
+        tab_metrics.append(scraper.metrics)
+        # SQLite connections and transactions are per session, so each tab gets its own scheduler
+        scheduler = None
+        if scheduler_path and scraper.config.get("rate_limit"):
+            scheduler = HostScheduler(scheduler_path)
+        try:
+            return _crawl_url(scraper, url, store_name, items_limit, resume, checkpoint_dir, scheduler, breaker)
+        finally:
+            if scheduler:
+                scheduler.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=shared_browser.tabs, thread_name_prefix="tab") as pool:
+            futures = [(url, pool.submit(scrape, url)) for url in urls]
+            for url, future in futures:
+                yield url, future.result
+    finally:
+        shared_browser.close()
+        for metrics in tab_metrics:
+            store_scraper.metrics.merge(metrics)
+
+def run_scraper(urls: List[str], store_name: str, items_limit: int = None,
+                tile_index: Optional[TileIndex] = None, resume: bool = False,
+                checkpoint_dir: str = "crawler_state/checkpoints", dedup_index=None,
+                scheduler_path: Optional[str] = "crawler_state/scheduler.db",
+                driver_factory=None, metrics: Optional[RunMetrics] = None,
+                prune_dom: Optional[bool] = None, shared_browser=None,
+                page_cache: Optional[PageCache] = None,
+                breaker: Optional[CircuitBreaker] = None,
+                watchdog: Optional[Watchdog] = None,
+                fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Run a store's scraper on URLs and return the results.
     Args:
         urls: List of URLs to scrape
         store_name: Name of the store (e.g., lululemon)
         items_limit: Maximum number of items to scrape (optional)
+        tile_index: Loaded tile index for incremental mode (optional). Only new and
+            changed items are returned, and the index is saved at the end of the run.
+        resume: Continue each URL from its last checkpoint, if one exists
+        checkpoint_dir: Directory for crawl checkpoints
+        dedup_index: Index of already emitted product IDs (optional). Defaults to an
+            in-memory index, so products shared by several URLs are returned once.
+        scheduler_path: Shared per-host scheduler state, used when the store has a rate_limit.
+            None disables rate limiting (e.g. for replays).
+        driver_factory: Replaces the browser, e.g. to record or replay sessions (optional)
+        metrics: Collects phase timings and counts for the run (optional)
+        prune_dom: Empty extracted tiles in the page to bound browser memory.
+            None uses the store's dom_pruning setting.
+        shared_browser: crawlers.multiplex.SharedBrowser to crawl the URLs concurrently
+            in tabs of one browser (optional). It is started and closed by the run.
+        page_cache: Serves fresh listings from stored snapshots and stores the
+            snapshots of live crawls (optional)
+        breaker: Per-store circuit breaker. Defaults to one kept in scheduler_path
+            (in memory when scheduler_path is None). Failed URLs are retried under the
+            store's "retry" policy either way.
+        watchdog: Crawl each URL in a supervised worker process that is killed, with its
+            browser, when it hangs (optional). Not available with tile_index, driver_factory
+            or shared_browser, which live in this process.
+        fields: Extract only these fields (and store_product_id); the selectors of other
+            fields never run (optional, see crawlers.extraction.project_config)
     Returns:
         List of extracted product information
     """
+    if watchdog and (tile_index or driver_factory or shared_browser):
+        raise ValueError("Isolated URL workers cannot be combined with incremental mode, "
+                         "a driver_factory or a shared browser")
+    if fields and tile_index and tile_index.hash_source == "fields":
+        raise ValueError("A field projection cannot be combined with a tile index that hashes extracted fields")
     logger.info(f"Starting scraper for store '{store_name}' with {len(urls)} URLs")
     
     store_scraper = None
     all_items = []
+    failed_urls = []
+    resumed = False
     
     try:
         # Dynamically import store-specific scraper and config
@@ -31,67 +296,77 @@ def run_scraper(urls: List[str], store_name: str, items_limit: int = None) -> Li
         # Initialize scraper
         logger.debug("Initializing store scraper...")
         store_scraper = module.get_scraper()
+        if fields:
+            # Tab sessions and isolated workers are created from this config, so they inherit the projection
+            store_scraper.config = project_config(store_scraper.config, fields)
+        store_scraper.tile_index = tile_index
+        store_scraper.dedup_index = dedup_index if dedup_index is not None else MemoryDedupIndex()
+        store_scraper.driver_factory = driver_factory
+        if metrics is not None:
+            store_scraper.metrics = metrics
+        if prune_dom is not None:
+            store_scraper.prune_dom = prune_dom
+        store_scraper.page_cache = page_cache
         logger.info(f"Successfully initialized scraper for store: {store_name}")
-        
+
+        # Circuit breakers are shared with all other workers, next to the host scheduler
+        own_breaker = breaker is None
+        if own_breaker:
+            breaker = CircuitBreaker(scheduler_path or ":memory:")
+
+        # Per-host rate limits and concurrency caps are shared with all other workers
+        scheduler = None
+        if shared_browser is None and watchdog is None and scheduler_path and store_scraper.config.get("rate_limit"):
+            scheduler = HostScheduler(scheduler_path)
+
+        if shared_browser is not None:
+            outcomes = _scrape_in_tabs(module, store_scraper, urls, store_name, items_limit, resume,
+                                       checkpoint_dir, scheduler_path, shared_browser, breaker)
+        else:
+            outcomes = ((url, functools.partial(_crawl_url, store_scraper, url, store_name, items_limit, resume,
+                                                checkpoint_dir, scheduler, breaker, watchdog, scheduler_path))
+                        for url in urls)
+
         # Process each URL
-        for url in urls:
+        for url, scrape in outcomes:
             try:
-                logger.info(f"Processing URL: {url}")
-                # Open the page
-                store_scraper.open_page(url)
-                #add debug for items_limit if there is one 
-                logger.debug(f"Items limit set to: {items_limit}")
-
-                # Extract items (pagination is handled within extract_items)
-                items = store_scraper.extract_items(items_limit=items_limit)
-                logger.info(f"Extracted {len(items)} items from URL: {url}")
+                items, url_resumed = scrape()
+                resumed = resumed or url_resumed
                 all_items.extend(items)
-                
+
+            except CircuitOpenError as e:
+                logger.warning(str(e))
+                failed_urls.append(url)
+                store_scraper.metrics.count("circuit_open")
+                continue
             except Exception as e:
                 logger.error(f"Error processing URL {url}: {str(e)}", exc_info=True)
+                failed_urls.append(url)
+                store_scraper.metrics.count("failed_urls")
+                logger.info(f"Progress for {url} is kept in its last checkpoint; rerun with --resume to continue")
                 continue
-                
-            finally:
-                if store_scraper:
-                    store_scraper.cleanup()
-        
+
+        if scheduler:
+            scheduler.close()
+        if own_breaker:
+            breaker.close()
+
+        if tile_index:
+            # Keep hashes for products we never reached so they are not re-extracted as new
+            # (or, when resuming, on pages extracted before the checkpoint)
+            tile_index.save(carry_over_missing=bool(failed_urls) or resumed)
+            logger.info(f"Incremental summary: {tile_index.summary()}")
+
         return all_items
         
     except Exception as e:
         logger.error(f"Fatal error running scraper: {str(e)}", exc_info=True)
         return []
 
-def save_results(items: List[Dict[str, Any]], store_name: str, output_dir: str = "crawler_output") -> str:
-    """
-    Save scraping results to a JSON file.
-    Args:
-        items: List of extracted items
-        store_name: Name of the store
-        output_dir: Directory to save results in
-    Returns:
-        Path to the saved file
-    """
-    # Create output directory if it doesn't exist
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
-    
-    # Generate filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = output_path / f"{store_name}_{timestamp}.json"
-    
-    # Save results
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump({
-            "metadata": {
-                "store": store_name,
-                "timestamp": timestamp,
-                "total_items": len(items)
-            },
-            "items": items
-        }, f, indent=2, ensure_ascii=False, default=str)
-        
-    logger.info(f"Results saved to {filename}")
-    return str(filename)
+def _load_store_config(store_name: str) -> Dict[str, Any]:
+    """Import and return a store's SCRAPER_CONFIG."""
+    module = importlib.import_module(f"crawlers.stores.{store_name}.scripts.config")
+    return module.SCRAPER_CONFIG
 
 def main():
     """Run a store's scraper locally and save results to JSON."""
@@ -100,24 +375,192 @@ def main():
     parser.add_argument('--urls', type=str, required=True, help='URLs to scrape (comma-separated)')
     parser.add_argument('--output', type=str, default='crawler_output', help='Output directory for results')
     parser.add_argument('--items-limit', type=int, help='Maximum number of items to scrape')
+    parser.add_argument('--fields', type=str,
+                        help='Extract only these fields, comma-separated (store_product_id is always included), '
+                             'e.g. price_current,price_original or product_metadata.rating')
+    parser.add_argument('--db', type=str, help='SQLite database to upsert results into (optional)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only extract tiles that changed since the previous run')
+    parser.add_argument('--state-dir', type=str, default='crawler_state',
+                        help='Directory for persisted crawl state (tile index, checkpoints)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue each URL from its last checkpoint')
+    parser.add_argument('--dedup', type=str, default='memory', choices=['memory', 'sqlite', 'bloom'],
+                        help='Dedup index: memory (within this run) or sqlite/bloom (also across runs)')
+    parser.add_argument('--dedup-path', type=str, help='File for the sqlite/bloom dedup index')
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument('--record', type=str, metavar='DIR',
+                           help='Record the browser sessions of this run into DIR')
+    recording.add_argument('--replay', type=str, metavar='DIR',
+                           help='Replay recorded sessions from DIR instead of opening a browser')
+    parser.add_argument('--page-cache', action='store_true',
+                        help='Serve fresh listings from cached page snapshots and cache the pages of live crawls')
+    parser.add_argument('--page-cache-max-mb', type=float, default=DEFAULT_MAX_MB,
+                        help=f'Size cap of the page cache; least recently used listings are evicted '
+                             f'(default: {DEFAULT_MAX_MB})')
+    parser.add_argument('--tabs', type=int, default=1, metavar='N',
+                        help='Crawl up to N URLs concurrently in tabs of one browser (default: 1)')
+    parser.add_argument('--isolate', action='store_true',
+                        help='Crawl each URL in a supervised worker process that is killed, with its browser, '
+                             'when it stops making progress')
+    parser.add_argument('--url-timeout', type=float, metavar='SECONDS',
+                        help='Kill a URL worker after this many seconds (implies --isolate)')
+    parser.add_argument('--heartbeat-timeout', type=float, default=DEFAULT_HEARTBEAT_SECONDS, metavar='SECONDS',
+                        help=f'Kill a URL worker that shows no progress for this long '
+                             f'(default: {DEFAULT_HEARTBEAT_SECONDS})')
+    parser.add_argument('--prune-dom', action='store_true',
+                        help='Empty extracted tiles in the page so memory stays bounded on long listings')
+    parser.add_argument('--enrich', action='store_true',
+                        help="Add fields from each product's detail page (needs the store's detail_page config)")
+    parser.add_argument('--download-images', type=str, nargs='?', const='crawler_output/images', metavar='DIR',
+                        help='Download item images into the content-addressed directory DIR')
+    parser.add_argument('--image-concurrency', type=int, default=4,
+                        help='Concurrent image downloads per host (default: 4)')
+    parser.add_argument('--metrics-file', type=str,
+                        help='Write run metrics to this Prometheus textfile (e.g. for node exporter)')
+    parser.add_argument('--profile', type=str, nargs='?', const='crawler_output/profiles', metavar='DIR',
+                        help='Profile the run (CPU, stack samples, memory, WebDriver time) into DIR')
     
     args = parser.parse_args()
+    if args.tabs > 1 and (args.record or args.replay):
+        parser.error("--tabs needs a live browser and cannot be combined with --record or --replay")
+    isolate = args.isolate or args.url_timeout is not None
+    if isolate and (args.tabs > 1 or args.record or args.replay or args.incremental):
+        parser.error("--isolate/--url-timeout cannot be combined with --tabs, --record, --replay or --incremental")
     
+    fields = None
+    if args.fields:
+        fields = [field.strip() for field in args.fields.split(',') if field.strip()]
+        # Enrichment and image downloads read these fields of every item
+        for needed, option in (("product_url", args.enrich), ("image_url", args.download_images)):
+            if option and needed not in fields:
+                fields.append(needed)
+        try:
+            project_config(_load_store_config(args.store), fields)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.incremental and _load_store_config(args.store).get("incremental", {}).get("hash_source") == "fields":
+            parser.error("--fields cannot be combined with --incremental when the store hashes extracted fields")
+    if args.enrich and not (_load_store_config(args.store).get("detail_page") or {}).get("selectors"):
+        parser.error(f"--enrich needs detail_page selectors in the {args.store} config (see config.md)")
+
     # Split URLs
     urls = [url.strip() for url in args.urls.split(',')]
     logger.info(f"Starting scraper with store: {args.store}, URLs: {urls}")
     
+    tile_index = None
+    extra_metadata = {}
+    if args.incremental:
+        hash_source = _load_store_config(args.store).get("incremental", {}).get("hash_source", "html")
+        tile_index = TileIndex(args.store, args.state_dir, hash_source)
+        tile_index.load()
+
+    dedup_path = args.dedup_path
+    if args.dedup != 'memory' and not dedup_path:
+        dedup_path = str(Path(args.state_dir) / ("dedup.db" if args.dedup == 'sqlite' else "dedup.bloom"))
+    dedup_index = create_dedup_index(args.dedup, dedup_path)
+
+    driver_factory = None
+    scheduler_path = str(Path(args.state_dir) / "scheduler.db")
+    clock = nullcontext()
+    # Record/replay and profiling load Selenium, so they are only imported when requested
+    if args.record:
+        from crawlers.replay import Cassette, recording_driver_factory
+        driver_factory = recording_driver_factory(Cassette(args.record, args.store))
+    elif args.replay:
+        from crawlers.replay import Cassette, VirtualClock, replay_driver_factory
+        # Replays touch no network: skip rate limits and sleep on a virtual clock
+        driver_factory = replay_driver_factory(Cassette.load(args.replay))
+        scheduler_path = None
+        clock = VirtualClock()
+
+    page_cache = None
+    if args.page_cache:
+        page_cache = PageCache(str(Path(args.state_dir) / "pages.db"), args.page_cache_max_mb)
+
+    shared_browser = None
+    if args.tabs > 1:
+        from crawlers.multiplex import SharedBrowser
+        shared_browser = SharedBrowser(args.tabs)
+
+    watchdog = Watchdog(args.url_timeout, args.heartbeat_timeout) if isolate else None
+
     # Run scraper
-    items = run_scraper(urls, args.store, args.items_limit)
-    
+    metrics = RunMetrics()
+    profiler = nullcontext()
+    if args.profile:
+        from crawlers.profiling import Profiler
+        profile_dir = Path(args.profile) / f"{args.store}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        profiler = Profiler(str(profile_dir), metrics)
+    with profiler, clock:
+        items = run_scraper(urls, args.store, args.items_limit, tile_index=tile_index, resume=args.resume,
+                            checkpoint_dir=str(Path(args.state_dir) / "checkpoints"), dedup_index=dedup_index,
+                            scheduler_path=scheduler_path, driver_factory=driver_factory, metrics=metrics,
+                            prune_dom=True if args.prune_dom else None, shared_browser=shared_browser,
+                            page_cache=page_cache, watchdog=watchdog, fields=fields)
+    if fields:
+        extra_metadata["fields"] = fields
+    if watchdog:
+        extra_metadata["watchdog"] = watchdog.summary()
+    if page_cache:
+        extra_metadata["page_cache"] = page_cache.summary()
+        page_cache.close()
+        print(f"\nPage cache: {extra_metadata['page_cache']}")
+    if shared_browser:
+        extra_metadata["multiplex"] = shared_browser.summary()
+        print(f"\nTab multiplexing: {extra_metadata['multiplex']}")
+    output_file = None
+    if items and (args.enrich or args.download_images):
+        # Save the crawl first, so a failing post-processing stage cannot lose it
+        output_file = save_results(items, args.store, args.output, extra_metadata)
+    if items and args.enrich:
+        try:
+            with metrics.phase("enrich"):
+                extra_metadata["enrichment"] = enrich_items(
+                    items, _load_store_config(args.store), str(Path(args.state_dir) / "details.db")
+                )
+            metrics.count("enriched",
+                          extra_metadata["enrichment"]["fetched"] + extra_metadata["enrichment"]["cached"])
+        except Exception as e:
+            logger.error(f"Detail enrichment failed: {e}", exc_info=True)
+            extra_metadata["enrichment"] = {"error": str(e)}
+    if items and args.download_images:
+        try:
+            with metrics.phase("images"):
+                extra_metadata["images"] = download_images(
+                    items, args.download_images, per_host=args.image_concurrency,
+                    base_url=_load_store_config(args.store).get("base_url")
+                )
+            metrics.count("images", extra_metadata["images"]["downloaded"])
+        except Exception as e:
+            logger.error(f"Image downloads failed: {e}", exc_info=True)
+            extra_metadata["images"] = {"error": str(e)}
+    extra_metadata["metrics"] = metrics.to_dict()
+    if args.profile:
+        print(f"\nProfile saved to: {profile_dir}")
+    if args.metrics_file:
+        metrics.write_prometheus(args.metrics_file, {"store": args.store})
+
+    if tile_index:
+        extra_metadata["incremental"] = tile_index.summary()
+        print(f"\nIncremental summary: {extra_metadata['incremental']}")
+
     # Save results
     if items:
-        output_file = save_results(items, args.store, args.output)
+        output_file = save_results(items, args.store, args.output, extra_metadata, filename=output_file)
+        if args.db:
+            save_results_sqlite(items, args.store, args.db, fields)
         print(f"\nScraping completed successfully!")
         print(f"Total items extracted: {len(items)}")
         print(f"Results saved to: {output_file}")
+        if args.db:
+            print(f"Results upserted into: {args.db}")
     else:
         print("\nNo items were extracted or an error occurred.")
 
+    # Only persist seen IDs once the results they belong to are saved
+    dedup_index.commit()
+    dedup_index.close()
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
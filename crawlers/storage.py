@@ -0,0 +1,232 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Optional, Set
+
+from utils.logger import logger
+
+# Columns stored directly on the products table, in insert order
+PRODUCT_COLUMNS = [
+    "store",
+    "store_product_id",
+    "brand",
+    "name",
+    "product_url",
+    "image_url",
+    "price_current",
+    "price_original",
+    "price_min",
+    "price_max",
+    "product_metadata",
+    "product_details",
+]
+
+# Columns added after the first schema version, created on open if missing
+ADDED_COLUMNS = {
+    "product_details": "TEXT",
+}
+
+# Columns only some runs fill (e.g. detail enrichment); a run without them keeps the stored value
+KEEP_IF_NULL = {"product_details"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    store TEXT NOT NULL,
+    store_product_id TEXT NOT NULL,
+    brand TEXT,
+    name TEXT,
+    product_url TEXT,
+    image_url TEXT,
+    price_current TEXT,
+    price_original TEXT,
+    price_min TEXT,
+    price_max TEXT,
+    product_metadata TEXT,
+    product_details TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (store, store_product_id)
+);
+
+CREATE TABLE IF NOT EXISTS price_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    store TEXT NOT NULL,
+    store_product_id TEXT NOT NULL,
+    price_current TEXT,
+    price_original TEXT,
+    recorded_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_products_store ON products (store, last_seen);
+CREATE INDEX IF NOT EXISTS idx_products_brand ON products (brand, store);
+CREATE INDEX IF NOT EXISTS idx_price_history_product
+    ON price_history (store, store_product_id, recorded_at);
+
+-- Price history is maintained by triggers so it is only written when a price
+-- is first seen or actually changes, without a read-before-write per item.
+CREATE TRIGGER IF NOT EXISTS trg_products_price_insert
+AFTER INSERT ON products
+BEGIN
+    INSERT INTO price_history (store, store_product_id, price_current, price_original, recorded_at)
+    VALUES (NEW.store, NEW.store_product_id, NEW.price_current, NEW.price_original, NEW.last_seen);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_products_price_update
+AFTER UPDATE OF price_current, price_original ON products
+WHEN OLD.price_current IS NOT NEW.price_current OR OLD.price_original IS NOT NEW.price_original
+BEGIN
+    INSERT INTO price_history (store, store_product_id, price_current, price_original, recorded_at)
+    VALUES (NEW.store, NEW.store_product_id, NEW.price_current, NEW.price_original, NEW.last_seen);
+END;
+"""
+
+def _update_expr(col: str, keep_if_null: Set[str], merge_json: Set[str]) -> str:
+    if col in merge_json:
+        return (f"{col} = CASE WHEN excluded.{col} IS NULL THEN products.{col} "
+                f"ELSE json_patch(COALESCE(products.{col}, '{{}}'), excluded.{col}) END")
+    if col in keep_if_null:
+        return f"{col} = COALESCE(excluded.{col}, products.{col})"
+    return f"{col} = excluded.{col}"
+
+
+def upsert_sql(keep_if_null: Set[str], merge_json: Set[str] = frozenset()) -> str:
+    """
+    Build the products upsert; columns in keep_if_null keep their stored value when the item
+    has none, and the JSON objects in merge_json columns are merged into the stored ones.
+    """
+    return f"""
+INSERT INTO products ({", ".join(PRODUCT_COLUMNS)}, first_seen, last_seen)
+VALUES ({", ".join("?" for _ in PRODUCT_COLUMNS)}, ?, ?)
+ON CONFLICT (store, store_product_id) DO UPDATE SET
+    {", ".join(_update_expr(col, keep_if_null, merge_json) for col in PRODUCT_COLUMNS[2:])},
+    last_seen = excluded.last_seen
+"""
+
+
+UPSERT_SQL = upsert_sql(KEEP_IF_NULL)
+
+
+class SQLiteResultStore:
+    """Local SQLite sink for scraped items with upserts and price history."""
+
+    def __init__(self, db_path: str = "crawler_output/products.db", batch_size: int = 1000):
+        """
+        Open (and create if needed) the result database.
+        Args:
+            db_path: Path to the SQLite database file
+            batch_size: Number of items written per transaction
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(str(self.db_path))
+        # WAL keeps readers unblocked while a run is writing
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._add_missing_columns()
+        logger.debug(f"Opened result store at {self.db_path}")
+
+    def _add_missing_columns(self) -> None:
+        """Bring databases created by older versions up to the current products schema."""
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(products)")}
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE products ADD COLUMN {column} {column_type}")
+                logger.info(f"Added column {column} to {self.db_path}")
+        self.conn.commit()
+
+    def _to_row(self, item: Dict[str, Any], store_name: str, seen_at: str) -> Optional[tuple]:
+        """Convert an extracted item to a products row, or None if it has no ID."""
+        product_id = item.get("store_product_id")
+        if not product_id:
+            return None
+
+        row = []
+        for column in PRODUCT_COLUMNS:
+            if column == "store":
+                value = item.get("store") or store_name
+            elif column in ("product_metadata", "product_details"):
+                metadata = item.get(column)
+                if metadata is None or isinstance(metadata, str):
+                    value = metadata
+                else:
+                    value = json.dumps(metadata, ensure_ascii=False, sort_keys=True, default=str)
+            else:
+                value = item.get(column)
+                if value is not None and not isinstance(value, str):
+                    value = str(value)
+            row.append(value)
+        return tuple(row) + (seen_at, seen_at)
+
+    def upsert_items(self, items: Iterable[Dict[str, Any]], store_name: str,
+                     fields: Optional[Iterable[str]] = None) -> int:
+        """
+        Insert or update items, keyed on (store, store_product_id).
+        Args:
+            items: Extracted items
+            store_name: Store name used when an item has no 'store' field
+            fields: Fields the items were projected to (run_scraper --fields). Stored values
+                of the other columns are kept, and product_metadata.<name> sub-fields are merged
+                into the stored product_metadata. None for complete items.
+        Returns:
+            Number of rows written
+        """
+        sql = UPSERT_SQL
+        if fields is not None:
+            fields = list(fields)
+            projected = {field.split(".")[0] for field in fields}
+            # Only some metadata sub-fields were extracted: patch them into the stored object
+            merged = {field.split(".")[0] for field in fields if "." in field} - set(fields)
+            sql = upsert_sql(KEEP_IF_NULL | {col for col in PRODUCT_COLUMNS[2:] if col not in projected}, merged)
+        seen_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        written = 0
+        skipped = 0
+        batch = []
+
+        for item in items:
+            row = self._to_row(item, store_name, seen_at)
+            if row is None:
+                skipped += 1
+                continue
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                written += self._write_batch(batch, sql)
+                batch = []
+
+        if batch:
+            written += self._write_batch(batch, sql)
+
+        if skipped:
+            logger.warning(f"Skipped {skipped} items without store_product_id")
+        logger.info(f"Upserted {written} items into {self.db_path}")
+        return written
+
+    def _write_batch(self, rows: List[tuple], sql: str = UPSERT_SQL) -> int:
+        """Write one batch of rows inside a single transaction."""
+        with self.conn:
+            self.conn.executemany(sql, rows)
+        return len(rows)
+
+    def price_history(self, store_name: str, store_product_id: str) -> List[Dict[str, Any]]:
+        """Return the recorded price changes for a product, oldest first."""
+        cursor = self.conn.execute(
+            "SELECT price_current, price_original, recorded_at FROM price_history "
+            "WHERE store = ? AND store_product_id = ? ORDER BY recorded_at, id",
+            (store_name, store_product_id),
+        )
+        return [
+            {"price_current": row[0], "price_original": row[1], "recorded_at": row[2]}
+            for row in cursor.fetchall()
+        ]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
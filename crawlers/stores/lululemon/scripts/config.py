@@ -1,11 +1,17 @@
 SCRAPER_CONFIG = {
     "store": "lululemon",
     "brand": "lululemon",
+    "base_url": "https://shop.lululemon.com",
     "use_scraping_browser": False,
     "browser_config": {
         "headless": False,
         "window_size": [1920, 1080]
     },
+    "rate_limit": {
+        "requests_per_minute": 30,
+        "burst": 3,
+        "max_concurrency": 2
+    },
     "popup_handlers": [
         {
             "type": "close_button",
@@ -13,6 +19,28 @@ SCRAPER_CONFIG = {
             "wait_time": 5  # Maximum seconds to wait for popup
         }
     ],
+    # Product pages for run_scraper --enrich; the page's own head metadata, which is stable across redesigns
+    "detail_page": {
+        "selectors": {
+            "title": {
+                "method": "select_one",
+                "pattern": "h1",
+                "text": True
+            },
+            "description": {
+                "method": "select_one",
+                "pattern": "meta[name='description']",
+                "attribute": "content"
+            },
+            "image_url": {
+                "method": "select_one",
+                "pattern": "meta[property='og:image']",
+                "attribute": "content"
+            }
+        },
+        "ttl_hours": 24,
+        "concurrency": 2
+    },
     "lazy_loading_type": "button",
     "scroll_behavior": {
         "human_like": True,
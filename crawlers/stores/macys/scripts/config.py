@@ -1,11 +1,17 @@
 SCRAPER_CONFIG = {
     "store": "macys",
     "brand": "macys",
+    "base_url": "https://www.macys.com",
     "use_scraping_browser": False,
     "browser_config": {
         "headless": False,
         "window_size": [1920, 1080]
     },
+    "rate_limit": {
+        "requests_per_minute": 20,
+        "burst": 3,
+        "max_concurrency": 2
+    },
     "popup_handlers": [
         {
             "type": "close_button",
@@ -14,12 +20,18 @@ SCRAPER_CONFIG = {
         }
     ],
     "lazy_loading_type": "pagination",
+    # Product hrefs carry &swatchColor=..., so key products on the ID parameter
+    "id_normalizer": {
+        "type": "query_param",
+        "param": "ID"
+    },
     "scroll_behavior": {
         "human_like": True,
         "replace_data_on_scroll": False,
     },
     "pagination": {
         "type": "next_button",
+        "popup_check_wait": 3,
         "selectors": {
             "next_button": {
                 "pattern": "#canvas > div.pagination.pagination-wrapper > nav > ul.pagination > li:nth-child(3)"
@@ -1,11 +1,26 @@
 SCRAPER_CONFIG = {
     "store": "nordstrom",
     "brand": None,  # Since Nordstrom sells multiple brands
+    "base_url": "https://www.nordstrom.com",
     "use_scraping_browser": False,
     "browser_config": {
         "headless": False,
         "window_size": [1920, 1080]
     },
+    "rate_limit": {
+        "requests_per_minute": 12,
+        "burst": 3,
+        "max_concurrency": 1
+    },
+    "retry": {
+        # Homepage warm-up: a fresh tab per attempt, the header element must be present
+        "homepage": {
+            "max_attempts": 5,
+            "backoff_base": 2.0,
+            "backoff_max": 30.0,
+            "retry_on": ["BlockedError", "WebDriverException"]
+        }
+    },
     "popup_handlers": [
         {
             "type": "close_button",
@@ -14,6 +29,10 @@ SCRAPER_CONFIG = {
         }
     ],
     "lazy_loading_type": "scroll",
+    # Drop origin/breadcrumb/color query parameters from product hrefs
+    "id_normalizer": {
+        "type": "strip_query"
+    },
     "scroll_behavior": {
         "human_like": True,
         "replace_data_on_scroll": False,
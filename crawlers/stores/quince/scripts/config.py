@@ -1,11 +1,17 @@
 SCRAPER_CONFIG = {
     "store": "quince",
     "brand": "Quince",
+    "base_url": "https://www.quince.com",
     "use_scraping_browser": False,
     "browser_config": {
         "headless": False,
         "window_size": [1920, 1080]
     },
+    "rate_limit": {
+        "requests_per_minute": 30,
+        "burst": 3,
+        "max_concurrency": 2
+    },
     "popup_handlers": [
         {
             "type": "close_button",
@@ -14,10 +20,17 @@ SCRAPER_CONFIG = {
         }
     ],
     "lazy_loading_type": "scroll",
+    "id_normalizer": {
+        "type": "strip_query"
+    },
     "scroll_behavior": {
         "human_like": True,
         "replace_data_on_scroll": False,
     },
+    "pagination": {
+        "type": "infinite_scroll",
+        "max_idle_scrolls": 2
+    },
     "selectors": {
         "product_item": ".product-card-module--productCard--340e0",
         "store": None,
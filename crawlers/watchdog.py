@@ -0,0 +1,141 @@
+"""
+Supervised worker processes with hard timeouts (run_scraper --url-timeout, run_batch work --job-timeout).
+
+A Selenium call can hang far beyond any WebDriverWait: a page_source that never
+returns, a dead chromedriver, an endless page load. Watchdog.run calls a
+function in a child process and kills the child when it runs past its wall-clock
+budget or stops sending heartbeats. The child leads its own process group, so
+the kill also takes down the chromedriver and Chrome processes it started.
+
+Scrapers send heartbeats as they make progress (page loads, pagination actions,
+extraction steps, deliberate sleeps and rate limit waits) by calling
+heartbeat(), which does nothing outside a supervised process.
+"""
+import multiprocessing
+import os
+import pickle
+import signal
+import time
+from typing import Any, Callable, Optional
+
+from utils.logger import logger
+
+DEFAULT_HEARTBEAT_SECONDS = 180
+
+# Shared timestamp of the last heartbeat, set in supervised child processes
+_heartbeat = None
+
+
+class WatchdogTimeout(TimeoutError):
+    """Raised when a supervised call ran past its budget or stopped sending heartbeats."""
+
+
+class WorkerCrashed(RuntimeError):
+    """Raised when a supervised worker process died without returning a result."""
+
+
+def heartbeat() -> None:
+    """Signal that the supervised call is making progress."""
+    if _heartbeat is not None:
+        _heartbeat.value = time.time()
+
+
+def _worker(func: Callable, args: tuple, kwargs: dict, conn, beat) -> None:
+    """Entry point of the child process: call func and send back its result or error."""
+    global _heartbeat
+    if hasattr(os, "setsid"):
+        # Lead a new process group so the browser processes can be killed with us
+        os.setsid()
+    _heartbeat = beat
+    heartbeat()
+    try:
+        outcome = (True, func(*args, **kwargs))
+    except Exception as e:
+        try:
+            pickle.loads(pickle.dumps(e))
+            outcome = (False, e)
+        except Exception:
+            outcome = (False, RuntimeError(f"{type(e).__name__}: {e}"))
+    conn.send(outcome)
+    conn.close()
+
+
+class Watchdog:
+    """Runs calls in supervised child processes with a wall-clock budget and a heartbeat timeout."""
+
+    def __init__(self, budget_seconds: Optional[float] = None,
+                 heartbeat_seconds: Optional[float] = DEFAULT_HEARTBEAT_SECONDS, poll_interval: float = 1.0):
+        """
+        Args:
+            budget_seconds: Wall-clock limit per call (None for no limit)
+            heartbeat_seconds: Kill the call if it sends no heartbeat for this long (None to disable)
+            poll_interval: Seconds between checks of the child
+        """
+        self.budget_seconds = budget_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_interval = poll_interval
+        self.counts = {"calls": 0, "timeouts": 0, "crashes": 0}
+
+    def run(self, func: Callable, *args, description: str = "call", **kwargs) -> Any:
+        """
+        Call func(*args, **kwargs) in a child process and return its result.
+        func, its arguments and its result must be picklable (func defined at module level).
+        Args:
+            func: Function to call
+            description: What is being run, for errors and the log
+        Returns:
+            The function's result; an exception raised by it is re-raised here
+        """
+        # spawn, not fork: the parent may have threads (tab sessions, lease renewal) holding locks
+        context = multiprocessing.get_context("spawn")
+        beat = context.Value("d", time.time(), lock=False)
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_worker, args=(func, args, kwargs, sender, beat),
+                                  name=f"watchdog-{description}", daemon=True)
+        self.counts["calls"] += 1
+        started = time.monotonic()
+        process.start()
+        sender.close()
+        try:
+            while not receiver.poll(self.poll_interval):
+                if not process.is_alive() and not receiver.poll(0):
+                    self.counts["crashes"] += 1
+                    raise WorkerCrashed(f"Worker for {description} exited with code {process.exitcode}")
+                elapsed = time.monotonic() - started
+                silent = time.time() - beat.value
+                if self.budget_seconds and elapsed > self.budget_seconds:
+                    reason = f"ran past its {self.budget_seconds:.0f}s budget"
+                elif self.heartbeat_seconds and silent > self.heartbeat_seconds:
+                    reason = f"sent no heartbeat for {silent:.0f}s"
+                else:
+                    continue
+                self.counts["timeouts"] += 1
+                logger.error(f"Killing worker {process.pid}: {description} {reason}")
+                raise WatchdogTimeout(f"{description} {reason}")
+            try:
+                ok, value = receiver.recv()
+            except EOFError:
+                self.counts["crashes"] += 1
+                raise WorkerCrashed(f"Worker for {description} exited with code {process.exitcode}")
+        finally:
+            self._kill(process)
+            receiver.close()
+        if ok:
+            return value
+        raise value
+
+    @staticmethod
+    def _kill(process) -> None:
+        """Kill the worker's process group, including browsers left behind, and reap the worker."""
+        if hasattr(os, "killpg"):
+            try:
+                # Before join: the unreaped worker keeps its pid, so the group id cannot be reused yet
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        if process.is_alive():
+            process.kill()
+        process.join(timeout=10)
+
+    def summary(self) -> dict:
+        return dict(self.counts)
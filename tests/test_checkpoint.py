@@ -0,0 +1,117 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from crawlers.checkpoint import CheckpointManager
+
+URL = "https://www.macys.com/shop/all"
+
+
+def page_items(page: int, size: int = 3) -> list:
+    return [{"store_product_id": f"{page}-{i}"} for i in range(size)]
+
+
+class CheckpointManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def crawl(self, checkpoint: CheckpointManager, pages, seen=None, items=None):
+        """Save a checkpoint after each page like a crawl does, returning the accumulated state."""
+        seen = set(seen or [])
+        items = list(items or [])
+        for page in pages:
+            items.extend(page_items(page))
+            seen.update(item["store_product_id"] for item in page_items(page))
+            checkpoint.save(f"{URL}?page={page + 1}", page, seen, items)
+        return seen, items
+
+    def test_no_checkpoint(self):
+        self.assertIsNone(CheckpointManager("macys", URL, self.dir).load())
+
+    def test_resume_returns_position_and_items(self):
+        seen, items = self.crawl(CheckpointManager("macys", URL, self.dir), [1, 2, 3])
+
+        state = CheckpointManager("macys", URL, self.dir).load()
+        self.assertEqual(state["page_index"], 3)
+        self.assertEqual(state["current_url"], f"{URL}?page=4")
+        self.assertEqual(state["items"], items)
+        self.assertEqual(set(state["seen_product_ids"]), seen)
+
+    def test_each_save_appends_only_new_items(self):
+        checkpoint = CheckpointManager("macys", URL, self.dir)
+        self.crawl(checkpoint, [1, 2, 3])
+
+        lines = checkpoint.log_path.read_text().splitlines()
+        self.assertEqual([len(json.loads(line)["items"]) for line in lines], [3, 3, 3])
+
+    def test_resumed_crawl_continues_the_log(self):
+        self.crawl(CheckpointManager("macys", URL, self.dir), [1, 2])
+        checkpoint = CheckpointManager("macys", URL, self.dir)
+        state = checkpoint.load()
+        self.crawl(checkpoint, [3], state["seen_product_ids"], state["items"])
+
+        state = CheckpointManager("macys", URL, self.dir).load()
+        self.assertEqual(state["page_index"], 3)
+        self.assertEqual(len(state["items"]), 9)
+        self.assertEqual(len(checkpoint.log_path.read_text().splitlines()), 3)
+
+    def test_partial_line_from_a_crash_is_ignored_and_overwritten(self):
+        checkpoint = CheckpointManager("macys", URL, self.dir)
+        _, items = self.crawl(checkpoint, [1])
+        with open(checkpoint.log_path, "ab") as f:
+            f.write(b'{"seen_product_ids": ["2-0"')
+
+        checkpoint = CheckpointManager("macys", URL, self.dir)
+        state = checkpoint.load()
+        self.assertEqual(state["items"], items)
+        self.crawl(checkpoint, [2], state["seen_product_ids"], state["items"])
+        self.assertEqual(len(CheckpointManager("macys", URL, self.dir).load()["items"]), 6)
+
+    def test_fresh_crawl_starts_a_new_log(self):
+        self.crawl(CheckpointManager("macys", URL, self.dir), [1, 2])
+        self.crawl(CheckpointManager("macys", URL, self.dir), [1])
+
+        self.assertEqual(len(CheckpointManager("macys", URL, self.dir).load()["items"]), 3)
+
+    def test_truncated_log_is_ignored(self):
+        checkpoint = CheckpointManager("macys", URL, self.dir)
+        self.crawl(checkpoint, [1, 2])
+        checkpoint.log_path.write_bytes(checkpoint.log_path.read_bytes()[:10])
+
+        self.assertIsNone(CheckpointManager("macys", URL, self.dir).load())
+
+    def test_maybe_save_honours_interval(self):
+        checkpoint = CheckpointManager("macys", URL, self.dir, every_pages=2)
+        checkpoint.maybe_save(URL, 1, [], [])
+        self.assertFalse(checkpoint.path.exists())
+        checkpoint.maybe_save(URL, 2, [], [])
+        self.assertTrue(checkpoint.path.exists())
+
+    def test_clear_removes_both_files(self):
+        checkpoint = CheckpointManager("macys", URL, self.dir)
+        self.crawl(checkpoint, [1])
+        checkpoint.clear()
+
+        self.assertEqual(list(Path(self.dir).iterdir()), [])
+        self.assertIsNone(CheckpointManager("macys", URL, self.dir).load())
+
+    def test_loads_checkpoints_with_inline_items(self):
+        checkpoint = CheckpointManager("macys", URL, self.dir)
+        Path(checkpoint.path).write_text(json.dumps({
+            "store": "macys", "start_url": URL, "current_url": URL, "page_index": 1,
+            "seen_product_ids": ["1-0"], "items": [{"store_product_id": "1-0"}],
+        }))
+
+        state = checkpoint.load()
+        self.assertEqual(len(state["items"]), 1)
+        self.crawl(checkpoint, [2], state["seen_product_ids"], state["items"])
+        self.assertEqual(len(CheckpointManager("macys", URL, self.dir).load()["items"]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
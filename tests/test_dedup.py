@@ -0,0 +1,141 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from crawlers.dedup import (
+    BloomDedupIndex,
+    MemoryDedupIndex,
+    SQLiteDedupIndex,
+    StagedDedupIndex,
+    create_dedup_index,
+    normalize_product_id,
+)
+
+
+class NormalizeProductIdTest(unittest.TestCase):
+    def test_query_param(self):
+        rule = {"type": "query_param", "param": "ID"}
+
+        self.assertEqual(normalize_product_id("/shop/product/shirt?ID=16043324&swatchColor=Blue", rule), "16043324")
+        self.assertEqual(normalize_product_id("/shop/product/shirt", rule), "/shop/product/shirt")
+
+    def test_strip_query_drops_tracking_and_fragment(self):
+        rule = {"type": "strip_query"}
+
+        self.assertEqual(normalize_product_id("/s/shirt/7291937?color=BLUE&breadcrumb=Home#reviews", rule),
+                         "/s/shirt/7291937")
+
+    def test_strip_query_keeps_listed_params(self):
+        rule = {"type": "strip_query", "keep_params": ["sku"]}
+
+        self.assertEqual(normalize_product_id("https://quince.com/p?utm_source=x&sku=42", rule),
+                         "https://quince.com/p?sku=42")
+
+    def test_regex(self):
+        rule = {"type": "regex", "pattern": r"/prod(\d+)"}
+
+        self.assertEqual(normalize_product_id("/p/define-jacket/prod10550089?color=0001", rule), "10550089")
+        self.assertEqual(normalize_product_id("/p/define-jacket", rule), "/p/define-jacket")
+
+    def test_without_rule_or_id(self):
+        self.assertEqual(normalize_product_id("/p/1?a=b", None), "/p/1?a=b")
+        self.assertIsNone(normalize_product_id(None, {"type": "strip_query"}))
+
+    def test_unknown_rule_keeps_raw_id(self):
+        self.assertEqual(normalize_product_id("/p/1", {"type": "base64"}), "/p/1")
+
+
+class DedupIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name: str) -> str:
+        return str(Path(self.tmp.name) / name)
+
+    def test_memory_index(self):
+        index = MemoryDedupIndex()
+
+        self.assertTrue(index.add("macys:1"))
+        self.assertFalse(index.add("macys:1"))
+        self.assertIn("macys:1", index)
+        self.assertEqual(len(index), 1)
+
+    def test_sqlite_index_persists_committed_keys(self):
+        index = SQLiteDedupIndex(self.path("dedup.db"))
+        self.assertTrue(index.add("macys:1"))
+        self.assertFalse(index.add("macys:1"))
+        index.commit()
+        index.close()
+
+        index = SQLiteDedupIndex(self.path("dedup.db"))
+        self.assertIn("macys:1", index)
+        self.assertFalse(index.add("macys:1"))
+        index.close()
+
+    def test_sqlite_index_drops_uncommitted_keys(self):
+        index = SQLiteDedupIndex(self.path("dedup.db"))
+        index.add("macys:1")
+        index.close()
+
+        index = SQLiteDedupIndex(self.path("dedup.db"))
+        self.assertNotIn("macys:1", index)
+        self.assertEqual(len(index), 0)
+        index.close()
+
+    def test_bloom_index_has_no_false_negatives(self):
+        index = BloomDedupIndex(None, capacity=1000, error_rate=0.01)
+        keys = [f"nordstrom:{i}" for i in range(1000)]
+
+        for key in keys[:500]:
+            index.add(key)
+        self.assertTrue(all(key in index for key in keys[:500]))
+        self.assertFalse(any(index.add(key) for key in keys[:500]))
+        false_positives = sum(key in index for key in keys[500:])
+        self.assertLess(false_positives, 25)
+
+    def test_bloom_index_persists_on_commit(self):
+        index = BloomDedupIndex(self.path("dedup.bloom"), capacity=1000)
+        index.add("quince:1")
+        index.commit()
+
+        reloaded = BloomDedupIndex(self.path("dedup.bloom"), capacity=1000)
+        self.assertIn("quince:1", reloaded)
+        self.assertFalse(reloaded.add("quince:1"))
+
+    def test_bloom_index_with_other_size_starts_empty(self):
+        index = BloomDedupIndex(self.path("dedup.bloom"), capacity=1000)
+        index.add("quince:1")
+        index.commit()
+
+        self.assertNotIn("quince:1", BloomDedupIndex(self.path("dedup.bloom"), capacity=100_000))
+
+    def test_staged_index_publishes_only_returned_keys(self):
+        shared = MemoryDedupIndex()
+        shared.add("macys:0")
+        staged = StagedDedupIndex(shared)
+
+        self.assertFalse(staged.add("macys:0"))
+        self.assertTrue(staged.add("macys:1"))
+        self.assertFalse(staged.add("macys:1"))
+        self.assertNotIn("macys:1", shared)
+
+        shared.add("macys:2")
+        self.assertEqual(staged.publish(["macys:1", "macys:2"]), [True, False])
+        self.assertIn("macys:1", shared)
+
+    def test_create_dedup_index(self):
+        self.assertIsInstance(create_dedup_index("memory"), MemoryDedupIndex)
+        index = create_dedup_index("sqlite", self.path("dedup.db"))
+        self.assertIsInstance(index, SQLiteDedupIndex)
+        index.close()
+        self.assertIsInstance(create_dedup_index("bloom", self.path("dedup.bloom"), capacity=10),
+                              BloomDedupIndex)
+        with self.assertRaises(ValueError):
+            create_dedup_index("redis")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from crawlers.job_queue import JobQueue
+
+
+def make_spec(store: str = "macys", **extra) -> dict:
+    return {"store": store, "urls": [f"https://www.{store}.com/shop/all"], **extra}
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(str(Path(self.tmp.name) / "jobs.db"))
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp.cleanup()
+
+    def status(self, job_id: int) -> dict:
+        return next(job for job in self.queue.jobs() if job["id"] == job_id)
+
+    def test_enqueue_rejects_incomplete_spec(self):
+        with self.assertRaises(ValueError):
+            self.queue.enqueue({"store": "macys"})
+
+    def test_duplicate_job_key_is_ignored(self):
+        self.assertIsNotNone(self.queue.enqueue(make_spec(job_key="a")))
+        self.assertIsNone(self.queue.enqueue(make_spec(job_key="a")))
+
+    def test_claim_leases_oldest_job_to_one_worker(self):
+        first = self.queue.enqueue(make_spec())
+        second = self.queue.enqueue(make_spec())
+
+        job = self.queue.claim("w1")
+        self.assertEqual(job["id"], first)
+        self.assertEqual(job["attempts"], 1)
+        self.assertEqual(job["spec"]["store"], "macys")
+        self.assertEqual(self.queue.claim("w2")["id"], second)
+        self.assertIsNone(self.queue.claim("w3"))
+
+    def test_claim_skips_excluded_stores(self):
+        self.queue.enqueue(make_spec("macys"))
+        nordstrom = self.queue.enqueue(make_spec("nordstrom"))
+
+        self.assertEqual(self.queue.claim("w1", exclude_stores=["macys"])["id"], nordstrom)
+        self.assertEqual(self.queue.queued_stores(), ["macys"])
+
+    def test_heartbeat_only_extends_own_lease(self):
+        job_id = self.queue.enqueue(make_spec())
+        self.queue.claim("w1")
+
+        self.assertTrue(self.queue.heartbeat(job_id, "w1"))
+        self.assertFalse(self.queue.heartbeat(job_id, "w2"))
+
+    def test_expired_lease_is_requeued(self):
+        job_id = self.queue.enqueue(make_spec())
+        self.queue.claim("w1", lease_seconds=-1)
+
+        job = self.queue.claim("w2")
+        self.assertEqual(job["id"], job_id)
+        self.assertEqual(job["attempts"], 2)
+        # The crashed worker lost its lease
+        self.assertFalse(self.queue.heartbeat(job_id, "w1"))
+
+    def test_requeued_job_has_no_finish_time(self):
+        job_id = self.queue.enqueue(make_spec())
+        self.queue.claim("w1", lease_seconds=-1)
+        # Expired leases are requeued on the next claim, even one that takes nothing
+        self.assertIsNone(self.queue.claim("w2", exclude_stores=["macys"]))
+
+        row = self.queue.conn.execute("SELECT status, finished_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        self.assertEqual(row["status"], "queued")
+        self.assertIsNone(row["finished_at"])
+
+    def test_expired_lease_fails_job_out_of_attempts(self):
+        job_id = self.queue.enqueue(make_spec(), max_attempts=1)
+        self.queue.claim("w1", lease_seconds=-1)
+
+        self.assertIsNone(self.queue.claim("w2"))
+        self.assertEqual(self.status(job_id)["status"], "failed")
+        self.assertIn("lease expired", self.status(job_id)["error"])
+
+    def test_fail_retries_until_max_attempts(self):
+        job_id = self.queue.enqueue(make_spec(), max_attempts=2)
+
+        self.queue.fail(self.queue.claim("w1")["id"], "w1", "blocked")
+        self.assertEqual(self.status(job_id)["status"], "queued")
+
+        job = self.queue.claim("w1")
+        self.assertEqual(job["attempts"], 2)
+        self.queue.fail(job["id"], "w1", "blocked again")
+        self.assertEqual(self.status(job_id)["status"], "failed")
+        self.assertEqual(self.status(job_id)["error"], "blocked again")
+        self.assertIsNone(self.queue.claim("w1"))
+
+    def test_complete_records_items(self):
+        job_id = self.queue.enqueue(make_spec())
+        self.queue.claim("w1")
+        self.queue.complete(job_id, "w1", items=42, output_file="out.json")
+
+        self.assertEqual(self.status(job_id)["status"], "done")
+        stats = self.queue.stats()
+        self.assertEqual(stats["counts"], {"done": 1})
+        self.assertEqual(stats["items"], 42)
+
+    def test_enqueue_file_skips_invalid_lines(self):
+        path = Path(self.tmp.name) / "jobs.jsonl"
+        path.write_text('{"store": "macys", "urls": ["u"]}\n# comment\n{"store": "macys"}\nnot json\n')
+
+        self.assertEqual(self.queue.enqueue_file(str(path)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
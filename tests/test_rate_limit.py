@@ -0,0 +1,118 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from crawlers.rate_limit import DEFAULT_LIMITS, HostScheduler, host_of
+
+HOST = "www.macys.com"
+
+
+class HostSchedulerTest(unittest.TestCase):
+    LIMITS = {**DEFAULT_LIMITS, "requests_per_minute": 60, "burst": 2, "max_concurrency": 1,
+              "backoff_base": 30, "backoff_max": 100}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scheduler = HostScheduler(str(Path(self.tmp.name) / "scheduler.db"))
+        self.now = 1_000_000.0
+        self.slept = []
+        # Virtual time: sleeping advances the clock instead of blocking
+        for target, replacement in (("time", lambda: self.now), ("sleep", self.sleep), ("monotonic", lambda: self.now)):
+            patcher = mock.patch(f"crawlers.rate_limit.time.{target}", replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.scheduler.close()
+        self.tmp.cleanup()
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+    def test_host_of(self):
+        self.assertEqual(host_of("https://WWW.Macys.com/shop/x?id=1"), HOST)
+
+    def test_limits_for_merges_store_config(self):
+        limits = HostScheduler.limits_for({"rate_limit": {"requests_per_minute": 10}})
+
+        self.assertEqual(limits["requests_per_minute"], 10)
+        self.assertEqual(limits["burst"], DEFAULT_LIMITS["burst"])
+
+    def test_burst_is_served_without_waiting(self):
+        self.assertEqual(self.scheduler.acquire_token(HOST, self.LIMITS), 0)
+        self.assertEqual(self.scheduler.acquire_token(HOST, self.LIMITS), 0)
+        self.assertEqual(self.slept, [])
+
+    def test_empty_bucket_waits_for_refill(self):
+        for _ in range(2):
+            self.scheduler.acquire_token(HOST, self.LIMITS)
+
+        waited = self.scheduler.acquire_token(HOST, self.LIMITS)
+        # One token per second at 60 requests per minute, plus up to 0.2s of jitter
+        self.assertGreaterEqual(waited, 1.0)
+        self.assertLess(waited, 1.5)
+
+    def test_bucket_refills_up_to_burst(self):
+        for _ in range(2):
+            self.scheduler.acquire_token(HOST, self.LIMITS)
+        self.now += 3600
+
+        for _ in range(2):
+            self.assertEqual(self.scheduler.acquire_token(HOST, self.LIMITS), 0)
+        self.assertGreater(self.scheduler.acquire_token(HOST, self.LIMITS), 0)
+
+    def test_hosts_have_separate_buckets(self):
+        for _ in range(2):
+            self.scheduler.acquire_token(HOST, self.LIMITS)
+
+        self.assertEqual(self.scheduler.acquire_token("www.nordstrom.com", self.LIMITS), 0)
+
+    def test_failure_backs_off_exponentially(self):
+        with mock.patch("crawlers.rate_limit.random.uniform", return_value=1.0):
+            self.assertEqual(self.scheduler.report_failure(HOST, self.LIMITS), 30)
+            self.assertEqual(self.scheduler.report_failure(HOST, self.LIMITS), 60)
+            self.assertEqual(self.scheduler.report_failure(HOST, self.LIMITS), 100)
+        self.assertFalse(self.scheduler.is_available(HOST, self.LIMITS))
+
+        self.assertGreaterEqual(self.scheduler.acquire_token(HOST, self.LIMITS), 100)
+
+    def test_success_resets_backoff_growth(self):
+        with mock.patch("crawlers.rate_limit.random.uniform", return_value=1.0):
+            self.scheduler.report_failure(HOST, self.LIMITS)
+            self.scheduler.report_success(HOST)
+            self.assertEqual(self.scheduler.report_failure(HOST, self.LIMITS), 30)
+
+    def test_concurrency_slots(self):
+        self.assertTrue(self.scheduler.try_acquire_slot(HOST, self.LIMITS, "a"))
+        self.assertFalse(self.scheduler.try_acquire_slot(HOST, self.LIMITS, "b"))
+        self.assertFalse(self.scheduler.is_available(HOST, self.LIMITS))
+
+        self.scheduler.release_slot("a")
+        self.assertTrue(self.scheduler.try_acquire_slot(HOST, self.LIMITS, "b"))
+
+    def test_abandoned_slot_expires(self):
+        self.assertTrue(self.scheduler.try_acquire_slot(HOST, self.LIMITS, "a"))
+        self.now += self.LIMITS["slot_ttl"] + 1
+
+        self.assertTrue(self.scheduler.try_acquire_slot(HOST, self.LIMITS, "b"))
+
+    def test_session_holds_a_slot(self):
+        with self.scheduler.session(HOST, self.LIMITS) as session:
+            self.assertFalse(self.scheduler.is_available(HOST, self.LIMITS))
+            session.throttle()
+        self.assertTrue(self.scheduler.is_available(HOST, self.LIMITS))
+
+    def test_buckets_are_shared_through_the_file(self):
+        for _ in range(2):
+            self.scheduler.acquire_token(HOST, self.LIMITS)
+        other = HostScheduler(str(Path(self.tmp.name) / "scheduler.db"))
+        try:
+            self.assertGreater(other.acquire_token(HOST, self.LIMITS), 0)
+        finally:
+            other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from crawlers.retry import CircuitBreaker, RetryPolicy
+
+
+class BlockedError(Exception):
+    pass
+
+
+class TimeoutException(Exception):
+    pass
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_from_config_merges_scope_over_store_settings(self):
+        config = {"retry": {"max_attempts": 3, "backoff_base": 1, "homepage": {"max_attempts": 5}}}
+
+        self.assertEqual(RetryPolicy.from_config(config).max_attempts, 3)
+        homepage = RetryPolicy.from_config(config, scope="homepage")
+        self.assertEqual(homepage.max_attempts, 5)
+        self.assertEqual(homepage.backoff_base, 1)
+
+    def test_retryable_errors_match_base_classes(self):
+        class PageLoadTimeout(TimeoutException):
+            pass
+
+        policy = RetryPolicy(retry_on=["TimeoutException"])
+        self.assertTrue(policy.is_retryable(PageLoadTimeout()))
+        self.assertFalse(policy.is_retryable(ValueError()))
+
+    def test_delay_backs_off_exponentially_up_to_max(self):
+        policy = RetryPolicy(backoff_base=5, backoff_max=12, jitter=0)
+
+        self.assertEqual([policy.delay(attempt) for attempt in (1, 2, 3)], [5, 10, 12])
+
+    def test_call_retries_until_success(self):
+        policy = RetryPolicy(max_attempts=3, backoff_base=1, jitter=0, retry_on=["BlockedError"])
+        attempts, slept = [], []
+
+        def crawl(attempt):
+            attempts.append(attempt)
+            if attempt < 3:
+                raise BlockedError("captcha")
+            return "items"
+
+        self.assertEqual(policy.call(crawl, "crawl", sleep=slept.append), "items")
+        self.assertEqual(attempts, [1, 2, 3])
+        self.assertEqual(slept, [1, 2])
+
+    def test_call_gives_up_after_max_attempts(self):
+        policy = RetryPolicy(max_attempts=2, backoff_base=0, retry_on=["BlockedError"])
+        attempts = []
+
+        def crawl(attempt):
+            attempts.append(attempt)
+            raise BlockedError("captcha")
+
+        with self.assertRaises(BlockedError):
+            policy.call(crawl, "crawl", sleep=lambda seconds: None)
+        self.assertEqual(attempts, [1, 2])
+
+    def test_call_does_not_retry_other_errors(self):
+        policy = RetryPolicy(max_attempts=3, retry_on=["BlockedError"])
+        attempts = []
+
+        def crawl(attempt):
+            attempts.append(attempt)
+            raise KeyError("selector")
+
+        with self.assertRaises(KeyError):
+            policy.call(crawl, "crawl", sleep=lambda seconds: None)
+        self.assertEqual(attempts, [1])
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    SETTINGS = {"threshold": 2, "cooldown_minutes": 10, "trip_on": ["BlockedError"]}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.breaker = CircuitBreaker(str(Path(self.tmp.name) / "scheduler.db"))
+        self.now = 1_000_000.0
+        patcher = mock.patch("crawlers.retry.time.time", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.breaker.close()
+        self.tmp.cleanup()
+
+    def trip(self):
+        for _ in range(self.SETTINGS["threshold"]):
+            self.breaker.record_failure("macys", BlockedError(), self.SETTINGS)
+
+    def test_opens_at_threshold(self):
+        self.assertFalse(self.breaker.record_failure("macys", BlockedError(), self.SETTINGS))
+        self.assertTrue(self.breaker.allow("macys", self.SETTINGS))
+        self.assertTrue(self.breaker.record_failure("macys", BlockedError(), self.SETTINGS))
+
+        self.assertTrue(self.breaker.is_open("macys"))
+        self.assertFalse(self.breaker.allow("macys", self.SETTINGS))
+        self.assertFalse(self.breaker.is_open("nordstrom"))
+
+    def test_other_errors_do_not_count(self):
+        for _ in range(3):
+            self.assertFalse(self.breaker.record_failure("macys", KeyError(), self.SETTINGS))
+        self.assertFalse(self.breaker.is_open("macys"))
+
+    def test_other_errors_end_consecutive_blocks(self):
+        self.breaker.record_failure("macys", BlockedError(), self.SETTINGS)
+        self.breaker.record_failure("macys", TimeoutException(), self.SETTINGS)
+
+        self.assertFalse(self.breaker.record_failure("macys", BlockedError(), self.SETTINGS))
+        self.assertFalse(self.breaker.is_open("macys"))
+
+    def test_trial_failing_with_other_error_keeps_breaker_open(self):
+        self.trip()
+        self.now += 10 * 60
+        self.breaker.allow("macys", self.SETTINGS)
+        self.breaker.record_failure("macys", TimeoutException(), self.SETTINGS)
+
+        self.assertFalse(self.breaker.allow("macys", self.SETTINGS))
+        self.now += 10 * 60
+        # The next trial is let through, and a block reopens the breaker at once
+        self.assertTrue(self.breaker.allow("macys", self.SETTINGS))
+        self.assertTrue(self.breaker.record_failure("macys", BlockedError(), self.SETTINGS))
+
+    def test_success_resets_consecutive_failures(self):
+        self.breaker.record_failure("macys", BlockedError(), self.SETTINGS)
+        self.breaker.record_success("macys")
+
+        self.assertFalse(self.breaker.record_failure("macys", BlockedError(), self.SETTINGS))
+
+    def test_half_open_lets_one_trial_through(self):
+        self.trip()
+        self.now += 10 * 60
+
+        self.assertTrue(self.breaker.allow("macys", self.SETTINGS))
+        # Everyone else fails fast while the trial runs
+        self.assertFalse(self.breaker.allow("macys", self.SETTINGS))
+        self.assertTrue(self.breaker.is_open("macys"))
+
+    def test_trial_success_closes_breaker(self):
+        self.trip()
+        self.now += 10 * 60
+        self.breaker.allow("macys", self.SETTINGS)
+        self.breaker.record_success("macys")
+
+        self.assertFalse(self.breaker.is_open("macys"))
+        self.assertTrue(self.breaker.allow("macys", self.SETTINGS))
+        self.assertTrue(self.breaker.allow("macys", self.SETTINGS))
+
+    def test_trial_failure_reopens_breaker(self):
+        self.trip()
+        self.now += 10 * 60
+        self.breaker.allow("macys", self.SETTINGS)
+
+        self.assertTrue(self.breaker.record_failure("macys", BlockedError(), self.SETTINGS))
+        self.now += 5 * 60
+        self.assertFalse(self.breaker.allow("macys", self.SETTINGS))
+
+    def test_state_is_shared_through_the_file(self):
+        self.trip()
+        other = CircuitBreaker(str(Path(self.tmp.name) / "scheduler.db"))
+        try:
+            self.assertTrue(other.is_open("macys"))
+        finally:
+            other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
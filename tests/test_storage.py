@@ -0,0 +1,115 @@
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from crawlers.storage import SQLiteResultStore
+
+
+def make_item(product_id: str = "1", **fields) -> dict:
+    item = {"store_product_id": product_id, "brand": "Hugo", "name": "Shirt", "price_current": "50.00",
+            "price_original": "80.00", "product_metadata": {"rating": "4.5", "colors": ["Blue"]}}
+    item.update(fields)
+    return item
+
+
+class SQLiteResultStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp.name) / "products.db"
+        self.store = SQLiteResultStore(str(self.db_path), batch_size=2)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def product(self, product_id: str = "1") -> dict:
+        self.store.conn.row_factory = sqlite3.Row
+        try:
+            row = self.store.conn.execute(
+                "SELECT * FROM products WHERE store = 'macys' AND store_product_id = ?", (product_id,)
+            ).fetchone()
+        finally:
+            self.store.conn.row_factory = None
+        return dict(row) if row else None
+
+    def test_upsert_inserts_and_updates_in_batches(self):
+        written = self.store.upsert_items([make_item(str(i)) for i in range(5)], "macys")
+        self.assertEqual(written, 5)
+
+        self.store.upsert_items([make_item("1", name="Oxford Shirt")], "macys")
+        count = self.store.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+        self.assertEqual(count, 5)
+        self.assertEqual(self.product("1")["name"], "Oxford Shirt")
+        self.assertEqual(json.loads(self.product("1")["product_metadata"])["colors"], ["Blue"])
+
+    def test_items_without_id_are_skipped(self):
+        self.assertEqual(self.store.upsert_items([make_item(None), make_item("2")], "macys"), 1)
+
+    def test_keeps_first_seen(self):
+        self.store.upsert_items([make_item()], "macys")
+        first_seen = self.product()["first_seen"]
+        self.store.conn.execute("UPDATE products SET first_seen = '2020-01-01T00:00:00+00:00'")
+        self.store.upsert_items([make_item()], "macys")
+
+        self.assertEqual(self.product()["first_seen"], "2020-01-01T00:00:00+00:00")
+        self.assertGreaterEqual(self.product()["last_seen"], first_seen)
+
+    def test_product_details_kept_when_missing(self):
+        self.store.upsert_items([make_item(product_details={"material": "Cotton"})], "macys")
+        self.store.upsert_items([make_item()], "macys")
+
+        self.assertEqual(json.loads(self.product()["product_details"]), {"material": "Cotton"})
+
+    def test_price_history_records_only_changes(self):
+        self.store.upsert_items([make_item()], "macys")
+        self.store.upsert_items([make_item(name="Renamed")], "macys")
+        self.store.upsert_items([make_item(price_current="40.00")], "macys")
+        self.store.upsert_items([make_item(price_current="40.00")], "macys")
+
+        history = self.store.price_history("macys", "1")
+        self.assertEqual([entry["price_current"] for entry in history], ["50.00", "40.00"])
+
+    def test_projection_keeps_other_columns(self):
+        self.store.upsert_items([make_item()], "macys")
+        self.store.upsert_items([{"store_product_id": "1", "price_current": "45.00"}], "macys",
+                                fields=["price_current"])
+
+        product = self.product()
+        self.assertEqual(product["price_current"], "45.00")
+        self.assertEqual(product["name"], "Shirt")
+        self.assertEqual(product["price_original"], "80.00")
+        self.assertEqual(len(self.store.price_history("macys", "1")), 2)
+
+    def test_metadata_sub_field_projection_is_merged(self):
+        self.store.upsert_items([make_item()], "macys")
+        self.store.upsert_items([{"store_product_id": "1", "product_metadata": {"rating": "5"}}], "macys",
+                                fields=["product_metadata.rating"])
+
+        self.assertEqual(json.loads(self.product()["product_metadata"]), {"rating": "5", "colors": ["Blue"]})
+
+    def test_full_metadata_projection_replaces(self):
+        self.store.upsert_items([make_item()], "macys")
+        self.store.upsert_items([{"store_product_id": "1", "product_metadata": {"rating": "5"}}], "macys",
+                                fields=["product_metadata"])
+
+        self.assertEqual(json.loads(self.product()["product_metadata"]), {"rating": "5"})
+
+    def test_adds_columns_to_old_databases(self):
+        self.store.close()
+        old_path = Path(self.tmp.name) / "old.db"
+        with sqlite3.connect(str(old_path)) as conn:
+            conn.execute("CREATE TABLE products (store TEXT NOT NULL, store_product_id TEXT NOT NULL, brand TEXT, "
+                         "name TEXT, product_url TEXT, image_url TEXT, price_current TEXT, price_original TEXT, "
+                         "price_min TEXT, price_max TEXT, product_metadata TEXT, first_seen TEXT NOT NULL, "
+                         "last_seen TEXT NOT NULL, PRIMARY KEY (store, store_product_id))")
+        conn.close()
+
+        self.store = SQLiteResultStore(str(old_path))
+        self.assertEqual(self.store.upsert_items([make_item(product_details={"fit": "Slim"})], "macys"), 1)
+        self.assertEqual(json.loads(self.product()["product_details"]), {"fit": "Slim"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import time
+import unittest
+
+from crawlers.watchdog import Watchdog, WatchdogTimeout, WorkerCrashed, heartbeat
+
+
+# Called in spawned child processes, so they must be defined at module level
+def add(a, b):
+    return a + b
+
+
+def raise_value_error():
+    raise ValueError("bad selector")
+
+
+def hang():
+    time.sleep(60)
+
+
+def busy_with_heartbeats(seconds):
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        heartbeat()
+        time.sleep(0.1)
+    return "done"
+
+
+def crash():
+    os._exit(3)
+
+
+class WatchdogTest(unittest.TestCase):
+    def test_returns_result(self):
+        watchdog = Watchdog(budget_seconds=30, poll_interval=0.1)
+
+        self.assertEqual(watchdog.run(add, 2, b=3, description="add"), 5)
+        self.assertEqual(watchdog.summary(), {"calls": 1, "timeouts": 0, "crashes": 0})
+
+    def test_reraises_worker_exception(self):
+        with self.assertRaisesRegex(ValueError, "bad selector"):
+            Watchdog(poll_interval=0.1).run(raise_value_error)
+
+    def test_kills_worker_without_heartbeat(self):
+        watchdog = Watchdog(heartbeat_seconds=1, poll_interval=0.1)
+        started = time.monotonic()
+
+        with self.assertRaisesRegex(WatchdogTimeout, "no heartbeat"):
+            watchdog.run(hang, description="hang")
+        self.assertLess(time.monotonic() - started, 30)
+        self.assertEqual(watchdog.summary()["timeouts"], 1)
+
+    def test_heartbeats_keep_worker_alive(self):
+        watchdog = Watchdog(heartbeat_seconds=1, poll_interval=0.1)
+
+        self.assertEqual(watchdog.run(busy_with_heartbeats, 2.5), "done")
+
+    def test_kills_worker_past_budget_despite_heartbeats(self):
+        watchdog = Watchdog(budget_seconds=1, heartbeat_seconds=None, poll_interval=0.1)
+
+        with self.assertRaisesRegex(WatchdogTimeout, "budget"):
+            watchdog.run(busy_with_heartbeats, 60)
+
+    def test_crashed_worker_raises(self):
+        watchdog = Watchdog(poll_interval=0.1)
+
+        with self.assertRaises(WorkerCrashed):
+            watchdog.run(crash)
+        self.assertEqual(watchdog.summary()["crashes"], 1)
+
+    def test_heartbeat_is_a_no_op_outside_workers(self):
+        heartbeat()
+
+
+if __name__ == "__main__":
+    unittest.main()
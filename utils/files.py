@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def atomic_write_json(path: str | Path, data: Any) -> None:
+    """
+    Write JSON to a file atomically.
+    The data is written to a temporary file in the same directory and then moved
+    over the target, so readers never see a partially written file.
+    Args:
+        path: Destination file path
+        data: JSON-serializable data
+    """
+    _atomic_write(path, lambda f: json.dump(data, f, ensure_ascii=False, default=str))
+
+
+def atomic_write_text(path: str | Path, text: str) -> None:
+    """Write text to a file atomically (see atomic_write_json)."""
+    _atomic_write(path, lambda f: f.write(text))
+
+
+def atomic_write_bytes(path: str | Path, data: bytes) -> None:
+    """Write bytes to a file atomically (see atomic_write_json)."""
+    _atomic_write(path, lambda f: f.write(data), binary=True)
+
+
+def _atomic_write(path: str | Path, write, binary: bool = False) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_json(path: str | Path, default: Any = None) -> Any:
+    """Read a JSON file, returning default if it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+__all__ = ['atomic_write_bytes', 'atomic_write_json', 'atomic_write_text', 'read_json']